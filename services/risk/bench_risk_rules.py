@@ -0,0 +1,33 @@
+#!/usr/bin/env python3
+"""Benchmark scalar vs NumPy rule-table scoring and check both paths agree"""
+import random
+import sys
+import time
+from risk_rules import load_rules
+
+N = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+
+rules = load_rules()
+random.seed(7)
+pool = list(rules.code) + ["SPY", "QQQ", "ROKU", "XYZ"]
+tickers = [random.choice(pool) for _ in range(N)]
+horizons = [random.randint(1, 365) for _ in range(N)]
+
+print("=" * 60)
+print(f"RISK RULES BENCHMARK ({N} tickers)")
+print("=" * 60)
+
+t0 = time.perf_counter()
+scalar = [rules.score(t, h) for t, h in zip(tickers, horizons)]
+scalar_t = time.perf_counter() - t0
+print(f"Scalar path:   {scalar_t * 1000:8.2f} ms")
+
+rules.score_array(tickers[:10], horizons[:10])  # warm-up (NumPy import)
+t0 = time.perf_counter()
+profiles, h_rules, scores, v_rules = rules.score_array(tickers, horizons)
+vector_t = time.perf_counter() - t0
+print(f"NumPy path:    {vector_t * 1000:8.2f} ms")
+
+vector = list(zip(profiles.tolist(), h_rules.tolist(), scores.tolist(), v_rules.tolist()))
+print(f"Speedup:       {scalar_t / vector_t:8.1f}x")
+print(f"Identical:     {sum(a == b for a, b in zip(scalar, vector))}/{N}")
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""Benchmark TickerIndex vs difflib.get_close_matches at 50k symbols"""
+import random
+import string
+import sys
+import time
+from difflib import get_close_matches
+from ticker_index import TickerIndex
+
+N_SYMBOLS = int(sys.argv[1]) if len(sys.argv) > 1 else 50_000
+N_QUERIES = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+
+random.seed(42)
+symbols = set()
+while len(symbols) < N_SYMBOLS:
+    symbol = "".join(random.choices(string.ascii_uppercase, k=random.randint(1, 5)))
+    if random.random() < 0.05:  # Nordic / share-class listings: EQNR.OL, NOVO-B
+        symbol += random.choice([".OL", ".ST", ".CO", ".HE", "-B"])
+    symbols.add(symbol)
+symbols = sorted(symbols)
+
+
+def typo(symbol):
+    """Introduce a single random substitution / deletion / insertion."""
+    i = random.randrange(len(symbol))
+    op = random.choice("sdi") if len(symbol) > 1 else "si"
+    ch = random.choice(string.ascii_uppercase)
+    if op == "s":
+        return symbol[:i] + ch + symbol[i + 1:]
+    if op == "d":
+        return symbol[:i] + symbol[i + 1:]
+    return (symbol[:i] + ch + symbol[i:])[:max(5, len(symbol))]
+
+
+queries = [typo(random.choice(symbols)) for _ in range(N_QUERIES)]
+
+print("=" * 60)
+print(f"TICKER INDEX BENCHMARK ({N_SYMBOLS} symbols, {N_QUERIES} queries)")
+print("=" * 60)
+
+t0 = time.perf_counter()
+index = TickerIndex(symbols)
+build = time.perf_counter() - t0
+print(f"Index build (set):      {build * 1000:8.1f} ms")
+
+t0 = time.perf_counter()
+index.suggest("TSLQ")
+build = time.perf_counter() - t0
+print(f"Delete index (lazy):    {build * 1000:8.1f} ms (first suggest only)")
+
+t0 = time.perf_counter()
+exact = sum(q in index for q in queries)
+exact_t = time.perf_counter() - t0
+print(f"Exact lookups:          {exact_t / N_QUERIES * 1e6:8.2f} µs/query ({exact} hits)")
+
+t0 = time.perf_counter()
+fast = [index.suggest(q) for q in queries]
+fast_t = time.perf_counter() - t0
+print(f"TickerIndex.suggest:    {fast_t / N_QUERIES * 1000:8.2f} ms/query")
+
+t0 = time.perf_counter()
+slow = [get_close_matches(q, symbols, n=3, cutoff=0.6) for q in queries]
+slow_t = time.perf_counter() - t0
+print(f"get_close_matches:      {slow_t / N_QUERIES * 1000:8.2f} ms/query")
+
+same = sum(a == b for a, b in zip(fast, slow))
+print(f"Speedup:                {slow_t / fast_t:8.1f}x")
+print(f"Identical suggestions:  {same}/{N_QUERIES}")
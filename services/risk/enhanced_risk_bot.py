@@ -2,9 +2,10 @@
 import sys
 import json
 from datetime import datetime
-from difflib import get_close_matches
 import re
 from zoneinfo import ZoneInfo
+from ticker_index import get_ticker_index
+from risk_rules import load_rules
 # Known tickers (expand this list or fetch from API)
 KNOWN_TICKERS = [
     "AAPL", "TSLA", "NVDA", "MSFT", "GOOGL", "AMZN", "META", "AMD",
@@ -12,20 +13,28 @@ KNOWN_TICKERS = [
     "SHOP", "SQ", "PYPL", "V", "MA", "JPM", "BAC", "WFC",
     "SPY", "QQQ", "IWM", "DIA", "VTI", "VOO"
 ]
+# Full listings come from the symbols file (EVITO_SYMBOLS_PATH); KNOWN_TICKERS is always included
+TICKER_INDEX = get_ticker_index(fallback=KNOWN_TICKERS)
+# Sector buckets, horizon adjustments and verdict bands (EVITO_RISK_RULES_PATH overrides)
+RISK_RULES = load_rules()
+# Letters/digits with optional share-class or exchange suffix (BRK.B, NOVO-B, EQNR.OL); at least one letter
+TICKER_FORMAT = re.compile(r'^(?=.*[A-Z])[A-Z0-9][A-Z0-9.\-]{0,11}$')
+def looks_like_ticker(token):
+    return bool(TICKER_FORMAT.match(token.upper().strip()))
 def validate_ticker(ticker):
     """
     Validate ticker format and check if it's known
     Returns: (is_valid, suggestions, error_message)
     """
     ticker = ticker.upper().strip()
-    # Check format (1-5 letters, alphanumeric)
-    if not re.match(r'^[A-Z]{1,5}$', ticker):
-        return False, [], "Invalid ticker format. Use 1-5 letters (e.g., TSLA, AAPL)"
-    # Check if known
-    if ticker in KNOWN_TICKERS:
+    # Known listings first: the symbols file is the authority on what a ticker looks like
+    if ticker in TICKER_INDEX:
         return True, [], None
+    # Check format (letters/digits, optional . or - suffix)
+    if not TICKER_FORMAT.match(ticker):
+        return False, [], "Invalid ticker format. Use letters/digits, optionally with . or - (e.g., TSLA, BRK.B, EQNR.OL)"
     # Find similar tickers (fuzzy match)
-    suggestions = get_close_matches(ticker, KNOWN_TICKERS, n=3, cutoff=0.6)
+    suggestions = TICKER_INDEX.suggest(ticker, n=3, cutoff=0.6)
     if suggestions:
         return False, suggestions, f"Ticker '{ticker}' not recognized. Did you mean: {', '.join(suggestions)}?"
     else:
@@ -45,58 +54,44 @@ def validate_horizon(horizon):
         return True, None
     except ValueError:
         return False, "Horizon must be a number"
+def split_horizon(parts):
+    """
+    Split /risk tokens into (tickers, horizon token or None).
+    The last token is the horizon if it is numeric, or if it follows a single ticker and is
+    not a known symbol itself (`/risk TSLA abc` is a bad horizon, not two tickers).
+    """
+    if len(parts) > 1:
+        last = parts[-1]
+        if re.fullmatch(r"[-+]?\d+(\.\d+)?", last) or (len(parts) == 2 and last not in TICKER_INDEX):
+            return parts[:-1], last
+    return parts, None
 def analyze_ticker(ticker, horizon=30):
     """
-    Risk analysis logic
+    Risk analysis logic (rule table in risk_rules.json)
     """
-    risk_factors = []
-    risk_score = 50
-    # High volatility stocks
-    if ticker in ["TSLA", "GME", "AMC", "PLTR"]:
-        risk_score = 75
-        risk_factors.append("High volatility stock")
-        risk_factors.append("Strong social media presence")
-    # Tech stocks
-    elif ticker in ["NVDA", "AMD", "MSFT", "GOOGL", "META"]:
-        risk_score = 60
-        risk_factors.append("Tech sector exposure")
-        risk_factors.append("Earnings sensitive")
-    # Blue chips (lower risk)
-    elif ticker in ["AAPL", "JPM", "V", "MA"]:
-        risk_score = 35
-        risk_factors.append("Blue chip stability")
-        risk_factors.append("Lower volatility expected")
-    # Crypto-related
-    elif ticker in ["COIN", "MSTR"]:
-        risk_score = 80
-        risk_factors.append("Crypto market correlation")
-        risk_factors.append("High volatility")
-    # Adjust for timeframe
-    if horizon < 7:
-        risk_score += 15
-        risk_factors.append("Short timeframe amplifies risk")
-    elif horizon > 90:
-        risk_score -= 10
-        risk_factors.append("Longer timeframe reduces short-term noise")
-    # Cap at 0-100
-    risk_score = max(0, min(100, risk_score))
-    # Determine verdict
-    if risk_score > 70:
-        verdict = f"{risk_score}% - High sell-the-news risk"
-        recommendation = "Consider waiting for pullback"
-    elif risk_score > 50:
-        verdict = f"{risk_score}% - Moderate risk"
-        recommendation = "Watch for entry points"
-    else:
-        verdict = f"{risk_score}% - Low risk"
-        recommendation = "Relatively stable outlook"
+    profile, h_rule, risk_score, v_rule = RISK_RULES.score(ticker, horizon)
+    return _build_result(ticker, horizon, profile, h_rule, risk_score, v_rule,
+                         datetime.now(ZoneInfo("Europe/Oslo")))
+def analyze_tickers(tickers, horizons=30):
+    """
+    Vectorized risk analysis for a whole ticker array (NumPy path).
+    Results are identical to calling analyze_ticker per ticker.
+    """
+    profiles, h_rules, scores, v_rules = RISK_RULES.score_array(tickers, horizons)
+    horizons = horizons if hasattr(horizons, "__len__") else [horizons] * len(tickers)
     now_oslo = datetime.now(ZoneInfo("Europe/Oslo"))
+    return [
+        _build_result(t, int(h), int(p), int(hr), int(s), int(v), now_oslo)
+        for t, h, p, hr, s, v in zip(tickers, horizons, profiles, h_rules, scores, v_rules)
+    ]
+def _build_result(ticker, horizon, profile, h_rule, risk_score, v_rule, now_oslo):
+    verdict, recommendation = RISK_RULES.verdict(risk_score, v_rule)
     return {
         "success": True,
         "ticker": ticker,
         "horizon": horizon,
         "risk_score": risk_score,
-        "factors": risk_factors,
+        "factors": RISK_RULES.factors(profile, h_rule),
         "verdict": verdict,
         "recommendation": recommendation,
         "timestamp": now_oslo.isoformat(),
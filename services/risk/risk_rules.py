@@ -0,0 +1,119 @@
+"""
+EVITO Risk Rules
+Declarative rule table for risk classification (see risk_rules.json).
+
+- Sectors/tickers -> base score + factors, compiled into a ticker -> profile dict
+- Horizon adjustments and verdict bands evaluated first-match, like an if/elif chain
+- Scalar path (score) for single lookups, NumPy path (score_array) for whole ticker arrays;
+  both return the same (profile, horizon rule, score, verdict) indices
+"""
+import json
+import os
+from pathlib import Path
+
+RULES_PATH = Path(os.getenv("EVITO_RISK_RULES_PATH", Path(__file__).resolve().parent / "risk_rules.json"))
+
+
+class RiskRules:
+    """Compiled rule table. Profile 0 is the default (unmatched tickers)."""
+
+    def __init__(self, config):
+        default = config.get("default", {})
+        self.profiles = [(int(default.get("score", 50)), tuple(default.get("factors", [])))]
+        self.profile_names = ["default"]
+        self.code = {}
+        # Ticker overrides win over sectors; within sectors the first listing wins
+        for ticker, rule in config.get("tickers", {}).items():
+            if isinstance(rule, str):
+                continue
+            self.code[ticker] = self._add_profile(ticker, rule)
+        sector_codes = {}
+        for name, rule in config.get("sectors", {}).items():
+            sector_codes[name] = self._add_profile(name, rule)
+            for ticker in rule.get("tickers", []):
+                self.code.setdefault(ticker, sector_codes[name])
+        for ticker, rule in config.get("tickers", {}).items():
+            if isinstance(rule, str) and rule in sector_codes:
+                self.code[ticker] = sector_codes[rule]
+
+        self.horizons = [
+            (rule.get("below"), rule.get("above"), int(rule.get("delta", 0)), rule.get("factor"))
+            for rule in config.get("horizons", [])
+        ]
+        self.verdicts = [
+            (rule.get("above"), rule.get("label", ""), rule.get("recommendation", ""))
+            for rule in config.get("verdicts", [])
+        ] or [(None, "", "")]
+
+    def _add_profile(self, name, rule):
+        self.profiles.append((int(rule.get("score", 50)), tuple(rule.get("factors", []))))
+        self.profile_names.append(name)
+        return len(self.profiles) - 1
+
+    def _horizon_rule(self, horizon):
+        for i, (below, above, _, _) in enumerate(self.horizons):
+            if (below is None or horizon < below) and (above is None or horizon > above):
+                return i
+        return len(self.horizons)
+
+    def _verdict_rule(self, score):
+        for i, (above, _, _) in enumerate(self.verdicts):
+            if above is None or score > above:
+                return i
+        return len(self.verdicts) - 1
+
+    def score(self, ticker, horizon):
+        """Scalar path. Returns (profile, horizon_rule, risk_score, verdict_rule)."""
+        profile = self.code.get(ticker, 0)
+        h_rule = self._horizon_rule(horizon)
+        delta = self.horizons[h_rule][2] if h_rule < len(self.horizons) else 0
+        risk_score = max(0, min(100, self.profiles[profile][0] + delta))
+        return profile, h_rule, risk_score, self._verdict_rule(risk_score)
+
+    def score_array(self, tickers, horizons):
+        """
+        Vectorized path over a whole ticker array (horizons: scalar or same-length array).
+        Returns NumPy arrays (profiles, horizon_rules, risk_scores, verdict_rules).
+        """
+        import numpy as np
+
+        lookup = self.code.get
+        profiles = np.fromiter((lookup(t, 0) for t in tickers), dtype=np.intp, count=len(tickers))
+        shape = profiles.shape
+        horizons = np.broadcast_to(np.asarray(horizons, dtype=np.int64), shape)
+
+        base = np.array([p[0] for p in self.profiles], dtype=np.int64)[profiles]
+        conditions = [
+            (horizons < below if below is not None else True) & (horizons > above if above is not None else True)
+            for below, above, _, _ in self.horizons
+        ]
+        h_rules = np.select(
+            [np.broadcast_to(c, shape) for c in conditions],
+            np.arange(len(conditions)),
+            default=len(conditions),
+        )
+        deltas = np.array([h[2] for h in self.horizons] + [0], dtype=np.int64)
+        risk_scores = np.clip(base + deltas[h_rules], 0, 100)
+
+        v_conditions = [
+            risk_scores > above if above is not None else np.ones(shape, dtype=bool)
+            for above, _, _ in self.verdicts
+        ]
+        v_rules = np.select(v_conditions, np.arange(len(v_conditions)), default=len(self.verdicts) - 1)
+        return profiles, h_rules, risk_scores, v_rules
+
+    def factors(self, profile, h_rule):
+        out = list(self.profiles[profile][1])
+        if h_rule < len(self.horizons) and self.horizons[h_rule][3]:
+            out.append(self.horizons[h_rule][3])
+        return out
+
+    def verdict(self, risk_score, v_rule):
+        _, label, recommendation = self.verdicts[v_rule]
+        return f"{risk_score}% - {label}", recommendation
+
+
+def load_rules(path=RULES_PATH):
+    """Load and compile the rule table from JSON."""
+    with Path(path).open("r", encoding="utf-8") as f:
+        return RiskRules(json.load(f))
@@ -0,0 +1,156 @@
+"""
+EVITO Ticker Index
+Precomputed symbol index for fast ticker validation and "did you mean" suggestions.
+
+- Exact hits: plain set lookup
+- Fuzzy hits: SymSpell-style delete index narrows the candidates, which are then
+  ranked with difflib's own ratio so suggestions match get_close_matches. The delete index
+  is built on the first suggest(), so exact-hit processes (one CLI call per request) skip it
+- Two deletes per side only reach every ratio >= 0.6 match when both strings are at most
+  INDEXED_LEN long; longer symbols/queries (EQNR.OL, NOVO-B) and lower cutoffs fall back to a
+  NumPy character-count scan (difflib's quick_ratio bound, vectorized), so suggestions stay
+  identical to get_close_matches
+- Loaded once from a symbols file (EVITO_SYMBOLS_PATH, default data/symbols.txt)
+  and shared by the CLI, the Slack bots and the Risk API via get_ticker_index()
+"""
+import heapq
+import os
+import threading
+from difflib import SequenceMatcher
+from itertools import combinations
+from pathlib import Path
+
+import numpy as np
+
+SYMBOLS_PATH = Path(os.getenv("EVITO_SYMBOLS_PATH", "data/symbols.txt"))
+MAX_DELETES = 2
+INDEXED_LEN = 5  # delete-index candidates are a superset of close matches up to this length
+SUPERSET_CUTOFF = 0.6  # ... and for cutoffs at least this high
+
+
+def _deletes(symbol, max_deletes=MAX_DELETES):
+    """All strings reachable from symbol by removing up to max_deletes characters."""
+    out = {symbol}
+    for k in range(1, min(max_deletes, len(symbol) - 1) + 1):
+        for drop in combinations(range(len(symbol)), k):
+            out.add("".join(c for i, c in enumerate(symbol) if i not in drop))
+    return out
+
+
+class TickerIndex:
+    """Set for exact hits plus a delete-neighbourhood index for suggestions."""
+
+    def __init__(self, symbols, names=None):
+        self.symbols = {s.upper().strip() for s in symbols if s and s.strip()}
+        self.names = names or {}
+        self._deletes = None
+        self._build_lock = threading.Lock()
+
+    def __contains__(self, ticker):
+        return ticker in self.symbols
+
+    def __len__(self):
+        return len(self.symbols)
+
+    def _build(self):
+        """Delete index over the short symbols plus a character-count matrix; built once, on demand."""
+        with self._build_lock:
+            if self._deletes is not None:
+                return
+            deletes = {}
+            ordered = sorted(self.symbols)
+            alphabet = {c: i for i, c in enumerate(sorted({c for s in ordered for c in s}))}
+            counts = np.zeros((len(ordered), len(alphabet)), dtype=np.uint8)
+            for row, symbol in enumerate(ordered):
+                for c in symbol:
+                    counts[row, alphabet[c]] += 1
+                if len(symbol) <= INDEXED_LEN:
+                    for key in _deletes(symbol):
+                        deletes.setdefault(key, []).append(symbol)
+            self._ordered = ordered
+            self._alphabet = alphabet
+            self._counts = counts
+            self._lens = np.fromiter(map(len, ordered), dtype=np.int32, count=len(ordered))
+            self._long_rows = np.flatnonzero(self._lens > INDEXED_LEN)
+            self._deletes = deletes
+
+    def candidates(self, ticker, cutoff=SUPERSET_CUTOFF):
+        """Superset of the symbols whose difflib ratio with ticker can reach cutoff."""
+        if self._deletes is None:
+            self._build()
+        q = len(ticker)
+        found = set()
+        short_covered = q <= INDEXED_LEN and cutoff >= SUPERSET_CUTOFF
+        if short_covered:
+            for key in _deletes(ticker):
+                found.update(self._deletes.get(key, ()))
+        # Scan the rest: length bound (real_quick_ratio), then shared characters (quick_ratio)
+        rows = self._long_rows if short_covered else np.arange(len(self._ordered))
+        lens = self._lens[rows]
+        keep = 2 * np.minimum(lens, q) >= cutoff * (lens + q) - 1e-9
+        rows, lens = rows[keep], lens[keep]
+        if len(rows):
+            query = np.zeros(len(self._alphabet), dtype=np.uint8)
+            for c in ticker:
+                if c in self._alphabet:
+                    query[self._alphabet[c]] += 1
+            shared = np.minimum(self._counts[rows], query).sum(axis=1)
+            rows = rows[2 * shared >= cutoff * (lens + q) - 1e-9]
+            found.update(self._ordered[r] for r in rows)
+        return found
+
+    def suggest(self, ticker, n=3, cutoff=0.6):
+        """Drop-in for get_close_matches(ticker, symbols, n, cutoff)."""
+        matcher = SequenceMatcher()
+        matcher.set_seq2(ticker)
+        scored = []
+        for symbol in self.candidates(ticker, cutoff):
+            matcher.set_seq1(symbol)
+            if matcher.real_quick_ratio() >= cutoff and matcher.quick_ratio() >= cutoff:
+                score = matcher.ratio()
+                if score >= cutoff:
+                    scored.append((score, symbol))
+        return [symbol for _, symbol in heapq.nlargest(n, scored)]
+
+    def name(self, ticker):
+        return self.names.get(ticker)
+
+
+def load_symbols(path=SYMBOLS_PATH):
+    """
+    Read a symbols file: one SYMBOL or SYMBOL,Name per line, '#' comments allowed.
+    Returns (symbols, names). Missing file -> ([], {}).
+    """
+    path = Path(path)
+    if not path.exists():
+        return [], {}
+    symbols = []
+    names = {}
+    with path.open("r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            symbol, _, name = line.partition(",")
+            symbol = symbol.strip().upper()
+            if not symbol:
+                continue
+            symbols.append(symbol)
+            if name.strip():
+                names[symbol] = name.strip()
+    return symbols, names
+
+
+_INDEX = None
+
+
+def get_ticker_index(fallback=(), path=SYMBOLS_PATH):
+    """
+    Process-wide index, built on first use from the symbols file.
+    `fallback` symbols are always included (e.g. KNOWN_TICKERS when no file exists).
+    """
+    global _INDEX
+    if _INDEX is None:
+        symbols, names = load_symbols(path)
+        _INDEX = TickerIndex(list(fallback) + symbols, names)
+    return _INDEX
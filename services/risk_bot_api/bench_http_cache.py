@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""Benchmark Risk API responses: plain JSON vs gzip vs MessagePack vs 304 (bytes + server time)"""
+import sys
+import time
+
+from flask import Flask
+
+from evito_api_server import app
+from http_cache import content_version, msgpack, versioned
+
+N = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+
+# Variants a poller can ask for; "requests" sends Accept-Encoding: gzip by default
+VARIANTS = [
+    ("json", {"Accept-Encoding": "identity"}),
+    ("json+gzip", {"Accept-Encoding": "gzip"}),
+    ("msgpack", {"Accept": "application/msgpack", "Accept-Encoding": "identity"}),
+    ("msgpack+gzip", {"Accept": "application/msgpack", "Accept-Encoding": "gzip"}),
+]
+
+# A history-sized payload (one card per day for a year) through the same helper
+history_app = Flask("history")
+HISTORY = {
+    "ticker": "TSLA",
+    "history": [
+        {"date": f"2025-{1 + d // 31:02d}-{1 + d % 28:02d}", "risk_score": (d * 37) % 100, "risk_level": "Medium",
+         "factors": [{"name": "Market Volatility", "score": (d * 7) % 100}, {"name": "Volume", "score": (d * 3) % 100}]}
+        for d in range(365)
+    ],
+}
+
+
+HISTORY_VERSION = content_version(HISTORY)  # computed once per data update, like a cached card
+
+
+@history_app.route("/history")
+def history():
+    return versioned(HISTORY, version=HISTORY_VERSION)
+
+
+def measure(client, url, headers):
+    resp = client.get(url, headers=headers)
+    size, etag = len(resp.data), resp.headers.get("ETag")
+    t0 = time.perf_counter()
+    for _ in range(N):
+        client.get(url, headers=headers)
+    full = (time.perf_counter() - t0) / N
+    t0 = time.perf_counter()
+    for _ in range(N):
+        not_modified = client.get(url, headers={**headers, "If-None-Match": etag})
+    cond = (time.perf_counter() - t0) / N
+    assert not_modified.status_code == 304, not_modified.status_code
+    return size, full, cond
+
+
+if msgpack is None:
+    print("msgpack not installed: MessagePack variants fall back to JSON")
+print("=" * 78)
+for name, client, url in [
+    ("/analyze", app.test_client(), "/analyze?ticker=TSLA&days=90"),
+    ("/tickers", app.test_client(), "/tickers"),
+    ("history (365 rows)", history_app.test_client(), "/history"),
+]:
+    print(f"{name}  ({N} requests per variant)")
+    for variant, headers in VARIANTS:
+        size, full, cond = measure(client, url, headers)
+        print(f"  {variant:13} 200: {size:6d} B {full * 1e3:6.2f} ms   304: 0 B {cond * 1e3:6.2f} ms")
+print("=" * 78)
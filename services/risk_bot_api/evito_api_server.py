@@ -4,8 +4,28 @@ Provides risk analysis for stock tickers
 """
 from flask import Flask, request, jsonify
 from datetime import datetime
+from pathlib import Path
 import os
+import sys
+# enhanced_risk_bot / ticker_index live in services/risk (copied flat into /app in the container)
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "risk"))
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "shared"))  # market_cycles (precompute)
+from enhanced_risk_bot import KNOWN_TICKERS, TICKER_INDEX, looks_like_ticker, validate_ticker
+from http_cache import content_version, versioned
+from precompute import CardPrecomputer, parse_tickers
 app = Flask(__name__)
+TICKERS_RESPONSE = {
+    "tickers": [
+        {"symbol": "TSLA", "name": "Tesla"},
+        {"symbol": "AAPL", "name": "Apple"},
+        {"symbol": "MSFT", "name": "Microsoft"},
+        {"symbol": "GOOGL", "name": "Google"},
+        {"symbol": "NVDA", "name": "NVIDIA"},
+        {"symbol": "META", "name": "Meta"},
+        {"symbol": "AMZN", "name": "Amazon"}
+    ]
+}
+TICKERS_VERSION = content_version(TICKERS_RESPONSE)  # static list: hashed once
 # ============================================================
 # RISK ANALYSIS ENDPOINT
 # ============================================================
@@ -22,15 +42,30 @@ def analyze():
         days = request.args.get("days", 90, type=int)
     if not ticker:
         return jsonify({"error": "Ticker symbol required"}), 400
-    ticker = ticker.upper()
+    ticker = ticker.upper().strip()
+    # Only malformed symbols are refused; well-formed unknown ones get a card with a warning
+    if not looks_like_ticker(ticker):
+        _, _, ticker_error = validate_ticker(ticker)
+        return jsonify({
+            "success": False,
+            "error": ticker_error,
+            "ticker_entered": ticker,
+            "suggestions": []
+        }), 400
 
-    # Mock risk analysis (replace with your actual logic later)
-    # Make score depend on ticker AND days so horizon changes reflect in output
     try:
         days_int = int(days)
     except Exception:
         days_int = 90
-
+    # Standard cycles of watched tickers come precomputed; anything else is computed once and cached
+    card, version = PRECOMPUTER.get(ticker, days_int)
+    if ticker in TICKER_INDEX and days_int in PRECOMPUTER.cycles:
+        PRECOMPUTER.watch(ticker)
+    return versioned(card, version=version)
+def compute_card(ticker, days_int):
+    """Risk card for one ticker/horizon (the expensive part; normally run by the precomputer)"""
+    # Mock risk analysis (replace with your actual logic later)
+    # Make score depend on ticker AND days so horizon changes reflect in output
     risk_score = abs(hash(f"{ticker}-{days_int}")) % 100
     if risk_score < 30:
         risk_level = "Low"
@@ -58,7 +93,25 @@ def analyze():
             {"name": "Horizon Sensitivity", "score": (days_int % 365) // 30},
         ]
     }
-    return jsonify(result)
+    _, suggestions, ticker_error = validate_ticker(ticker)
+    if ticker_error:
+        result["warning"] = ticker_error
+        result["suggestions"] = suggestions
+    return result
+# Watched = the engine's known tickers + the /tickers list (+ EVITO_WATCHED_TICKERS)
+WATCHED_TICKERS = list(dict.fromkeys(
+    KNOWN_TICKERS
+    + [t["symbol"] for t in TICKERS_RESPONSE["tickers"]]
+    + parse_tickers(os.getenv("EVITO_WATCHED_TICKERS"))
+))
+PRECOMPUTER = CardPrecomputer(compute_card, WATCHED_TICKERS)
+@app.route("/precompute", methods=["GET", "POST"])
+def precompute():
+    """GET: precompute stats. POST: recompute all cards now (call after a data update)"""
+    if request.method == "POST":
+        PRECOMPUTER.trigger()
+        return jsonify({"status": "scheduled", **PRECOMPUTER.stats()}), 202
+    return jsonify(PRECOMPUTER.stats())
 # ============================================================
 # UTILITY ENDPOINTS
 # ============================================================
@@ -81,7 +134,8 @@ def info():
             "/analyze": "GET or POST - Analyze ticker risk (params: ticker, days)",
             "/health": "GET - Health check",
             "/info": "GET - API information",
-            "/tickers": "GET - List supported tickers"
+            "/tickers": "GET - List supported tickers",
+            "/precompute": "GET - Precomputed card stats; POST - recompute now (after a data update)"
         },
         "examples": {
             "analyze_get": "GET /analyze?ticker=TSLA&days=90",
@@ -91,17 +145,7 @@ def info():
 @app.route("/tickers", methods=["GET"])
 def tickers():
     """List some example tickers"""
-    return jsonify({
-        "tickers": [
-            {"symbol": "TSLA", "name": "Tesla"},
-            {"symbol": "AAPL", "name": "Apple"},
-            {"symbol": "MSFT", "name": "Microsoft"},
-            {"symbol": "GOOGL", "name": "Google"},
-            {"symbol": "NVDA", "name": "NVIDIA"},
-            {"symbol": "META", "name": "Meta"},
-            {"symbol": "AMZN", "name": "Amazon"}
-        ]
-    })
+    return versioned(TICKERS_RESPONSE, version=TICKERS_VERSION)
 @app.route("/explain", methods=["POST"])
 def explain():
     """Explain risk analysis"""
@@ -149,4 +193,7 @@ if __name__ == "__main__":
     print("    ║  💡 GET /info for endpoints            ║")
     print("    ╚═══════════════════════════════════════╝")
     print("="*60 + "\n")
+    print(f"📇 Ticker index loaded: {len(TICKER_INDEX)} symbols")
+    PRECOMPUTER.start()
+    print(f"🔥 Precomputing {len(WATCHED_TICKERS)} tickers x {len(PRECOMPUTER.cycles)} cycles every {PRECOMPUTER.interval:.0f}s")
     app.run(host="0.0.0.0", port=8081, debug=False)
@@ -0,0 +1,68 @@
+"""
+Conditional, content-negotiated JSON responses for the Risk API.
+- ETag = hash of the content (volatile fields like timestamp excluded), per representation
+- If-None-Match match -> 304 with no body, before anything is serialized
+- Accept: application/msgpack -> MessagePack body (if msgpack is installed), else JSON
+- Accept-Encoding: gzip -> gzip body once it is worth compressing
+"""
+from hashlib import sha1
+import gzip
+import json
+
+from flask import Response, request
+
+try:
+    import msgpack  # Optional dep
+except ImportError:
+    msgpack = None
+
+MSGPACK_TYPES = ("application/msgpack", "application/x-msgpack")
+GZIP_MIN_BYTES = 512
+GZIP_LEVEL = 5
+
+
+def content_version(result, exclude=("timestamp",)) -> str:
+    """Stable hash of result without the excluded top-level keys."""
+    content = {k: v for k, v in result.items() if k not in exclude}
+    return sha1(json.dumps(content, sort_keys=True, default=str).encode("utf-8")).hexdigest()[:16]
+
+
+def wants_msgpack() -> bool:
+    if msgpack is None:
+        return False
+    best = request.accept_mimetypes.best_match(("application/json",) + MSGPACK_TYPES, default="application/json")
+    return best in MSGPACK_TYPES
+
+
+def versioned(result, version=None):
+    """
+    Response for result (a JSON-able dict). Pass version when it is already known (e.g. a
+    cached card) to skip hashing. Representations get distinct ETags (-mp / -gz suffixes)
+    so a cache never mixes them up.
+    """
+    use_msgpack = wants_msgpack()
+    use_gzip = "gzip" in request.accept_encodings
+    etag = (version or content_version(result)) + ("-mp" if use_msgpack else "")
+    vary = "Accept, Accept-Encoding"
+
+    # Body size decides gzip, so compare against both the plain and the -gz tag before serializing
+    if request.method in ("GET", "HEAD"):
+        for tag in (etag, etag + "-gz"):
+            if request.if_none_match.contains(tag):
+                resp = Response(status=304)
+                resp.set_etag(tag)
+                resp.headers["Vary"] = vary
+                return resp
+
+    if use_msgpack:
+        body, mimetype = msgpack.packb(result, use_bin_type=True, default=str), MSGPACK_TYPES[0]
+    else:
+        body, mimetype = json.dumps(result, separators=(",", ":"), default=str).encode("utf-8"), "application/json"
+    headers = {"Vary": vary}
+    if use_gzip and len(body) >= GZIP_MIN_BYTES:
+        body = gzip.compress(body, GZIP_LEVEL)
+        headers["Content-Encoding"] = "gzip"
+        etag += "-gz"
+    resp = Response(body, mimetype=mimetype, headers=headers)
+    resp.set_etag(etag)
+    return resp
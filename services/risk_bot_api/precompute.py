@@ -0,0 +1,136 @@
+"""
+Risk card precomputation for the Risk API.
+- Background thread computes every (watched ticker x standard cycle) card after each data
+  update (every EVITO_PRECOMPUTE_INTERVAL seconds, or on trigger()) and swaps them into the
+  result cache in one step, with their ETag versions
+- Interactive requests for those keys are a dict lookup; off-cycle horizons and unwatched
+  tickers are computed on demand and kept in a bounded LRU until the next refresh
+- Tickers requested interactively join the watched set, so they are warm from the next pass;
+  only those additions are evicted (oldest first) past MAX_WATCHED, never the base tickers
+- The background thread starts with the first lookup, so WSGI runners that never execute the
+  server's __main__ still refresh (start() there only warms the cache before serving)
+"""
+from collections import OrderedDict
+from typing import Callable, Dict, Iterable, Optional, Tuple
+import os
+import threading
+import time
+
+from http_cache import content_version
+from market_cycles import MARKET_CYCLES
+
+# Every standard horizon (the app's STANDARD_CYCLES are a subset)
+STANDARD_CYCLES = sorted(int(d) for d in MARKET_CYCLES)
+PRECOMPUTE_CYCLES = [int(d) for d in os.getenv("EVITO_PRECOMPUTE_CYCLES", ",".join(map(str, STANDARD_CYCLES))).split(",")]
+PRECOMPUTE_INTERVAL = float(os.getenv("EVITO_PRECOMPUTE_INTERVAL", "300"))
+MAX_WATCHED = 500  # tickers added by interactive requests, on top of the base set
+MAX_ON_DEMAND = 2000
+
+Card = Tuple[Dict, str]  # (card, version)
+
+
+class CardPrecomputer:
+    def __init__(
+        self,
+        compute: Callable[[str, int], Dict],
+        tickers: Iterable[str],
+        cycles: Iterable[int] = PRECOMPUTE_CYCLES,
+        interval: float = PRECOMPUTE_INTERVAL,
+    ):
+        self.compute = compute
+        self.cycles = sorted(set(cycles))
+        self.interval = interval
+        self.last_refresh = None  # {"at", "cards", "seconds"} of the latest pass
+        self._base = list(dict.fromkeys(t.upper() for t in tickers))
+        self._base_set = set(self._base)
+        self._watched: "OrderedDict[str, None]" = OrderedDict()  # on-demand additions, oldest first
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._precomputed: Dict[Tuple[str, int], Card] = {}
+        self._on_demand: "OrderedDict[Tuple[str, int], Card]" = OrderedDict()
+        self._thread = None
+
+    # ---------------- lifecycle ----------------
+
+    def start(self) -> "CardPrecomputer":
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="card-precompute", daemon=True)
+                self._thread.start()
+        return self
+
+    def trigger(self) -> None:
+        """Recompute now (call after a data update)."""
+        self._wake.set()
+
+    def _run(self) -> None:
+        while True:
+            try:
+                self.refresh()
+            except Exception as e:
+                print(f"Card precompute failed: {e}")
+            self._wake.wait(self.interval)
+            self._wake.clear()
+
+    def refresh(self) -> int:
+        """Compute every watched ticker x cycle card and swap them in; returns the card count."""
+        t0 = time.perf_counter()
+        with self._lock:
+            tickers = self._base + list(self._watched)
+        cards = {}
+        for ticker in tickers:
+            for days in self.cycles:
+                card = self.compute(ticker, days)
+                cards[(ticker, days)] = (card, content_version(card))
+        with self._lock:
+            self._precomputed = cards
+            self._on_demand.clear()  # computed against the previous data
+        self.last_refresh = {"at": time.time(), "cards": len(cards), "seconds": round(time.perf_counter() - t0, 3)}
+        return len(cards)
+
+    # ---------------- lookups ----------------
+
+    def get(self, ticker: str, days: int) -> Card:
+        """Cached (card, version); computes on demand for keys outside the precomputed grid."""
+        if self._thread is None:
+            self.start()
+        key = (ticker.upper(), days)
+        with self._lock:
+            hit = self._precomputed.get(key) or self._on_demand.get(key)
+            if hit is not None:
+                if key in self._on_demand:
+                    self._on_demand.move_to_end(key)
+                return hit
+        card = self.compute(key[0], days)
+        hit = (card, content_version(card))
+        with self._lock:
+            self._on_demand[key] = hit
+            while len(self._on_demand) > MAX_ON_DEMAND:
+                self._on_demand.popitem(last=False)
+        return hit
+
+    def watch(self, ticker: str) -> None:
+        """Add ticker to the precomputed set from the next refresh on."""
+        ticker = ticker.upper()
+        if ticker in self._base_set:
+            return
+        with self._lock:
+            self._watched[ticker] = None
+            self._watched.move_to_end(ticker)  # recently requested tickers are evicted last
+            while len(self._watched) > MAX_WATCHED:
+                self._watched.popitem(last=False)
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                "watched": len(self._base) + len(self._watched),
+                "on_demand_watched": len(self._watched),
+                "cycles": self.cycles,
+                "precomputed": len(self._precomputed),
+                "on_demand": len(self._on_demand),
+                "last_refresh": self.last_refresh,
+            }
+
+
+def parse_tickers(value: Optional[str]) -> list:
+    return [t.strip().upper() for t in (value or "").split(",") if t.strip()]
@@ -40,3 +40,25 @@ CREATE TABLE IF NOT EXISTS user_preferences (
     allow_training BOOLEAN DEFAULT FALSE,  -- TRUE betyr at anonymisert data kan brukes til Finetuning
     created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
 );
+
+-- 5. Tabell for BRIEFS (Streamlit-biblioteket: lagrede/vinner-briefs)
+-- Brukes av services/streamlit_app/pg_library_store.py (EVITO_LIBRARY_DSN)
+CREATE TABLE IF NOT EXISTS briefs (
+    id TEXT PRIMARY KEY,                   -- uuid fra appen
+    ticker VARCHAR(16),
+    days INTEGER,
+    model TEXT,
+    persona TEXT,
+    timestamp DOUBLE PRECISION,            -- epoch sekunder (samme som JSONL)
+    text TEXT,
+    prompt_version TEXT,
+    winner BOOLEAN NOT NULL DEFAULT FALSE,
+    audited BOOLEAN NOT NULL DEFAULT FALSE,
+    headlines JSONB,
+    extra JSONB,                           -- øvrige felter fra entry
+    embedding VECTOR(384)                  -- all-MiniLM-L6-v2, normalisert
+);
+CREATE INDEX IF NOT EXISTS idx_briefs_embedding ON briefs USING hnsw (embedding vector_cosine_ops);
+CREATE INDEX IF NOT EXISTS idx_briefs_ticker ON briefs (ticker, timestamp DESC);
+CREATE INDEX IF NOT EXISTS idx_briefs_winner ON briefs (timestamp DESC) WHERE winner;
+CREATE INDEX IF NOT EXISTS idx_briefs_timestamp ON briefs (timestamp DESC);
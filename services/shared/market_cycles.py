@@ -0,0 +1,20 @@
+"""
+EVITO market cycles: the standard analysis horizons (days) and why each one exists.
+Shared by the Slack bot (timeframe education) and the Risk API (precomputed cycles).
+"""
+
+MARKET_CYCLES = {
+    # Short-term trading cycles
+    "7": {"name": "Weekly", "reason": "Trading week cycle", "type": "✅ Standard"},
+    "14": {"name": "Bi-weekly", "reason": "Options expiry cycle", "type": "✅ Standard"},
+    "21": {"name": "Monthly Trading", "reason": "~Trading month (21 business days)", "type": "✅ Standard"},
+    "30": {"name": "Calendar Month", "reason": "Monthly reporting period", "type": "✅ Standard"},
+    # Medium-term cycles
+    "60": {"name": "Bi-monthly", "reason": "2-month trend analysis", "type": "✅ Standard"},
+    "90": {"name": "Quarterly", "reason": "Earnings cycle (Q1, Q2, Q3, Q4)", "type": "✅ Standard"},
+    "180": {"name": "Semi-Annual", "reason": "Half-year business cycle", "type": "✅ Standard"},
+    # Long-term cycles
+    "252": {"name": "Trading Year", "reason": "Full year of trading days", "type": "✅ Standard"},
+    "365": {"name": "Calendar Year", "reason": "Annual reporting cycle", "type": "✅ Standard"},
+    "730": {"name": "2 Years", "reason": "Long-term trend analysis", "type": "✅ Standard"},
+}
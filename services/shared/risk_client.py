@@ -0,0 +1,112 @@
+"""
+EVITO Risk Client
+Shared way for bots/clients to get risk snapshots.
+
+- Default: in-process call into enhanced_risk_bot (zero network hops)
+- Fallback: HTTP Risk API (EVITO_API_URL) when the engine can't be imported,
+  or when EVITO_RISK_MODE=http
+- get_risks() batches several tickers in one call (parallel requests over HTTP)
+"""
+import os
+import re
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import requests
+
+# enhanced_risk_bot lives in services/risk
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "risk"))
+
+API_URL = os.getenv("EVITO_API_URL", "http://localhost:8081")
+RISK_MODE = os.getenv("EVITO_RISK_MODE", "inprocess")
+MAX_PARALLEL_FETCHES = 8
+
+try:
+    if RISK_MODE == "http":
+        raise ImportError("EVITO_RISK_MODE=http")
+    from enhanced_risk_bot import analyze_ticker, analyze_tickers, split_horizon, validate_horizon, validate_ticker
+    ENGINE = "inprocess"
+except (ImportError, OSError) as e:
+    print(f"⚠️ Risk engine not importable ({e}); using Risk API at {API_URL}")
+    analyze_ticker = analyze_tickers = split_horizon = validate_horizon = validate_ticker = None
+    ENGINE = "http"
+
+_session = requests.Session()
+
+
+def _from_api(data: dict, horizon: int) -> dict:
+    """Normalize a Risk API /analyze card to the enhanced_risk_bot result shape."""
+    factors = [f.get("name", "") if isinstance(f, dict) else f for f in data.get("factors", [])]
+    risk_score = data.get("risk_score", 0)
+    return {
+        "success": True,
+        "ticker": data.get("ticker"),
+        "horizon": data.get("days", horizon),
+        "risk_score": risk_score,
+        "factors": factors,
+        "verdict": f"{risk_score}% - {data.get('risk_level', 'Unknown')} risk",
+        "recommendation": data.get("recommendation", ""),
+        "timestamp": data.get("timestamp"),
+    }
+
+
+def _fetch_api(ticker: str, horizon: int) -> dict:
+    try:
+        resp = _session.get(f"{API_URL}/analyze", params={"ticker": ticker, "days": horizon}, timeout=10)
+        data = resp.json()
+    except Exception as e:
+        return {"success": False, "ticker": ticker, "error": f"Risk API unavailable: {e}"}
+    if resp.status_code != 200:
+        data.setdefault("success", False)
+        data.setdefault("ticker", ticker)
+        return data
+    return _from_api(data, horizon)
+
+
+def check_ticker(ticker: str) -> tuple[bool, list, str | None]:
+    """validate_ticker() from the engine; without it every ticker passes (the API validates)."""
+    if validate_ticker is None:
+        return True, [], None
+    return validate_ticker(ticker)
+
+
+def check_horizon(horizon) -> tuple[bool, str | None]:
+    """validate_horizon() from the engine (1-365 days); same rule when only the API is available."""
+    if validate_horizon is not None:
+        return validate_horizon(horizon)
+    try:
+        days = int(horizon)
+    except (TypeError, ValueError):
+        return False, "Horizon must be a number"
+    if not 1 <= days <= 365:
+        return False, "Horizon must be between 1 and 365 days"
+    return True, None
+
+
+def parse_risk_args(parts: list) -> tuple[list, str | None]:
+    """split_horizon() from the engine: (tickers, trailing horizon token or None); numeric-only without it."""
+    if split_horizon is not None:
+        return split_horizon(parts)
+    if len(parts) > 1 and re.fullmatch(r"[-+]?\d+(\.\d+)?", parts[-1]):
+        return parts[:-1], parts[-1]
+    return parts, None
+
+
+def get_risk(ticker: str, horizon: int = 90) -> dict:
+    """Risk snapshot for one ticker."""
+    ticker = ticker.upper().strip()
+    if ENGINE == "inprocess":
+        return analyze_ticker(ticker, horizon)
+    return _fetch_api(ticker, horizon)
+
+
+def get_risks(tickers: list[str], horizon: int = 90) -> list[dict]:
+    """Risk snapshots for several tickers, in input order (one vectorized call in-process)."""
+    tickers = [t.upper().strip() for t in tickers]
+    if not tickers:
+        return []
+    if ENGINE == "inprocess":
+        return analyze_tickers(tickers, horizon)
+    with ThreadPoolExecutor(max_workers=min(MAX_PARALLEL_FETCHES, len(tickers))) as pool:
+        return list(pool.map(lambda t: _fetch_api(t, horizon), tickers))
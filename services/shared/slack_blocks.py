@@ -207,9 +207,75 @@ def format_ticker_error(error_result):
         }]
     }
 # =============================================
+# EVITO MULTI-TICKER TABLE - QUANTUM NORDIC OS
+# =============================================
+def format_risk_table(results, horizon, errors=None):
+    """
+    Format several risk results as one compact table message
+    Quantum Nordic OS style
+    Args:
+        results (list): Risk results (engine or /analyze cards), in display order
+        horizon (int): Horizon in days shared by all rows
+        errors (list): Optional (ticker, message) pairs for tickers that failed
+    Returns:
+        dict: Slack blocks JSON
+    """
+    rows = [f"{'TICKER':<7}{'SCORE':>6}  STATUS"]
+    top_score = 0
+    for result in results:
+        ticker = result.get('ticker', '?')
+        risk_score = result.get('risk_score', 0)
+        verdict = result.get('verdict', '')
+        status = result.get('risk_level') or (verdict.split(' - ')[1] if ' - ' in verdict else verdict)
+        rows.append(f"{ticker:<7}{risk_score:>5}%  {get_risk_glyph(risk_score)} {status}")
+        top_score = max(top_score, risk_score)
+    blocks = [
+        {
+            "type": "header",
+            "text": {
+                "type": "plain_text",
+                "text": f"⚡ RISK MATRIX · {len(results)} tickers · {horizon}D",
+                "emoji": False
+            }
+        },
+        {
+            "type": "section",
+            "text": {
+                "type": "mrkdwn",
+                "text": "```" + "\n".join(rows) + "```"
+            }
+        }
+    ]
+    if errors:
+        blocks.append({
+            "type": "section",
+            "text": {
+                "type": "mrkdwn",
+                "text": "*● Skipped*\n" + "\n".join(f"○ `{t}` — {msg}" for t, msg in errors)
+            }
+        })
+    blocks.append({
+        "type": "context",
+        "elements": [
+            {
+                "type": "mrkdwn",
+                "text": f"⚡ EVITO Risk Engine · {datetime.utcnow().strftime('%H:%M UTC')}"
+            }
+        ]
+    })
+    return {
+        "text": f"Risk matrix for {', '.join(r.get('ticker', '?') for r in results)}",
+        "blocks": blocks,
+        "attachments": [{
+            "color": get_slack_color_for_risk(top_score),
+            "blocks": []
+        }]
+    }
+# =============================================
 # EXPORT ALL
 # =============================================
 __all__ = [
     'format_risk_analysis',
-    'format_ticker_error'
+    'format_ticker_error',
+    'format_risk_table'
 ]
@@ -0,0 +1,263 @@
+"""
+EVITO Slack Outbox
+Outbound Slack message queue with rate-limit awareness.
+
+- One background worker; per-channel FIFO queues with token buckets
+  (Slack allows ~1 message/sec per channel, short bursts tolerated)
+- HTTP 429 -> honour Retry-After, pause that channel and retry the same message;
+  connection errors/timeouts/5xx retry with backoff, anything else fails the Future at once
+- Progress messages are coalesced: the first progress() posts, later progress()/finish()
+  calls edit that message via chat.update; a still-queued edit is replaced, not stacked
+- Works with a slack_sdk/Bolt WebClient (chat.postMessage/chat.update) and with
+  incoming webhooks (channel key = webhook URL)
+"""
+import threading
+import time
+import urllib.error
+from collections import deque
+from concurrent.futures import Future
+
+import requests
+import urllib3
+
+CHANNEL_RATE = 1.0      # messages per second per channel
+CHANNEL_BURST = 3       # bucket capacity
+MAX_RETRIES = 5
+DEFAULT_RETRY_AFTER = 1.0
+# No response at all: requests (webhooks), urllib3, and urllib/socket (slack_sdk WebClient)
+NETWORK_ERRORS = (
+    requests.ConnectionError,
+    requests.Timeout,
+    urllib3.exceptions.HTTPError,
+    urllib.error.URLError,
+    ConnectionError,
+    TimeoutError,
+)
+
+
+class TokenBucket:
+    """Classic token bucket; `pause()` blocks the bucket until a Retry-After deadline."""
+
+    def __init__(self, rate=CHANNEL_RATE, capacity=CHANNEL_BURST):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = float(capacity)
+        self.updated = time.monotonic()
+        self.paused_until = 0.0
+
+    def _refill(self, now):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self, now=None):
+        """Seconds until a token is available (0 if one is available now)."""
+        now = time.monotonic() if now is None else now
+        self._refill(now)
+        if now < self.paused_until:
+            return self.paused_until - now
+        if self.tokens >= 1:
+            return 0.0
+        return (1 - self.tokens) / self.rate
+
+    def take(self):
+        self._refill(time.monotonic())
+        self.tokens -= 1
+
+    def pause(self, seconds):
+        self.paused_until = max(self.paused_until, time.monotonic() + seconds)
+        self.tokens = 0.0
+
+
+class RateLimited(Exception):
+    def __init__(self, retry_after):
+        super().__init__(f"rate limited, retry after {retry_after}s")
+        self.retry_after = retry_after
+
+
+def _retry_after(response):
+    """Retry-After seconds from an HTTP/Slack response, if it was a 429."""
+    if response is None or getattr(response, "status_code", None) != 429:
+        return None
+    headers = getattr(response, "headers", None) or {}
+    for name, value in headers.items():
+        if name.lower() == "retry-after":
+            try:
+                return float(value[0] if isinstance(value, list) else value)
+            except (TypeError, ValueError):
+                break
+    return DEFAULT_RETRY_AFTER
+
+
+def _is_transient(error):
+    """
+    Connection errors, timeouts and HTTP 429/5xx (webhook HTTPError, SlackApiError) are worth
+    retrying; anything else - other API errors, bugs such as a KeyError in block building - is not.
+    """
+    if isinstance(error, urllib.error.HTTPError):
+        return error.code == 429 or error.code >= 500
+    status = getattr(getattr(error, "response", None), "status_code", None)
+    if status is not None:
+        return status == 429 or status >= 500
+    return isinstance(error, NETWORK_ERRORS)
+
+
+class SlackOutbox:
+    """
+    Queue outbound Slack messages; every call returns a Future resolved with the
+    Slack response (or the webhook HTTP response) once the message is delivered.
+    """
+
+    def __init__(self, client=None, rate=CHANNEL_RATE, burst=CHANNEL_BURST, max_retries=MAX_RETRIES):
+        self.client = client
+        self.rate = rate
+        self.burst = burst
+        self.max_retries = max_retries
+        self._queues = {}       # channel -> deque of items
+        self._buckets = {}      # channel -> TokenBucket
+        self._progress_ts = {}  # (channel, key) -> ts of the posted progress message
+        self._cv = threading.Condition()
+        self._session = requests.Session()
+        self._worker = threading.Thread(target=self._run, name="slack-outbox", daemon=True)
+        self._worker.start()
+
+    # ---------------- public API ----------------
+
+    def post(self, channel, message):
+        """chat.postMessage (message: str or dict with text/blocks/attachments)."""
+        return self._enqueue(channel, {"kind": "post", "payload": _as_payload(message)})
+
+    def post_webhook(self, url, message):
+        """POST to an incoming webhook, rate limited per webhook URL."""
+        return self._enqueue(url, {"kind": "webhook", "payload": _as_payload(message)})
+
+    def progress(self, channel, key, message):
+        """Post or edit the single progress message identified by key."""
+        return self._enqueue_keyed(channel, key, _as_payload(message), final=False)
+
+    def finish(self, channel, key, message):
+        """Replace the progress message for key with the final message (posts if none)."""
+        return self._enqueue_keyed(channel, key, _as_payload(message), final=True)
+
+    def sayer(self, channel, key=None):
+        """Bolt-style `say` bound to channel; `.progress()`/`.finish()` coalesce on key."""
+        return _Sayer(self, channel, key)
+
+    def pending(self):
+        with self._cv:
+            return sum(len(q) for q in self._queues.values())
+
+    # ---------------- queueing ----------------
+
+    def _enqueue(self, channel, item):
+        item.setdefault("future", Future())
+        item.setdefault("attempts", 0)
+        item["channel"] = channel
+        with self._cv:
+            self._queues.setdefault(channel, deque()).append(item)
+            self._buckets.setdefault(channel, TokenBucket(self.rate, self.burst))
+            self._cv.notify()
+        return item["future"]
+
+    def _enqueue_keyed(self, channel, key, payload, final):
+        if key is not None:  # keyless progress/finish are plain posts, never merged into others
+            with self._cv:
+                # Coalesce: a still-queued message for this key just gets the newer payload
+                for item in self._queues.get(channel, ()):
+                    if item["kind"] == "keyed" and item.get("key") == key and not item.get("final"):
+                        item["payload"] = payload
+                        item["final"] = final
+                        return item["future"]
+        return self._enqueue(channel, {"kind": "keyed", "payload": payload, "key": key, "final": final})
+
+    # ---------------- worker ----------------
+
+    def _next_item(self):
+        """Pop the next sendable item (channel with a token), waiting as needed."""
+        with self._cv:
+            while True:
+                now = time.monotonic()
+                soonest = None
+                for channel, queue in self._queues.items():
+                    if not queue:
+                        continue
+                    wait = self._buckets[channel].wait_time(now)
+                    if wait <= 0:
+                        self._buckets[channel].take()
+                        return queue.popleft()
+                    soonest = wait if soonest is None else min(soonest, wait)
+                self._cv.wait(timeout=soonest)
+
+    def _run(self):
+        while True:
+            item = self._next_item()
+            try:
+                result = self._send(item)
+            except RateLimited as e:
+                with self._cv:
+                    self._buckets[item["channel"]].pause(e.retry_after)
+                    self._queues[item["channel"]].appendleft(item)
+                continue
+            except Exception as e:
+                item["attempts"] += 1
+                if _is_transient(e) and item["attempts"] < self.max_retries:
+                    with self._cv:
+                        self._buckets[item["channel"]].pause(DEFAULT_RETRY_AFTER * item["attempts"])
+                        self._queues[item["channel"]].appendleft(item)
+                    continue
+                print(f"❌ Slack outbox dropped message for {item['channel'][:40]}: {e}")
+                item["future"].set_exception(e)
+                continue
+            item["future"].set_result(result)
+
+    def _send(self, item):
+        channel, payload, kind = item["channel"], item["payload"], item["kind"]
+        if kind == "webhook":
+            resp = self._session.post(channel, json=payload, timeout=5)
+            retry = _retry_after(resp)
+            if retry is not None:
+                raise RateLimited(retry)
+            resp.raise_for_status()
+            return resp
+
+        key = (channel, item.get("key"))
+        try:
+            # Same-channel FIFO: a keyed message always sees its progress post's ts
+            if kind == "keyed" and key in self._progress_ts:
+                resp = self.client.chat_update(channel=channel, ts=self._progress_ts[key], **payload)
+            else:
+                resp = self.client.chat_postMessage(channel=channel, **payload)
+        except Exception as e:
+            retry = _retry_after(getattr(e, "response", None))
+            if retry is not None:
+                raise RateLimited(retry)
+            raise
+        if item.get("key") is not None:
+            if item.get("final"):
+                self._progress_ts.pop(key, None)
+            else:
+                self._progress_ts[key] = resp["ts"]
+        return resp
+
+
+class _Sayer:
+    """Callable stand-in for Bolt's `say`, routed through the outbox."""
+
+    def __init__(self, outbox, channel, key):
+        self.outbox = outbox
+        self.channel = channel
+        self.key = key
+
+    def __call__(self, message):
+        return self.outbox.post(self.channel, message)
+
+    def progress(self, message):
+        return self.outbox.progress(self.channel, self.key, message)
+
+    def finish(self, message):
+        return self.outbox.finish(self.channel, self.key, message)
+
+
+def _as_payload(message):
+    if isinstance(message, str):
+        return {"text": message}
+    return dict(message)
@@ -1,7 +1,7 @@
 #!/usr/bin/env python3
 """Test the Quantum Nordic OS Slack formatters"""
 import json
-from slack_blocks import format_risk_analysis, format_ticker_error
+from slack_blocks import format_risk_analysis, format_ticker_error, format_risk_table
 print("╔═══════════════════════════════════════════════════════════╗")
 print("║  QUANTUM NORDIC OS - SLACK BLOCK KIT TEST                ║")
 print("╚═══════════════════════════════════════════════════════════╝\n")
@@ -74,6 +74,16 @@ error_result = {
 }
 formatted_error = format_ticker_error(error_result)
 print(json.dumps(formatted_error, indent=2))
+# Test 5: Multi-ticker table
+print("\n" + "=" * 60)
+print("TEST 5: MULTI-TICKER TABLE (TSLA NVDA AAPL + TSLS typo)")
+print("=" * 60)
+formatted_table = format_risk_table(
+    [evito_result_high, evito_result_medium, evito_result_low],
+    30,
+    errors=[("TSLS", "Did you mean: TSLA?")]
+)
+print(json.dumps(formatted_table, indent=2))
 print("\n" + "=" * 60)
 print("✅ ALL TESTS COMPLETE")
 print("=" * 60)
@@ -1,29 +1,31 @@
 import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
 import requests
 from dotenv import load_dotenv
 from slack_bolt import App
 from slack_bolt.adapter.socket_mode import SocketModeHandler
 from datetime import datetime
+from pathlib import Path
 load_dotenv()
+# Shared ticker index (services/risk/ticker_index.py), loaded once at startup
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "risk"))
+from enhanced_risk_bot import TICKER_INDEX, looks_like_ticker, split_horizon, validate_horizon, validate_ticker
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "shared"))
+from market_cycles import MARKET_CYCLES
+from slack_blocks import format_risk_table
+from slack_outbox import SlackOutbox
 app = App(token=os.environ.get("SLACK_BOT_TOKEN"))
+# Outbound queue: per-channel token buckets, Retry-After handling, chat.update coalescing
+OUTBOX = SlackOutbox(app.client)
 # ============================================================
 # MARKET CYCLES EDUCATION DATA
 # ============================================================
-MARKET_CYCLES = {
-    # Short-term trading cycles
-    "7": {"name": "Weekly", "reason": "Trading week cycle", "type": "✅ Standard"},
-    "14": {"name": "Bi-weekly", "reason": "Options expiry cycle", "type": "✅ Standard"},
-    "21": {"name": "Monthly Trading", "reason": "~Trading month (21 business days)", "type": "✅ Standard"},
-    "30": {"name": "Calendar Month", "reason": "Monthly reporting period", "type": "✅ Standard"},
-    # Medium-term cycles
-    "60": {"name": "Bi-monthly", "reason": "2-month trend analysis", "type": "✅ Standard"},
-    "90": {"name": "Quarterly", "reason": "Earnings cycle (Q1, Q2, Q3, Q4)", "type": "✅ Standard"},
-    "180": {"name": "Semi-Annual", "reason": "Half-year business cycle", "type": "✅ Standard"},
-    # Long-term cycles
-    "252": {"name": "Trading Year", "reason": "Full year of trading days", "type": "✅ Standard"},
-    "365": {"name": "Calendar Year", "reason": "Annual reporting cycle", "type": "✅ Standard"},
-    "730": {"name": "2 Years", "reason": "Long-term trend analysis", "type": "✅ Standard"},
-}
+# MARKET_CYCLES: services/shared/market_cycles.py (the Risk API precomputes the same horizons)
+# Multi-ticker /risk: pooled connections, bounded parallelism
+MAX_TICKERS_PER_COMMAND = 10
+MAX_PARALLEL_FETCHES = 8
+session = requests.Session()
 ODD_TIMEFRAMES = [
     40, 50, 70, 80, 100, 110, 120, 140, 150, 160, 170, 190,
     200, 210, 220, 240, 260, 280, 300, 320, 340
@@ -88,7 +90,7 @@ def call_risk_api(ticker, days=90):
     """Call the Risk API for analysis"""
     try:
         print(f"🔗 Calling Risk API: http://localhost:8081/analyze?ticker={ticker}&days={days}")
-        response = requests.get(
+        response = session.get(
             "http://localhost:8081/analyze",
             params={"ticker": ticker, "days": days},
             timeout=10
@@ -107,6 +109,123 @@ def call_risk_api(ticker, days=90):
     except Exception as e:
         print(f"❌ Error calling Risk API: {e}")
         return None
+def call_risk_apis(tickers, days=90):
+    """Call the Risk API for several tickers concurrently; returns {ticker: data or None}"""
+    workers = min(MAX_PARALLEL_FETCHES, len(tickers))
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        return dict(zip(tickers, pool.map(lambda t: call_risk_api(t, days), tickers)))
+def handle_multi_ticker(tickers, days, say):
+    """Validate, fetch in parallel and reply with a single compact table message"""
+    tickers = list(dict.fromkeys(tickers))[:MAX_TICKERS_PER_COMMAND]
+    errors = []
+    valid = []
+    for ticker in tickers:
+        ticker_valid, _, ticker_error = validate_ticker(ticker)
+        if ticker_valid:
+            valid.append(ticker)
+        else:
+            errors.append((ticker, ticker_error))
+    print(f"   Analyzing {', '.join(valid)} for {days} days")
+    say.progress(f"⚡️ Analyzing {len(valid)} tickers over {days} days...")
+    results = []
+    fetched = call_risk_apis(valid, days) if valid else {}
+    for ticker in valid:
+        data = fetched.get(ticker)
+        if data:
+            results.append(data)
+        else:
+            errors.append((ticker, "Risk API unavailable"))
+    say.finish(format_risk_table(results, days, errors=errors))
+def cycle_review_message(tickers, days, timeframe_analysis):
+    """Education prompt for an off-cycle horizon: switch to the suggested cycle or continue"""
+    suggested = timeframe_analysis["suggested_days"]
+    key = "+".join(tickers)  # button value: analyze_T1+T2_DAYS
+    return {
+        "text": f"Market Intelligence: {days}-day Analysis Review",
+        "blocks": [
+            {
+                "type": "header",
+                "text": {
+                    "type": "plain_text",
+                    "text": "🎓 Market Cycle Intelligence",
+                    "emoji": True
+                }
+            },
+            {
+                "type": "section",
+                "text": {
+                    "type": "mrkdwn",
+                    "text": f"*Analysis Period Review: {days} Days*\n\n"
+                           f"Our AI has detected that your requested timeframe doesn't align "
+                           f"with institutional market cycles. This may result in less reliable patterns."
+                }
+            },
+            {
+                "type": "divider"
+            },
+            {
+                "type": "section",
+                "text": {
+                    "type": "mrkdwn",
+                    "text": timeframe_analysis["message"]
+                }
+            },
+            {
+                "type": "section",
+                "text": {
+                    "type": "mrkdwn",
+                    "text": f"*🎯 Recommended Alternative*\n"
+                           f"*{suggested} days* — _{timeframe_analysis['cycle_info']['name']}_\n"
+                           f"_{timeframe_analysis['cycle_info']['reason']}_"
+                }
+            },
+            {
+                "type": "actions",
+                "elements": [
+                    {
+                        "type": "button",
+                        "text": {
+                            "type": "plain_text",
+                            "text": f"✅ Use {suggested}-Day Analysis",
+                            "emoji": True
+                        },
+                        "value": f"analyze_{key}_{suggested}",
+                        "action_id": "use_suggested_cycle",
+                        "style": "primary"
+                    },
+                    {
+                        "type": "button",
+                        "text": {
+                            "type": "plain_text",
+                            "text": f"Continue with {days} Days",
+                            "emoji": True
+                        },
+                        "value": f"analyze_{key}_{days}",
+                        "action_id": "use_original_cycle"
+                    },
+                    {
+                        "type": "button",
+                        "text": {
+                            "type": "plain_text",
+                            "text": "📚 Learn More",
+                            "emoji": True
+                        },
+                        "value": "learn_cycles",
+                        "action_id": "learn_market_cycles"
+                    }
+                ]
+            },
+            {
+                "type": "context",
+                "elements": [
+                    {
+                        "type": "mrkdwn",
+                        "text": "💡 EVITO AI recommendations based on institutional trading patterns"
+                    }
+                ]
+            }
+        ]
+    }
 def get_risk_insight(risk_level, ticker):
     """Generate contextual insight based on risk level"""
     insights = {
@@ -279,6 +398,8 @@ def format_risk_response(ticker, days, data):
 def handle_risk_command(ack, command, say):
     """Handle /risk slash command"""
     ack()  # Acknowledge immediately
+    # Route replies through the outbox; progress + result coalesce into one message
+    say = OUTBOX.sayer(command["channel_id"], key=command.get("trigger_id"))
     text = command.get("text", "").strip()
     user = command.get("user_id")
     print(f"📥 /risk command received: '{text}' from user {user}")
@@ -313,7 +434,7 @@ def handle_risk_command(ack, command, say):
                     "fields": [
                         {
                             "type": "mrkdwn",
-                            "text": "*Risk Analysis*\n`/risk TICKER [DAYS]`"
+                            "text": "*Risk Analysis*\n`/risk TICKER [TICKER ...] [DAYS]`"
                         },
                         {
                             "type": "mrkdwn",
@@ -328,7 +449,8 @@ def handle_risk_command(ack, command, say):
                         "text": "*Example Analyses*\n"
                                "• `/risk TSLA` — Standard quarterly analysis\n"
                                "• `/risk AAPL 180` — Semi-annual risk assessment\n"
-                               "• `/risk NVDA 365` — Full trading year view"
+                               "• `/risk NVDA 365` — Full trading year view\n"
+                               "• `/risk TSLA NVDA AAPL 90` — Compare several tickers in one table"
                     }
                 },
                 {
@@ -345,7 +467,7 @@ def handle_risk_command(ack, command, say):
         return
     # Check if it's an education question
     if is_education_question(text):
-        say("🤔 Analyzing your question...")
+        say.progress("🤔 Analyzing your question...")
         try:
             response = requests.post(
                 "http://localhost:8082/ask",
@@ -355,7 +477,7 @@ def handle_risk_command(ack, command, say):
             if response.status_code == 200:
                 data = response.json()
                 answer = data.get("answer", "I couldn't generate an answer.")
-                say({
+                say.finish({
                     "text": "Market Education",
                     "blocks": [
                         {
@@ -385,7 +507,7 @@ def handle_risk_command(ack, command, say):
                     ]
                 })
             else:
-                say({
+                say.finish({
                     "text": "Education service unavailable",
                     "blocks": [
                         {
@@ -399,7 +521,7 @@ def handle_risk_command(ack, command, say):
                 })
         except Exception as e:
             print(f"Error calling education service: {e}")
-            say({
+            say.finish({
                 "text": "Error",
                 "blocks": [
                     {
@@ -412,123 +534,68 @@ def handle_risk_command(ack, command, say):
                 ]
             })
         return
-    # Parse ticker and days from command
-    parts = text.upper().split()
-    ticker = parts[0]
-    # Try to parse days (default to 90)
+    # Parse tickers and days from command: /risk TICKER [TICKER ...] [DAYS]
+    parts, horizon = split_horizon(text.upper().split())
     days = 90
-    if len(parts) > 1:
-        try:
-            days = int(parts[1])
-        except ValueError:
-            say(f"⚠️ Invalid days value: '{parts[1]}'. Using default 90 days.")
-            days = 90
+    if horizon is not None:
+        horizon_valid, horizon_error = validate_horizon(horizon)
+        if not horizon_valid:
+            say(f"⚠️ {horizon_error} (got '{horizon}'). Usage: `/risk TICKER [TICKER ...] [DAYS]`, DAYS 1-365.")
+            return
+        days = int(horizon)
+    tickers = [p for p in parts if looks_like_ticker(p)]
+    ignored = [p for p in parts if not looks_like_ticker(p)]
+    if ignored:
+        say(f"⚠️ Ignoring invalid value(s): {', '.join(ignored)}. Using {days} days.")
+    if not tickers:
+        say("⚠️ No valid ticker given. Usage: `/risk TICKER [TICKER ...] [DAYS]`")
+        return
+    if len(tickers) > 1:
+        tickers = list(dict.fromkeys(tickers))[:MAX_TICKERS_PER_COMMAND]
+        # 🎓 Same cycle education as the single-ticker path
+        timeframe_analysis = analyze_timeframe(days)
+        if not timeframe_analysis["is_standard"] and timeframe_analysis.get("suggested_days"):
+            say(cycle_review_message(tickers, days, timeframe_analysis))
+            return
+        handle_multi_ticker(tickers, days, say)
+        return
+    ticker = tickers[0]
     print(f"   Analyzing {ticker} for {days} days")
-    # 🎓 EDUCATIONAL CHECK
-    timeframe_analysis = analyze_timeframe(days)
-    # If it's an odd timeframe, educate first!
-    if not timeframe_analysis["is_standard"] and timeframe_analysis.get("suggested_days"):
-        suggested = timeframe_analysis["suggested_days"]
+    # Validate ticker against the shared index before hitting the API
+    ticker_valid, suggestions, ticker_error = validate_ticker(ticker)
+    if not ticker_valid:
         say({
-            "text": f"Market Intelligence: {days}-day Analysis Review",
+            "text": "Unknown ticker",
             "blocks": [
-                {
-                    "type": "header",
-                    "text": {
-                        "type": "plain_text",
-                        "text": "🎓 Market Cycle Intelligence",
-                        "emoji": True
-                    }
-                },
                 {
                     "type": "section",
                     "text": {
                         "type": "mrkdwn",
-                        "text": f"*Analysis Period Review: {days} Days*\n\n"
-                               f"Our AI has detected that your requested timeframe doesn't align "
-                               f"with institutional market cycles. This may result in less reliable patterns."
+                        "text": f"⚠️ *{ticker_error}*"
                     }
-                },
-                {
-                    "type": "divider"
-                },
-                {
-                    "type": "section",
-                    "text": {
-                        "type": "mrkdwn",
-                        "text": timeframe_analysis["message"]
-                    }
-                },
-                {
-                    "type": "section",
-                    "text": {
-                        "type": "mrkdwn",
-                        "text": f"*🎯 Recommended Alternative*\n"
-                               f"*{suggested} days* — _{timeframe_analysis['cycle_info']['name']}_\n"
-                               f"_{timeframe_analysis['cycle_info']['reason']}_"
-                    }
-                },
-                {
-                    "type": "actions",
-                    "elements": [
-                        {
-                            "type": "button",
-                            "text": {
-                                "type": "plain_text",
-                                "text": f"✅ Use {suggested}-Day Analysis",
-                                "emoji": True
-                            },
-                            "value": f"analyze_{ticker}_{suggested}",
-                            "action_id": "use_suggested_cycle",
-                            "style": "primary"
-                        },
-                        {
-                            "type": "button",
-                            "text": {
-                                "type": "plain_text",
-                                "text": f"Continue with {days} Days",
-                                "emoji": True
-                            },
-                            "value": f"analyze_{ticker}_{days}",
-                            "action_id": "use_original_cycle"
-                        },
-                        {
-                            "type": "button",
-                            "text": {
-                                "type": "plain_text",
-                                "text": "📚 Learn More",
-                                "emoji": True
-                            },
-                            "value": "learn_cycles",
-                            "action_id": "learn_market_cycles"
-                        }
-                    ]
-                },
-                {
-                    "type": "context",
-                    "elements": [
-                        {
-                            "type": "mrkdwn",
-                            "text": "💡 EVITO AI recommendations based on institutional trading patterns"
-                        }
-                    ]
                 }
             ]
         })
         return
+    # 🎓 EDUCATIONAL CHECK
+    timeframe_analysis = analyze_timeframe(days)
+    # If it's an odd timeframe, educate first!
+    if not timeframe_analysis["is_standard"] and timeframe_analysis.get("suggested_days"):
+        say(cycle_review_message([ticker], days, timeframe_analysis))
+        return
     # Standard timeframe - proceed with analysis
     if timeframe_analysis.get("cycle_info"):
         cycle_name = timeframe_analysis["cycle_info"]["name"]
-        say(f"⚡️ Analyzing {ticker} over {days} days ({cycle_name} cycle)...")
+        say.progress(f"⚡️ Analyzing {ticker} over {days} days ({cycle_name} cycle)...")
     else:
-        say(f"⚡️ Analyzing {ticker} over {days} days...")
+        say.progress(f"⚡️ Analyzing {ticker} over {days} days...")
     # Call Risk API
     data = call_risk_api(ticker, days)
     if data:
         response = format_risk_response(ticker, days, data)
-        say(response)
+        say.finish(response)
     else:
-        say({
+        say.finish({
             "text": "Analysis Error",
             "blocks": [
                 {
@@ -549,38 +616,47 @@ def handle_risk_command(ack, command, say):
 def handle_suggested_cycle(ack, body, say):
     """User clicked to use the suggested cycle"""
     ack()
+    say = OUTBOX.sayer(body["channel"]["id"], key=body.get("trigger_id"))
     value = body["actions"][0]["value"]
     _, ticker, days = value.split("_")
     days = int(days)
+    if "+" in ticker:
+        handle_multi_ticker(ticker.split("+"), days, say)
+        return
     cycle_info = MARKET_CYCLES.get(str(days), {})
     cycle_name = cycle_info.get("name", "")
-    say(f"✅ Excellent choice! Analyzing {ticker} over {days} days ({cycle_name} cycle)...")
+    say.progress(f"✅ Excellent choice! Analyzing {ticker} over {days} days ({cycle_name} cycle)...")
     # Call Risk API
     data = call_risk_api(ticker, days)
     if data:
         response = format_risk_response(ticker, days, data)
-        say(response)
+        say.finish(response)
     else:
-        say(f"❌ Could not analyze {ticker}.")
+        say.finish(f"❌ Could not analyze {ticker}.")
 @app.action("use_original_cycle")
 def handle_original_cycle(ack, body, say):
     """User clicked to continue with original cycle"""
     ack()
+    say = OUTBOX.sayer(body["channel"]["id"], key=body.get("trigger_id"))
     value = body["actions"][0]["value"]
     _, ticker, days = value.split("_")
     days = int(days)
-    say(f"📊 Proceeding with {days} days analysis for {ticker}...")
+    if "+" in ticker:
+        handle_multi_ticker(ticker.split("+"), days, say)
+        return
+    say.progress(f"📊 Proceeding with {days} days analysis for {ticker}...")
     # Call Risk API
     data = call_risk_api(ticker, days)
     if data:
         response = format_risk_response(ticker, days, data)
-        say(response)
+        say.finish(response)
     else:
-        say(f"❌ Could not analyze {ticker}.")
+        say.finish(f"❌ Could not analyze {ticker}.")
 @app.action("learn_market_cycles")
-def handle_learn_cycles(ack, say):
+def handle_learn_cycles(ack, body, say):
     """User clicked to learn more about market cycles"""
     ack()
+    say = OUTBOX.sayer(body["channel"]["id"])
     say({
         "text": "Market Cycles Education",
         "blocks": [
@@ -656,16 +732,19 @@ def handle_learn_cycles(ack, say):
     })
 # Stub handlers for premium buttons
 @app.action("show_detailed_analysis")
-def handle_detailed_analysis(ack, say):
+def handle_detailed_analysis(ack, body, say):
     ack()
+    say = OUTBOX.sayer(body["channel"]["id"])
     say("📊 *Detailed Analysis*\n\n_This feature is coming soon. It will provide in-depth technical analysis, sector comparisons, and historical performance metrics._")
 @app.action("show_history")
-def handle_history(ack, say):
+def handle_history(ack, body, say):
     ack()
+    say = OUTBOX.sayer(body["channel"]["id"])
     say("📈 *Historical View*\n\n_This feature is coming soon. It will display risk trends over time with interactive charts._")
 @app.action("set_alert")
-def handle_alert(ack, say):
+def handle_alert(ack, body, say):
     ack()
+    say = OUTBOX.sayer(body["channel"]["id"])
     say("🔔 *Set Alert*\n\n_This feature is coming soon. You'll be able to set custom risk level alerts and receive notifications._")
 # ============================================================
 # REGULAR MESSAGE HANDLER (OPTIONAL)
@@ -694,7 +773,9 @@ if __name__ == "__main__":
     print("\n💡 Commands:")
     print("  /risk TICKER           - Quarterly analysis")
     print("  /risk TICKER DAYS      - Custom timeframe")
+    print("  /risk T1 T2 T3 [DAYS]  - Multi-ticker table")
     print("  /risk [question]       - Market education")
+    print(f"\n📇 Ticker index: {len(TICKER_INDEX)} symbols")
     print("\n" + "="*60 + "\n")
     handler.start()
 
@@ -8,14 +8,17 @@ EVITO Slack Risk Bot (MVP)
     /risk TSLA
     /risk TSLA 120
     /risk 75
-- Returns a clean text-based risk snapshot (dummy data for now)
+    /risk TSLA NVDA AAPL 90
+- Returns a clean text-based risk snapshot from the risk engine
+  (in-process via services/shared/risk_client.py, HTTP Risk API as fallback)
 """
 
 import os
 import re
+import sys
 from pathlib import Path
 
-from dotenv import /.env
+from dotenv import load_dotenv
 from slack_bolt import App
 from slack_bolt.adapter.socket_mode import SocketModeHandler
 
@@ -51,6 +54,13 @@ app = App(
     signing_secret=SLACK_SIGNING_SECRET,
 )
 
+# Shared risk client: enhanced_risk_bot in-process, Risk API fallback
+sys.path.insert(0, str(BASE_DIR / "services" / "shared"))
+from risk_client import ENGINE, check_horizon, check_ticker, get_risk, get_risks, parse_risk_args  # noqa: E402
+from slack_blocks import format_risk_table  # noqa: E402
+
+MAX_TICKERS_PER_COMMAND = 10
+
 
 # -------------------------------------------------------------------
 # Helpers
@@ -61,33 +71,34 @@ def is_number(value: str) -> bool:
     return bool(re.fullmatch(r"\d+(\.\d+)?", value))
 
 
-def get_risk_snapshot(ticker: str, level: str | None = None) -> str:
-    """
-    Dummy risk snapshot generator.
+def ticker_error_reply(ticker: str) -> str | None:
+    """Error reply if the engine rejects ticker (bad format, or unknown with close matches to suggest), else None."""
+    ticker_valid, _, ticker_error = check_ticker(ticker)
+    if not ticker_valid:
+        return f"⚠️ {ticker_error}"
+    return None
 
-    TODO:
-    - Replace this with a real call to your risk engine, for example:
-        from services.risk.risk_bot import get_risk_for_ticker
+
+def get_risk_snapshot(ticker: str, horizon: int = 90) -> str:
+    """
+    Risk snapshot for ticker, computed by the risk engine via risk_client.
     """
     ticker = ticker.upper()
+    result = get_risk(ticker, horizon)
 
-    # Dummy values – just so you see something working in Slack.
-    insider_risk = "48% (normal)"
-    overbought_state = "NEUTRAL"
-    volatility = "8.2% (stable)"
-    flow = "Mild accumulation"
-    macro = "Moderate"
+    if not result.get("success"):
+        return f"❌ Kunne ikke analysere *{ticker}*: {result.get('error', 'ukjent feil')}"
 
     lines = []
-    lines.append(f"*{ticker}* — 90d Risk Snapshot")
-    lines.append(f"• Insider risk: {insider_risk}")
-    lines.append(f"• Overbought/Oversold: {overbought_state}")
-    lines.append(f"• Volatility range: {volatility}")
-    lines.append(f"• Institutional flow: {flow}")
-    lines.append(f"• Macro sensitivity: {macro}")
-
-    if level is not None:
-        lines.append(f"• Price level provided: {level}")
+    lines.append(f"*{ticker}* — {result.get('horizon', horizon)}d Risk Snapshot")
+    lines.append(f"• Risk score: {result.get('risk_score')}%")
+    lines.append(f"• Verdict: {result.get('verdict')}")
+    for factor in result.get("factors", []):
+        lines.append(f"• {factor}")
+    if result.get("recommendation"):
+        lines.append(f"• Recommendation: {result['recommendation']}")
+    if result.get("warning"):
+        lines.append(f"• ⚠️ {result['warning']}")
 
     lines.append("")
     lines.append("Skriv 1, 2 eller 3 for valg:")
@@ -98,6 +109,29 @@ def get_risk_snapshot(ticker: str, level: str | None = None) -> str:
     return "\n".join(lines)
 
 
+def get_risk_table(tickers: list[str], horizon: int = 90) -> dict:
+    """
+    One compact table message for several tickers (single batched engine call).
+    """
+    tickers = list(dict.fromkeys(t.upper() for t in tickers))[:MAX_TICKERS_PER_COMMAND]
+    errors = []
+    valid = []
+    for ticker in tickers:
+        ticker_valid, _, ticker_error = check_ticker(ticker)
+        if ticker_valid:
+            valid.append(ticker)
+        else:
+            errors.append((ticker, ticker_error))
+
+    results = []
+    for ticker, result in zip(valid, get_risks(valid, horizon) if valid else []):
+        if result.get("success"):
+            results.append(result)
+        else:
+            errors.append((ticker, result.get("error", "ukjent feil")))
+    return format_risk_table(results, horizon, errors=errors)
+
+
 # -------------------------------------------------------------------
 # /risk slash command handler
 # -------------------------------------------------------------------
@@ -108,14 +142,15 @@ def handle_risk_command(ack, respond, command):
     Examples:
       /risk
       /risk TSLA
-      /risk TSLA 120
+      /risk TSLA 120            (trailing number = days, 1-365)
       /risk 75
+      /risk TSLA NVDA AAPL 90
     """
     # Always ack first so Slack knows we received the command
     ack()
 
     text = (command.get("text") or "").strip()
-    parts = [p for p in text.split() if p]
+    parts = [p for p in text.upper().split() if p]
 
     # No arguments: show help/usage
     if len(parts) == 0:
@@ -123,43 +158,47 @@ def handle_risk_command(ack, respond, command):
             "Gi meg en ticker eller et nivå.\n"
             "Eksempler:\n"
             "• `/risk TSLA`\n"
-            "• `/risk BTC`\n"
+            "• `/risk NVDA`\n"
             "• `/risk TSLA 120`\n"
-            "• `/risk 75`"
+            "• `/risk 75`\n"
+            "• `/risk TSLA NVDA AAPL 90`"
         )
         return
 
-    # One argument: could be ticker OR a number
-    if len(parts) == 1:
+    # A lone number: ask how to interpret it
+    if len(parts) == 1 and is_number(parts[0]):
         arg = parts[0]
+        respond(
+            f"Jeg ser du sendte tallet *{arg}*.\n"
+            "Skal jeg tolke det som:\n"
+            "1. Horisont i dager (bruk: `/risk TSLA "
+            f"{arg}`)\n"
+            f"2. Risk filter (tickere med risk > {arg})?\n"
+            "3. Noe annet? Forklar kort."
+        )
+        return
 
-        # If it looks like a number, ask how to interpret it
-        if is_number(arg):
-            respond(
-                f"Jeg ser du sendte tallet *{arg}*.\n"
-                "Skal jeg tolke det som:\n"
-                "1. Price target (bruk: `/risk TSLA "
-                f"{arg}`)\n"
-                f"2. Risk filter (tickere med risk > {arg})?\n"
-                "3. Noe annet? Forklar kort."
-            )
-            return
-        else:
-            # Treat as ticker only
-            ticker = arg.upper()
-            reply = get_risk_snapshot(ticker)
-            respond(reply)
+    # TICKER [TICKER ...] [DAYS]: same parser as the socket-mode bot
+    tickers, horizon_token = parse_risk_args(parts)
+    stray = [p for p in tickers if is_number(p)]
+    if stray:
+        respond(f"⚠️ Ugyldig plassering av tall: {', '.join(stray)}. Bruk: `/risk TICKER [TICKER ...] [DAGER]` (dager sist, 1-365).")
+        return
+    horizon = 90
+    if horizon_token is not None:
+        horizon_valid, horizon_error = check_horizon(horizon_token)
+        if not horizon_valid:
+            respond(f"⚠️ {horizon_error} (fikk '{horizon_token}'). Bruk: `/risk TICKER [TICKER ...] [DAGER]` (1-365 dager).")
             return
+        horizon = int(horizon_token)
 
-    # Two or more arguments: assume TICKER [LEVEL]
-    ticker = parts[0].upper()
-    level = None
-
-    if len(parts) >= 2 and is_number(parts[1]):
-        level = parts[1]
+    # Several tickers -> one table message
+    if len(tickers) > 1:
+        respond(**get_risk_table(tickers, horizon))
+        return
 
-    # If second arg isn't numeric, we ignore it for now
-    reply = get_risk_snapshot(ticker, level)
+    ticker = tickers[0]
+    reply = ticker_error_reply(ticker) or get_risk_snapshot(ticker, horizon=horizon)
     respond(reply)
 
 
@@ -168,7 +207,7 @@ def handle_risk_command(ack, respond, command):
 # -------------------------------------------------------------------
 
 if __name__ == "__main__":
-    print("⚡️ Starting EVITO Slack Risk Bot (MVP)...")
+    print(f"⚡️ Starting EVITO Slack Risk Bot (MVP)... risk engine: {ENGINE}")
     handler = SocketModeHandler(app, SLACK_APP_TOKEN)
     handler.start()
 
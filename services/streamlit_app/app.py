@@ -8,16 +8,15 @@ EVITO News & Risk Stream (Streamlit)
 """
 import json
 import os
-import textwrap
+import sys
 import time
 import uuid
-from hashlib import sha1
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout, as_completed
 from pathlib import Path
 
+import numpy as np
 import requests
-import pandas as pd
 import streamlit as st
-from sentence_transformers import SentenceTransformer
 from dotenv import load_dotenv
 from inout_store import (
     NEWS_IN,
@@ -26,11 +25,27 @@ from inout_store import (
     BRIEFS_OUT,
     DEBATES_IN,
     DEBATES_OUT,
+    PAGE_SIZE,
+    count_md,
     list_md,
     read_md,
     write_md,
+    move_all,
     move_md,
 )
+from brief_cache import BriefCache
+from cache_store import TTLCache, cached_file, invalidate_file
+from custom_news_index import CustomNewsIndex
+from library_store import LibraryStore
+from news_ingester import NewsIngester
+from pipeline_batch import audited_brief, new_briefs
+from queue_store import QueueStore
+from similarity_index import DUPLICATE_THRESHOLD, SimilarityIndex
+from ticker_matcher import TickerMatcher
+from universe_table import build_universe_frame, filter_universe
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "shared"))
+from slack_outbox import SlackOutbox  # noqa: E402
 
 # Load .env robustly from project root
 root_env = Path.cwd() / ".env"
@@ -40,6 +55,9 @@ else:
     # fallback: resolve relative to file location
     load_dotenv(Path(__file__).resolve().parents[2] / ".env")
 
+# Reads the model API keys at import time, so only after .env is loaded
+from brief_engine import MODEL_REGISTRY, MODEL_TEMPERATURE, PERSONAS, build_payload, call_model, make_prompt  # noqa: E402
+
 
 
 # -----------------------------
@@ -72,83 +90,111 @@ MOCK_AGENTS = {
 # 2) EXISTING CONSTANTS
 # -----------------------------
 
-PERSONAS = {
-    "None": "",
-    "Buffett": "You are Warren Buffett: value investing, moats, margin of safety, long-term discipline.",
-    "Risk Officer": "You are a Chief Risk Officer: focus on liquidity, tail risk, concentration, compliance.",
-    "Tech Strategist": "You are a pragmatic tech strategist: product cycles, infra, AI moats, competitive landscape.",
-}
-
 API_URL = os.getenv("EVITO_API_URL", "http://localhost:8081")
 DEFAULT_TICKERS = ["TSLA", "AAPL", "NVDA", "SPY"]
 STANDARD_CYCLES = [7, 21, 30, 90, 180, 252, 365]
 RISK_COLORS = {"Low": "#2eb886", "Medium": "#daa038", "High": "#d9831f", "Critical": "#d14c41"}
 DISABLE_NEWS = os.getenv("DISABLE_NEWS", "0") == "1"
 QUEUE_PATH = Path("data/review_queue.jsonl")
-LIB_PATH = Path("data/library.jsonl")
+LIB_PATH = Path("data/library.jsonl")  # legacy JSONL library, imported into LibraryStore once
 NEWS_SOURCES_PATH = Path("data/news_sources.jsonl")
 CUSTOM_NEWS_PATH = Path("data/custom_news.jsonl")
 PREBAKED_PATH = Path("data/prebaked_briefs.jsonl")
 AI_UNIVERSE_PATH = Path("data/ai_universe.jsonl")
+LIBRARY_DSN = os.getenv("EVITO_LIBRARY_DSN")  # set -> briefs live in Postgres/pgvector
 FEATURED_LIMIT = 5
+MAX_FETCH_WORKERS = 8
+# Risk cards are reused across reruns for this long (<= the minimum auto-refresh interval)
+API_CACHE_TTL = float(os.getenv("EVITO_API_CACHE_TTL", "10"))
+NEWS_FIRST_POLL_WAIT = 10  # seconds the first page load waits for the ingester's initial pass
 
-EMBEDDER = SentenceTransformer("all-MiniLM-L6-v2")
-
-MODEL_REGISTRY = [
-    {
-        "label": "GPT-4o",
-        "provider": "openai",
-        "model": "gpt-4o",
-        "base_url": os.getenv("OPENAI_BASE", "https://api.openai.com/v1"),
-        "api_key": os.getenv("OPENAI_API_KEY"),
-    },
-    {
-        "label": "o1-preview",
-        "provider": "openai",
-        "model": "o1-preview",
-        "base_url": os.getenv("OPENAI_BASE", "https://api.openai.com/v1"),
-        "api_key": os.getenv("OPENAI_API_KEY"),
-    },
-    {
-        "label": "xAI",
-        "provider": "openai",
-        "model": os.getenv("XAI_MODEL", "grok-2"),
-        "base_url": os.getenv("XAI_BASE", "https://api.x.ai/v1"),
-        "api_key": os.getenv("XAI_API_KEY"),
-    },
-    {
-        "label": "Mistral",
-        "provider": "openai",
-        "model": os.getenv("MISTRAL_MODEL", "mistral-large-latest"),
-        "base_url": os.getenv("MISTRAL_BASE", "https://api.mistral.ai/v1"),
-        "api_key": os.getenv("MISTRAL_API_KEY"),
-    },
-    {
-        "label": "Anthropic",
-        "provider": "anthropic",
-        "model": os.getenv("ANTHROPIC_MODEL", "claude-3-5-sonnet-20241022"),
-        "api_key": os.getenv("ANTHROPIC_API_KEY"),
-    },
-]
+EMBED_MODEL = "all-MiniLM-L6-v2"
+EMBED_BATCH = 64  # texts per encode() call when promoting many briefs
 
 # 🔥 DEBUG HER (etter lista)
 print("DEBUG OPENAI KEY PRESENT:", bool(os.getenv("OPENAI_API_KEY")))
 print("DEBUG OPENAI KEY STARTS WITH:", (os.getenv("OPENAI_API_KEY") or "")[:7])
 
-PERSONAS = {
-    "None": "",
-    "Buffett": "You are Warren Buffett: value investing, moats, margin of safety, long-term discipline.",
-    "Risk Officer": "You are a Chief Risk Officer: focus on liquidity, tail risk, concentration, compliance.",
-    "Tech Strategist": "You are a pragmatic tech strategist: product cycles, infra, AI moats, competitive landscape.",
-}
-
 SLACK_BROADCAST_WEBHOOK = os.getenv("SLACK_BROADCAST_WEBHOOK")
+BROADCAST_WAIT = 5  # seconds the UI waits for a winner broadcast before reporting it as queued
+
+
+@st.cache_resource(show_spinner=False)
+def get_http_session():
+    # Pooled keep-alive connections, shared across reruns and fetch threads
+    session = requests.Session()
+    adapter = requests.adapters.HTTPAdapter(pool_connections=MAX_FETCH_WORKERS, pool_maxsize=MAX_FETCH_WORKERS)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
 
+@st.cache_resource(show_spinner=False)
+def get_api_cache():
+    return TTLCache(API_CACHE_TTL)
 
-def call_api(ticker: str, days: int):
-    resp = requests.post(f"{API_URL}/analyze", json={"ticker": ticker, "days": days}, timeout=10)
+
+@st.cache_resource(show_spinner=False)
+def get_news_ingester():
+    # One poller per server process: every feed fetched once per interval, shared by all sessions
+    ingester = NewsIngester(NEWS_SOURCES_PATH, tagger=get_ticker_matcher(), session=get_http_session()).start()
+    ingester.ready.wait(NEWS_FIRST_POLL_WAIT)
+    return ingester
+
+
+@st.cache_resource(show_spinner=False)
+def get_api_ticker_names():
+    """{symbol: name} from the Risk API's /tickers list, fetched once per process ({} if unreachable)."""
+    try:
+        resp = get_http_session().get(f"{API_URL}/tickers", timeout=5)
+        resp.raise_for_status()
+        return {t["symbol"].upper(): t.get("name", "") for t in resp.json().get("tickers", []) if t.get("symbol")}
+    except Exception as e:
+        print(f"Ticker list from API failed: {e}")
+        return {}
+
+
+def _build_ticker_matcher(path: Path):
+    names = {t: "" for t in DEFAULT_TICKERS}
+    names.update(get_api_ticker_names())
+    for obj in _read_jsonl_safe(path):
+        if obj.get("ticker"):
+            names[obj["ticker"].upper()] = obj.get("name") or names.get(obj["ticker"].upper(), "")
+    return TickerMatcher(names)
+
+
+def get_ticker_matcher():
+    """Headline tagger over the whole universe (API tickers + AI universe), rebuilt when ai_universe.jsonl changes."""
+    return cached_file(AI_UNIVERSE_PATH, _build_ticker_matcher)
+
+
+@st.cache_resource(show_spinner=False)
+def get_card_versions():
+    # (ticker, days) -> (ETag, card): lets call_api revalidate with If-None-Match
+    return {}
+
+
+def call_api(ticker: str, days: int, session=None):
+    key = (ticker, days)
+    versions = get_card_versions()
+    known = versions.get(key)
+    resp = (session or requests).get(
+        f"{API_URL}/analyze",
+        params={"ticker": ticker, "days": days},
+        headers={"If-None-Match": known[0]} if known else {},
+        timeout=10,
+    )
+    if resp.status_code == 304 and known:
+        return known[1]  # unchanged since the last fetch: no body sent, same card object
     resp.raise_for_status()
-    return resp.json()
+    data = resp.json()
+    if resp.headers.get("ETag"):
+        versions[key] = (resp.headers["ETag"], data)
+    return data
+
+
+def call_api_cached(ticker: str, days: int, session=None):
+    return get_api_cache().get_or_set((ticker, days), lambda: call_api(ticker, days, session=session))
 
 
 def risk_bar(score: int) -> str:
@@ -157,6 +203,11 @@ def risk_bar(score: int) -> str:
 
 
 def read_jsonl_safe(path: Path):
+    # Memoized on file mtime/size: reruns don't re-read unchanged files
+    return cached_file(path, _read_jsonl_safe)
+
+
+def _read_jsonl_safe(path: Path):
     if not path.exists():
         return []
     out = []
@@ -173,6 +224,13 @@ def read_jsonl_safe(path: Path):
 def write_jsonl_append(path: Path, obj: dict):
     with path.open("a", encoding="utf-8") as f:
         f.write(json.dumps(obj) + "\n")
+    invalidate_file(path)
+
+
+@st.cache_resource(show_spinner=False)
+def get_custom_news_index():
+    # Sidecar offset index: lookups seek to a ticker's newest lines instead of parsing the file
+    return CustomNewsIndex(CUSTOM_NEWS_PATH)
 
 
 def fetch_news(ticker: str, limit: int = 5, enabled_sources=None):
@@ -184,126 +242,265 @@ def fetch_news(ticker: str, limit: int = 5, enabled_sources=None):
 
     headlines = []
 
-    # Custom curated news
-    for obj in read_jsonl_safe(CUSTOM_NEWS_PATH):
-        if obj.get("ticker", "").upper() == ticker.upper():
-            headlines.append(
-                {
-                    "title": obj.get("title"),
-                    "link": obj.get("link"),
-                    "source": obj.get("source", "custom"),
-                    "summary": obj.get("summary"),
-                }
-            )
+    # Custom curated news, newest first
+    for obj in get_custom_news_index().latest(ticker, limit):
+        headlines.append(
+            {
+                "title": obj.get("title"),
+                "link": obj.get("link"),
+                "source": obj.get("source", "custom"),
+                "summary": obj.get("summary"),
+            }
+        )
 
-    # RSS sources
-    if enabled_sources is None:
-        enabled_sources = []
-    try:
-        import feedparser  # Optional dep
-    except ImportError:
-        feedparser = None
-
-    if feedparser:
-        for src in enabled_sources:
-            url = src.get("url")
-            name = src.get("name", "rss")
-            if not url:
-                continue
-            feed = feedparser.parse(url)
-            for entry in feed.entries[:limit]:
-                title = getattr(entry, "title", "")
-                summary = getattr(entry, "summary", "")
-                link = getattr(entry, "link", "")
-                # Simple ticker filter: ticker symbol in title/summary
-                if ticker.upper() in title.upper() or ticker.upper() in summary.upper():
-                    headlines.append(
-                        {"title": title, "link": link, "source": name, "summary": summary}
-                    )
+    # RSS sources: index lookup, feeds are polled in the background by NewsIngester
+    if enabled_sources:
+        names = [src.get("name", "rss") for src in enabled_sources]
+        headlines.extend(get_news_ingester().headlines_for(ticker, limit, sources=names))
 
     return headlines[:limit]
 
 
+def fetch_watchlist(tickers: list[str], days: int, sources_by_ticker: dict, with_news: bool) -> dict:
+    """
+    Fetch risk cards (and headlines) for all tickers concurrently over one pooled session.
+    Returns {ticker: {"data", "headlines", "error"}}; a failing ticker never affects the others.
+    """
+    session = get_http_session()
+    if with_news and not DISABLE_NEWS:
+        # create/wait for the poller here, not inside a worker thread; re-tags if the universe changed
+        get_news_ingester().set_tagger(get_ticker_matcher())
+
+    def fetch_one(t):
+        out = {"data": None, "headlines": [], "error": None}
+        try:
+            out["data"] = call_api_cached(t, days, session=session)
+        except Exception as e:
+            out["error"] = e
+            return out
+        if with_news:
+            try:
+                out["headlines"] = fetch_news(t, enabled_sources=sources_by_ticker.get(t))
+            except Exception as e:
+                print(f"Headlines for {t} failed: {e}")
+        return out
+
+    if not tickers:
+        return {}
+    with ThreadPoolExecutor(max_workers=min(MAX_FETCH_WORKERS, len(tickers))) as pool:
+        return dict(zip(tickers, pool.map(fetch_one, tickers)))
+
+
+def card_version(t: str, days: int, data: dict, headlines: list) -> tuple:
+    """What a drawn card depends on: the card's ETag (its content, if the API sent none) and the headlines."""
+    etag = get_card_versions().get((t, days), (None, None))[0]
+    return etag or json.dumps(data, sort_keys=True), tuple(h.get("link") for h in headlines)
+
+
+def watch_cards(tickers: list[str], days: int, sources_by_ticker: dict, with_news: bool, drawn: dict, page_run: int):
+    """
+    Auto-refresh timer, run as an st.fragment(run_every=...). The page draws the cards from
+    fetch_watchlist's results; a timer rerun revalidates them (TTL cache / conditional GET,
+    headline index lookup) and reruns the page only when a card's version differs from the one
+    drawn, so an unchanged watchlist is not redrawn. The first run, inside the page run, fetches nothing.
+    """
+    if st.session_state.get("watch_page_run") != page_run:
+        st.session_state["watch_page_run"] = page_run
+        return
+    for t, result in fetch_watchlist(tickers, days, sources_by_ticker, with_news).items():
+        if result["error"]:
+            print(f"Refresh of {t} failed: {result['error']}")
+        elif card_version(t, days, result["data"], result["headlines"]) != drawn.get(t):
+            st.rerun(scope="app")
+
+
+def draw_risk_card(t: str, data: dict, headlines: list):
+    st.markdown(f"#### {t} · {data['days']}d")
+    st.markdown(f"**{data['risk_level']}** — Score: {data['risk_score']}  {risk_bar(data['risk_score'])}")
+    vol = data.get("volatility") or data.get("analysis", {}).get("volatility", "n/a")
+    trend = data.get("trend") or data.get("analysis", {}).get("trend", "n/a")
+    st.markdown(f"Volatility: `{vol}` · Trend: `{trend}`")
+    st.markdown("**Factors**")
+    factors = data.get("factors", []) or []
+    if factors:
+        for f in factors:
+            if isinstance(f, dict):
+                fname = f.get("name", "Factor")
+                fscore = f.get("score", "n/a")
+                st.markdown(f"- **{fname}**: `{fscore}`")
+            else:
+                st.markdown(f"- {f}")
+    else:
+        st.markdown("- No factors listed")
+    if headlines:
+        st.markdown("**Headlines**")
+        for h in headlines:
+            st.markdown(f"- [{h['title']}]({h['link']})")
+
+
 def ensure_dirs():
-    for p in [QUEUE_PATH, LIB_PATH, NEWS_SOURCES_PATH, CUSTOM_NEWS_PATH]:
+    for p in [QUEUE_PATH, NEWS_SOURCES_PATH, CUSTOM_NEWS_PATH]:
         p.parent.mkdir(parents=True, exist_ok=True)
         if not p.exists():
             p.touch()
 
 
-def append_jsonl(path: Path, entry: dict):
-    with path.open("a", encoding="utf-8") as f:
-        f.write(json.dumps(entry) + "\n")
-
-
-def read_jsonl(path: Path):
-    if not path.exists():
-        return []
-    with path.open("r", encoding="utf-8") as f:
-        return [json.loads(line) for line in f if line.strip()]
+def _ai_universe_frame(path: Path):
+    return build_universe_frame(_read_jsonl_safe(path))
 
 
-def load_ai_universe():
+def load_ai_universe_frame():
     """
-    Load AI universe entries from JSONL.
-    Each line: {ticker, name, theme, rsi}
+    AI universe (data/ai_universe.jsonl, each line: {ticker, name, theme, rsi}) as a typed frame
+    with the RSI state column; rebuilt only when the file changes.
     """
-    if not AI_UNIVERSE_PATH.exists():
-        return []
-    entries = []
-    for line in AI_UNIVERSE_PATH.read_text().splitlines():
-        if not line.strip():
-            continue
-        try:
-            entries.append(json.loads(line))
-        except Exception:
-            continue
-    return entries
+    return cached_file(AI_UNIVERSE_PATH, _ai_universe_frame)
 
 
-def classify_rsi(rsi):
-    """Classify RSI into Overbought/Oversold/Neutral."""
-    try:
-        value = float(rsi)
-    except Exception:
-        return "Neutral"
-    if value >= 70:
-        return "Overbought"
-    if value <= 30:
-        return "Oversold"
-    return "Neutral"
+def _group_by_ticker(path: Path):
+    # Newest brief per (ticker, persona, model): batch_briefs.py appends a full set every run
+    newest = {}
+    for b in _read_jsonl_safe(path):  # batch_briefs.py appends while the app reads
+        ticker = b.get("ticker", "").upper()
+        newest[(ticker, b.get("persona"), b.get("model"))] = b  # later lines are newer
+    by_ticker = {}
+    for (ticker, _, _), b in newest.items():
+        by_ticker.setdefault(ticker, []).append(b)
+    return by_ticker
+
+
+def load_prebaked_by_ticker():
+    """Pre-baked briefs grouped by upper-case ticker, newest per persona/model (one parse per file change)."""
+    return cached_file(PREBAKED_PATH, _group_by_ticker)
+
+
+@st.cache_resource(show_spinner="Loading embedding model...")
+def get_embedder():
+    # Lazy: torch + model load only when a brief is first saved, then shared by all sessions
+    from sentence_transformers import SentenceTransformer
+
+    t0 = time.perf_counter()
+    embedder = SentenceTransformer(EMBED_MODEL)
+    print(f"Embedder {EMBED_MODEL} loaded in {time.perf_counter() - t0:.2f}s")
+    return embedder
+
+
+def embed_text(text: str):
+    return get_embedder().encode(text, normalize_embeddings=True).tolist()
 
 
-def load_prebaked_briefs():
+def embed_texts(texts: list[str], on_progress=None):
     """
-    Load pre-baked briefs from local JSONL.
-    Each line: {ticker, persona, model, text}
-    Returns list[dict]. Missing file -> [].
+    Batched embeddings (one encode call per EMBED_BATCH texts) as a float32 array.
+    on_progress(done, total) is called after each batch.
     """
-    if not PREBAKED_PATH.exists():
-        return []
-    return read_jsonl(PREBAKED_PATH)
+    embedder = get_embedder()
+    out = []
+    for start in range(0, len(texts), EMBED_BATCH):
+        batch = texts[start:start + EMBED_BATCH]
+        out.append(embedder.encode(batch, batch_size=EMBED_BATCH, normalize_embeddings=True))
+        if on_progress:
+            on_progress(start + len(batch), len(texts))
+    return np.vstack(out).astype(np.float32) if out else np.zeros((0, 0), dtype=np.float32)
 
 
-def embed_text(text: str):
-    return EMBEDDER.encode(text, normalize_embeddings=True).tolist()
+@st.cache_resource(show_spinner=False)
+def get_queue_store():
+    return QueueStore(QUEUE_PATH)
+
+
+@st.cache_resource(show_spinner=False)
+def get_library_store():
+    if LIBRARY_DSN:
+        from pg_library_store import PgLibraryStore  # psycopg2 only needed for the Postgres backend
+
+        store = PgLibraryStore(LIBRARY_DSN)
+    else:
+        store = LibraryStore()
+    if store.count() == 0 and LIB_PATH.exists():
+        imported = store.import_jsonl(LIB_PATH)
+        if imported:
+            print(f"Imported {imported} briefs from {LIB_PATH} into {store.describe()}")
+    return store
+
+
+@st.cache_resource(show_spinner=False)
+def get_similarity_index():
+    store = get_library_store()
+    if hasattr(store, "search"):  # pgvector searches in the database
+        return store
+    return SimilarityIndex(store)
 
 
 def upsert_to_library(entry: dict):
-    # Placeholder: write to local library JSONL; swap with vector DB upsert as needed.
-    append_jsonl(LIB_PATH, entry)
+    # Metadata -> SQLite, embedding -> append-only float32 matrix; then index the new row
+    get_library_store().upsert(entry)
+    get_similarity_index().sync()
 
 
-def infer_from_filename(filename: str):
+def save_to_library(meta: dict):
     """
-    Infer ticker/persona from a filename like TSLA_Buffett.md.
-    Returns (ticker, persona).
+    Embed meta["text"] and upsert it, unless a near-duplicate is already in the library.
+    Returns None when saved, else (duplicate_id, similarity).
     """
-    stem = Path(filename).stem
-    parts = stem.split("_")
-    ticker = parts[0].upper() if parts else "UNK"
-    persona = parts[1] if len(parts) > 1 else "None"
-    return ticker, persona
+    vec = embed_text(meta["text"])
+    if not st.session_state.get("allow_duplicates"):
+        dup = get_similarity_index().find_duplicate(vec)
+        if dup:
+            return dup
+    meta["embedding"] = vec
+    upsert_to_library(meta)
+    return None
+
+
+def save_many_to_library(entries: list[dict], on_progress=None):
+    """
+    Bulk promotion: one batched embedding pass, duplicate checks, one library transaction.
+    Returns (saved_entries, {entry_id: (duplicate_id, similarity)}).
+    """
+    vecs = embed_texts([e["text"] for e in entries], on_progress=on_progress)
+    check = not st.session_state.get("allow_duplicates")
+    index = get_similarity_index()
+    saved, kept_vecs, duplicates = [], [], {}
+    for e, vec in zip(entries, vecs):
+        if check:
+            dup = index.find_duplicate(vec)
+            if not dup and kept_vecs:
+                # Near-duplicates inside the selection itself
+                sims = np.asarray(kept_vecs) @ vec
+                best = int(np.argmax(sims))
+                if sims[best] >= DUPLICATE_THRESHOLD:
+                    dup = (saved[best]["id"], float(sims[best]))
+            if dup:
+                duplicates[e["id"]] = dup
+                continue
+        entry = dict(e)
+        entry["embedding"] = vec.tolist()
+        saved.append(entry)
+        kept_vecs.append(vec)
+    if saved:
+        get_library_store().upsert_many(saved)
+        index.sync()
+    return saved, duplicates
+
+
+def duplicate_note(dup) -> str:
+    dup_id, score = dup
+    existing = get_library_store().get(dup_id) or {}
+    return (
+        f"Not saved: near-duplicate ({score:.2f}) of {existing.get('ticker', '?')} brief "
+        f"by {existing.get('model')} / {existing.get('persona')} ({dup_id[:8]})."
+    )
+
+
+def md_page(folder: Path, key: str):
+    """One page of a pipeline folder's files; a page picker appears once it has more than PAGE_SIZE."""
+    total = count_md(folder)
+    page = 1
+    if total > PAGE_SIZE:
+        pages = (total + PAGE_SIZE - 1) // PAGE_SIZE
+        page = st.number_input(f"Page (of {pages}, {total} files)", 1, pages, 1, key=f"{key}_page")
+    return list_md(folder, (page - 1) * PAGE_SIZE, PAGE_SIZE)
 
 
 def brief_from_risk(data: dict) -> str:
@@ -325,79 +522,72 @@ def brief_from_risk(data: dict) -> str:
     return "\n".join(lines)
 
 
-def build_payload(data: dict, headlines: list[dict]) -> dict:
-    return {
-        "ticker": data.get("ticker"),
-        "days": data.get("days"),
-        "risk_score": data.get("risk_score"),
-        "risk_level": data.get("risk_level"),
-        "volatility": data.get("volatility"),
-        "trend": data.get("trend"),
-        "factors": data.get("factors", []),
-        "headlines": headlines,
-        "timestamp": data.get("timestamp"),
-    }
+@st.cache_resource(show_spinner=False)
+def get_brief_cache():
+    return BriefCache()
 
 
-def make_prompt(payload: dict, persona_text: str) -> tuple[str, str]:
-    prompt = textwrap.dedent(
-        f"""
-        SYSTEM: You write concise tech/AI market briefs for investors. Use only provided data. No fabrications. Max 280 words.
-        {persona_text}
-        USER: Structured data: {json.dumps(payload)}
-        Write:
-        - Title (strong hook)
-        - TL;DR (3 bullets)
-        - Market Setup (1 short paragraph)
-        - Why Now (1–2 short paragraphs)
-        - Risks (bullets)
-        - Watch List / Catalysts (bullets with timeframes)
-        - Bottom Line (1 sentence, actionable)
-        Tone: analytical, plain English, no hype.
-        """
-    ).strip()
-    prompt_version = sha1(prompt.encode("utf-8")).hexdigest()[:10]
-    return prompt, prompt_version
-
-
-def call_model(entry: dict, prompt: str) -> str:
-    provider = entry.get("provider")
-    if provider == "openai":
-        try:
-            from openai import OpenAI
-        except Exception:
-            return "Model client missing; showing placeholder brief."
-        client = OpenAI(base_url=entry.get("base_url"), api_key=entry.get("api_key"))
-        resp = client.chat.completions.create(
-            model=entry.get("model"),
-            messages=[{"role": "user", "content": prompt}],
-            temperature=0.4,
-        )
-        return resp.choices[0].message.content.strip()
-    if provider == "anthropic":
-        try:
-            import anthropic
-        except Exception:
-            return "Model client missing; showing placeholder brief."
-        client = anthropic.Anthropic(api_key=entry.get("api_key"))
-        resp = client.messages.create(
-            model=entry.get("model"),
-            max_tokens=800,
-            temperature=0.4,
-            messages=[{"role": "user", "content": prompt}],
-        )
-        return resp.content[0].text.strip()
-    return "Unsupported provider; placeholder brief."
+def brief_cache_key(entry: dict, prompt_version: str) -> tuple:
+    model = f"{entry.get('provider')}:{entry.get('base_url') or ''}:{entry.get('model')}"
+    return model, prompt_version, entry.get("temperature", MODEL_TEMPERATURE)
+
+
+def generate_briefs(models: list[dict], prompt: str, prompt_version: str, regenerate: bool = False):
+    """
+    Yield (label, brief, error, cached) per model. Cached briefs come first; the rest are
+    called concurrently and yielded in completion order, so wall time is the slowest model.
+    regenerate=True skips the cache lookup (fresh results still overwrite the cache).
+    """
+    cache = get_brief_cache()
+    hits, pending = [], []
+    for m in models:
+        hit = None if regenerate else cache.get(*brief_cache_key(m, prompt_version))
+        if hit is not None:
+            hits.append((m, hit))
+        else:
+            pending.append(m)
+    with ThreadPoolExecutor(max_workers=max(1, len(pending))) as pool:
+        # Start the live calls first, then hand out cache hits while they run
+        futures = {pool.submit(call_model, m, prompt): m for m in pending}
+        for m, hit in hits:
+            yield m["label"], hit, None, True
+        for fut in as_completed(futures):
+            m = futures[fut]
+            try:
+                brief, ok = fut.result()
+            except Exception as e:
+                yield m["label"], None, e, False
+                continue
+            if ok and brief:  # never cache the placeholder
+                cache.put(*brief_cache_key(m, prompt_version), brief)
+            yield m["label"], brief, None, False
+
+
+@st.cache_resource
+def get_slack_outbox():
+    # One outbound queue per server process (survives reruns): rate limits + Retry-After
+    return SlackOutbox()
 
 
 def broadcast_slack(text: str):
+    """Queue a post to the broadcast webhook; returns the outbox Future (None: no webhook configured)."""
     if not SLACK_BROADCAST_WEBHOOK:
-        return False
+        return None
+    return get_slack_outbox().post_webhook(SLACK_BROADCAST_WEBHOOK, {"text": text})
+
+
+def report_broadcast(future):
+    # Wait briefly for delivery; the outbox keeps retrying in the background after that
+    if future is None:
+        st.info("Slack broadcast not configured (SLACK_BROADCAST_WEBHOOK).")
+        return
     try:
-        requests.post(SLACK_BROADCAST_WEBHOOK, json={"text": text}, timeout=5)
-        return True
-    except Exception:
-        return False
+        future.result(timeout=BROADCAST_WAIT)
+        st.success("Broadcast to Slack.")
+    except FutureTimeout:
+        st.info("Slack broadcast queued (rate limited or retrying).")
+    except Exception as e:
+        st.warning(f"Slack broadcast failed: {e}")
 
 
 st.set_page_config(page_title="EVITO News Stream", layout="wide")
@@ -417,69 +607,61 @@ with tab_dashboard:
         watchlist = watchlist or [ticker]
         show_news = st.checkbox("Show headlines (RSS)", value=not DISABLE_NEWS)
         debug_mode = st.checkbox("Debug: show model/brief info", value=False)
+        st.checkbox("Allow near-duplicate saves", value=False, key="allow_duplicates")
+        if st.button("Refresh data now", key="refresh_caches"):
+            get_api_cache().invalidate()
+            if not DISABLE_NEWS:
+                get_news_ingester().poll_now()
 
     # AI Universe section
     st.markdown("### 🔎 AI Universe – Overbought / Oversold")
-    ai_universe = load_ai_universe()
-    if ai_universe:
-        df = pd.DataFrame(ai_universe)
-        if not df.empty:
-            df["state"] = df["rsi"].apply(classify_rsi)
-            filter_text = st.text_input("Filter (ticker/name/theme)", "", key="ai_filter")
-            if filter_text:
-                name_col = df["name"].astype(str) if "name" in df else pd.Series([], dtype=str)
-                theme_col = df["theme"].astype(str) if "theme" in df else pd.Series([], dtype=str)
-                mask = (
-                    df["ticker"].astype(str).str.contains(filter_text, case=False, na=False)
-                    | name_col.str.contains(filter_text, case=False, na=False)
-                    | theme_col.str.contains(filter_text, case=False, na=False)
-                )
-                df = df[mask]
-            df = df.sort_values(by="rsi", ascending=False, na_position="last")
-            cols = [c for c in ["ticker", "name", "theme", "rsi", "state"] if c in df.columns]
-            st.dataframe(df[cols], use_container_width=True)
+    df = load_ai_universe_frame()
+    if not df.empty:
+        filter_text = st.text_input("Filter (ticker/name/theme)", "", key="ai_filter")
+        st.dataframe(filter_universe(df, filter_text), use_container_width=True)
     else:
         st.caption("No ai_universe.jsonl found in data/.")
 
     cols = st.columns(max(1, len(watchlist)))
 
     # Featured strip (last 5 winners)
-    lib_entries = read_jsonl(LIB_PATH)
-    winners = [e for e in lib_entries if e.get("winner")]
+    winners = get_library_store().latest(FEATURED_LIMIT, winners_only=True)
     if winners:
         st.markdown("#### ⭐ Featured Briefs (last 5 winners)")
-        for e in winners[-FEATURED_LIMIT:][::-1]:
+        for e in winners:
             st.markdown(
                 f"- **{e['ticker']} ({e['days']}d)** • model: {e.get('model')} • persona: {e.get('persona')} • {time.strftime('%Y-%m-%d %H:%M:%S', time.gmtime(e.get('timestamp', 0)))}"
             )
 
+    # Fetch every card + headline set up front (concurrently), then render in one pass
+    sources = read_jsonl_safe(NEWS_SOURCES_PATH)
+    enabled_labels = [s.get("name") for s in sources]
+    sources_by_ticker = {
+        t: [s for s in sources if s.get("name") in st.session_state.get(f"sources_{t}", enabled_labels)]
+        for t in watchlist
+    }
+    with_news = show_news and not DISABLE_NEWS
+    watch_results = fetch_watchlist(watchlist, days, sources_by_ticker, with_news)
+    prebaked_by_ticker = load_prebaked_by_ticker()
+    # Auto-refresh: a timer fragment revalidates the cards and reruns the page only when one changed
+    drawn = {
+        t: card_version(t, days, r["data"], r["headlines"]) for t, r in watch_results.items() if not r["error"]
+    }
+    st.session_state["page_run"] = page_run = st.session_state.get("page_run", 0) + 1
+    if auto:
+        st.fragment(watch_cards, run_every=interval)(watchlist, days, sources_by_ticker, with_news, drawn, page_run)
+
     for i, t in enumerate(watchlist):
         try:
-            data = call_api(t, days)
+            result = watch_results[t]
+            if result["error"]:
+                raise result["error"]
+            data = result["data"]
             color = RISK_COLORS.get(data.get("risk_level"), "#439fe0")
             with cols[i]:
-                st.markdown(f"#### {t} · {data['days']}d")
-                st.markdown(f"**{data['risk_level']}** — Score: {data['risk_score']}  {risk_bar(data['risk_score'])}")
-                vol = data.get("volatility") or data.get("analysis", {}).get("volatility", "n/a")
-                trend = data.get("trend") or data.get("analysis", {}).get("trend", "n/a")
-                st.markdown(f"Volatility: `{vol}` · Trend: `{trend}`")
-                st.markdown("**Factors**")
-                factors = data.get("factors", []) or []
-                if factors:
-                    for f in factors:
-                        if isinstance(f, dict):
-                            fname = f.get("name", "Factor")
-                            fscore = f.get("score", "n/a")
-                            st.markdown(f"- **{fname}**: `{fscore}`")
-                        else:
-                            st.markdown(f"- {f}")
-                else:
-                    st.markdown("- No factors listed")
+                draw_risk_card(t, data, result["headlines"])
                 # News sources controls
-                sources = read_jsonl_safe(NEWS_SOURCES_PATH)
-                enabled_labels = [s.get("name") for s in sources]
-                enabled_selection = st.multiselect("Enabled news sources", enabled_labels, enabled_labels, key=f"sources_{t}")
-                enabled_sources = [s for s in sources if s.get("name") in enabled_selection]
+                st.multiselect("Enabled news sources", enabled_labels, enabled_labels, key=f"sources_{t}")
 
                 # Add a new source
                 with st.expander("Add news source"):
@@ -488,20 +670,16 @@ with tab_dashboard:
                     if st.button("Add source", key=f"add_src_{t}"):
                         if new_name and new_url:
                             write_jsonl_append(NEWS_SOURCES_PATH, {"name": new_name, "url": new_url, "type": "rss"})
-                            st.success("Source added. Reload to use it.")
+                            get_news_ingester().poll_now()
+                            st.success("Source added; headlines appear after the next poll.")
                         else:
                             st.warning("Provide both name and URL.")
 
-                headlines = fetch_news(t, enabled_sources=enabled_sources) if (show_news and not DISABLE_NEWS) else []
-                if headlines:
-                    st.markdown("**Headlines**")
-                    for h in headlines:
-                        st.markdown(f"- [{h['title']}]({h['link']})")
+                headlines = result["headlines"]
 
                 # Debate / Brief generation
                 st.markdown("### 🤖 AI Debate")
-                prebaked_all = load_prebaked_briefs()
-                prebaked_for_ticker = [b for b in prebaked_all if b.get("ticker", "").upper() == t.upper()]
+                prebaked_for_ticker = prebaked_by_ticker.get(t.upper(), [])
 
                 if debug_mode:
                     st.caption("Debug: showing model/brief info")
@@ -559,22 +737,24 @@ with tab_dashboard:
                             }
                             with c1:
                                 if st.button(f"Queue ({persona_key})", key=f"queue_pre_{t}_{persona_key}_{idx}"):
-                                    append_jsonl(QUEUE_PATH, meta)
+                                    get_queue_store().enqueue(meta)
                                     st.success("Queued for review")
                             with c2:
                                 if st.button(f"Save DB ({persona_key})", key=f"save_pre_{t}_{persona_key}_{idx}"):
-                                    vec = embed_text(meta["text"])
-                                    meta["embedding"] = vec
-                                    upsert_to_library(meta)
-                                    st.success("Saved to library (pre-baked).")
+                                    dup = save_to_library(meta)
+                                    if dup:
+                                        st.warning(duplicate_note(dup))
+                                    else:
+                                        st.success("Saved to library (pre-baked).")
                             with c3:
                                 if st.button(f"Mark winner ({persona_key})", key=f"winner_pre_{t}_{persona_key}_{idx}"):
-                                    vec = embed_text(meta["text"])
-                                    meta["embedding"] = vec
                                     meta["winner"] = True
-                                    upsert_to_library(meta)
-                                    broadcast_slack(f"🏆 Featured Brief ({t}): {persona_key}\n{meta['text'][:500]}...")
-                                    st.success("Winner saved (pre-baked) and broadcast attempted.")
+                                    dup = save_to_library(meta)
+                                    if dup:
+                                        st.warning(duplicate_note(dup))
+                                    else:
+                                        st.success("Winner saved (pre-baked).")
+                                        report_broadcast(broadcast_slack(f"🏆 Featured Brief ({t}): {persona_key}\n{meta['text'][:500]}..."))
                     # Skip live model generation when pre-baked briefs exist
                     st.markdown(f"<div style='color:{color};font-weight:600'>⚡️ Powered by EVITO AI</div>", unsafe_allow_html=True)
                     continue
@@ -604,22 +784,24 @@ with tab_dashboard:
                     }
                     with c1:
                         if st.button(f"Queue (mock)", key=f"queue_brief_mock_{t}"):
-                            append_jsonl(QUEUE_PATH, meta)
+                            get_queue_store().enqueue(meta)
                             st.success("Queued for review")
                     with c2:
                         if st.button(f"Save DB (mock)", key=f"save_brief_mock_{t}"):
-                            vec = embed_text(brief)
-                            meta["embedding"] = vec
-                            upsert_to_library(meta)
-                            st.success("Saved to library (local). Replace stub with vector DB upsert.")
+                            dup = save_to_library(meta)
+                            if dup:
+                                st.warning(duplicate_note(dup))
+                            else:
+                                st.success("Saved to library.")
                     with c3:
                         if st.button(f"Mark winner (mock)", key=f"winner_mock_{t}"):
-                            vec = embed_text(brief)
-                            meta["embedding"] = vec
                             meta["winner"] = True
-                            upsert_to_library(meta)
-                            broadcast_slack(f"🏆 Featured Brief ({t}): mock\n{brief[:500]}...")
-                            st.success("Winner saved (local) and broadcast attempted.")
+                            dup = save_to_library(meta)
+                            if dup:
+                                st.warning(duplicate_note(dup))
+                            else:
+                                st.success("Winner saved.")
+                                report_broadcast(broadcast_slack(f"🏆 Featured Brief ({t}): mock\n{brief[:500]}..."))
                     # Skip model loop when none configured
                     continue
 
@@ -630,102 +812,129 @@ with tab_dashboard:
                 include_news = bool(headlines)
                 payload = build_payload(data, headlines)
 
+                regenerate = st.checkbox("Regenerate (ignore cached briefs)", value=False, key=f"regen_{t}")
                 if st.button(f"Generate briefs for {t}", key=f"gen_{t}"):
+                    persona_text = PERSONAS.get(persona_choice, "")
+                    prompt, prompt_version = make_prompt(payload, persona_text)
+                    models_to_run = []
                     for label in selected_models:
                         model = next((m for m in available_models if m["label"] == label), None)
                         if not model:
                             st.warning(f"Model {label} not configured.")
                             continue
-                        persona_text = PERSONAS.get(persona_choice, "")
-                        prompt, prompt_version = make_prompt(payload, persona_text)
-                        with st.spinner(f"Generating {label}..."):
-                            brief = call_model(model, prompt)
+                        models_to_run.append(model)
+
+                    # One slot per model in selection order; each is filled as soon as its call returns
+                    slots = {m["label"]: st.empty() for m in models_to_run}
+                    for label, slot in slots.items():
+                        slot.caption(f"⏳ Generating {label}...")
+                    for label, brief, error, cached in generate_briefs(models_to_run, prompt, prompt_version, regenerate):
+                        with slots[label].container():
+                            if error:
+                                st.warning(f"{label} failed: {error}")
+                                continue
                             if (not brief) or ("Model client missing" in brief) or ("Unsupported provider" in brief):
                                 brief = MOCK_BRIEFS.get(t.upper(), MOCK_BRIEFS["__DEFAULT__"])
 
-                        context_badge = f"Persona: {persona_choice} • News: {'on' if include_news else 'off'} • Prompt: {prompt_version}"
-                        st.markdown(f"**{label}** — {context_badge}")
-                        st.text_area("Brief", brief, height=220, key=f"brief_out_{label}_{t}")
-                        st.caption("Context used: " + (", ".join([h['title'] for h in headlines]) if headlines else "None"))
-
-                        # Actions per brief
-                        c1, c2, c3 = st.columns(3)
-                        meta = {
-                            "id": str(uuid.uuid4()),
-                            "ticker": t,
-                            "days": days,
-                            "model": label,
-                            "persona": persona_choice,
-                            "timestamp": time.time(),
-                            "text": brief,
-                            "prompt_version": prompt_version,
-                            "headlines": [h["title"] for h in headlines],
-                        }
-                        with c1:
-                            if st.button(f"Queue ({label})", key=f"queue_brief_{label}_{t}"):
-                                append_jsonl(QUEUE_PATH, meta)
-                                st.success("Queued for review")
-                        with c2:
-                            if st.button(f"Save DB ({label})", key=f"save_brief_{label}_{t}"):
-                                vec = embed_text(brief)
-                                meta["embedding"] = vec
-                                upsert_to_library(meta)
-                                st.success("Saved to library (local). Replace stub with vector DB upsert.")
-                        with c3:
-                            if st.button(f"Mark winner ({label})", key=f"winner_{label}_{t}"):
-                                vec = embed_text(brief)
-                                meta["embedding"] = vec
-                                meta["winner"] = True
-                                upsert_to_library(meta)
-                                broadcast_slack(f"🏆 Featured Brief ({t}): {label}\n{brief[:500]}...")
-                                st.success("Winner saved (local) and broadcast attempted.")
+                            context_badge = f"Persona: {persona_choice} • News: {'on' if include_news else 'off'} • Prompt: {prompt_version}"
+                            if cached:
+                                context_badge += " • cached"
+                            st.markdown(f"**{label}** — {context_badge}")
+                            st.text_area("Brief", brief, height=220, key=f"brief_out_{label}_{t}")
+                            st.caption("Context used: " + (", ".join([h['title'] for h in headlines]) if headlines else "None"))
+
+                            # Actions per brief
+                            c1, c2, c3 = st.columns(3)
+                            meta = {
+                                "id": str(uuid.uuid4()),
+                                "ticker": t,
+                                "days": days,
+                                "model": label,
+                                "persona": persona_choice,
+                                "timestamp": time.time(),
+                                "text": brief,
+                                "prompt_version": prompt_version,
+                                "headlines": [h["title"] for h in headlines],
+                            }
+                            with c1:
+                                if st.button(f"Queue ({label})", key=f"queue_brief_{label}_{t}"):
+                                    get_queue_store().enqueue(meta)
+                                    st.success("Queued for review")
+                            with c2:
+                                if st.button(f"Save DB ({label})", key=f"save_brief_{label}_{t}"):
+                                    dup = save_to_library(meta)
+                                    if dup:
+                                        st.warning(duplicate_note(dup))
+                                    else:
+                                        st.success("Saved to library.")
+                            with c3:
+                                if st.button(f"Mark winner ({label})", key=f"winner_{label}_{t}"):
+                                    meta["winner"] = True
+                                    dup = save_to_library(meta)
+                                    if dup:
+                                        st.warning(duplicate_note(dup))
+                                    else:
+                                        st.success("Winner saved.")
+                                        report_broadcast(broadcast_slack(f"🏆 Featured Brief ({t}): {label}\n{brief[:500]}..."))
 
                 st.markdown(f"<div style='color:{color};font-weight:600'>⚡️ Powered by EVITO AI</div>", unsafe_allow_html=True)
         except Exception as e:
             with cols[i]:
                 st.error(f"{t}: {e}")
 
-    if auto:
-        time.sleep(interval)
-        st.rerun()
-
 with tab_review:
     st.markdown("### Review Queue")
-    queue_entries = read_jsonl(QUEUE_PATH)
+    queue_store = get_queue_store()
+    queue_entries = queue_store.entries()
     if not queue_entries:
         st.info("Queue is empty.")
     else:
+        queue_by_id = {e["id"]: e for e in queue_entries}
         selected_ids = st.multiselect(
             "Select entries to save",
-            options=[e["id"] for e in queue_entries],
-            format_func=lambda i: next(e for e in queue_entries if e["id"] == i)["ticker"],
+            options=list(queue_by_id),
+            format_func=lambda i: f"{queue_by_id[i]['ticker']} ({queue_by_id[i]['days']}d) • {i[:8]}",
         )
         if st.button("Save selected to DB (with embeddings)", key="save_selected"):
-            for e in queue_entries:
-                if e["id"] in selected_ids:
-                    vec = embed_text(e["text"])
-                    entry = dict(e)
-                    entry["embedding"] = vec
-                    upsert_to_library(entry)
-            st.success("Selected entries saved (local stub).")
-            # Remove saved from queue
-            remaining = [e for e in queue_entries if e["id"] not in selected_ids]
-            QUEUE_PATH.unlink(missing_ok=True)
-            for e in remaining:
-                append_jsonl(QUEUE_PATH, e)
+            selected = [e for e in queue_entries if e["id"] in set(selected_ids)]
+            bar = st.progress(0.0, text=f"Embedding {len(selected)} briefs...")
+            saved, duplicates = save_many_to_library(
+                selected, on_progress=lambda done, total: bar.progress(done / total, text=f"Embedded {done}/{total}")
+            )
+            bar.empty()
+            for dup in duplicates.values():
+                st.warning(duplicate_note(dup))
+            st.success(f"Selected entries saved ({len(saved)}); duplicates stay queued.")
+            # Remove saved from queue (tombstones; compacted atomically once they pile up)
+            queue_store.remove(e["id"] for e in saved)
         st.markdown("#### Queue Items")
         for e in queue_entries:
             with st.expander(f"{e['ticker']} ({e['days']}d) • {e['id'][:8]}"):
                 st.write(e["text"])
 
     st.markdown("### Library Snapshot (last 20)")
-    lib_entries = read_jsonl(LIB_PATH)
+    lib_entries = get_library_store().latest(20)
     if not lib_entries:
         st.info("Library is empty.")
     else:
-        for e in lib_entries[-20:][::-1]:
+        for e in lib_entries:
             st.markdown(f"- **{e['ticker']} ({e['days']}d)** model: {e.get('model')} persona: {e.get('persona')} at {time.strftime('%Y-%m-%d %H:%M:%S', time.gmtime(e.get('timestamp', 0)))}")
 
+    st.markdown("### Find Similar Briefs")
+    similar_query = st.text_area("Paste a brief or thesis", "", height=120, key="similar_query")
+    if st.button("Find similar", key="find_similar") and similar_query.strip():
+        hits = get_similarity_index().search(embed_text(similar_query), k=5)
+        hit_entries = {e["id"]: e for e in get_library_store().get_many([h[0] for h in hits])}
+        if not hits:
+            st.info("Library has no embedded briefs yet.")
+        for hit_id, score in hits:
+            e = hit_entries.get(hit_id)
+            if not e:
+                continue
+            with st.expander(f"{score:.2f} • {e['ticker']} ({e['days']}d) • {e.get('model')} / {e.get('persona')}"):
+                st.write(e["text"])
+        st.caption(f"Search mode: {get_similarity_index().mode}")
+
 with tab_pipelines:
     st.markdown("### Pipelines: IN / OUT")
     st.caption("Drop Markdown files into data/*_in, move them to *_out when processed, and promote OUT briefs to the library.")
@@ -742,43 +951,51 @@ with tab_pipelines:
 
         with col_in:
             st.markdown("**IN**")
-            in_files = list_md(in_dir)
-            in_options = [f["name"] for f in in_files]
+            in_options = [f["name"] for f in md_page(in_dir, f"{label}_in")]
             sel_in = st.selectbox(f"{label} IN files", ["(none)"] + in_options, key=f"{label}_in_sel")
             if sel_in != "(none)":
-                path = next(f["path"] for f in in_files if f["name"] == sel_in)
+                path = in_dir / sel_in
                 content = read_md(path)
                 st.text_area("Content", content, height=220, key=f"{label}_in_content_{sel_in}")
                 if st.button("Send to OUT", key=f"{label}_move_{sel_in}"):
                     move_md(path, out_dir)
                     st.success("Moved to OUT")
-                    st.experimental_rerun()
+                    st.rerun()
+            in_total = count_md(in_dir)
+            if in_total and st.button(f"Send all {in_total} to OUT", key=f"{label}_move_all"):
+                move_all(in_dir, out_dir)
+                st.rerun()
 
         with col_out:
             st.markdown("**OUT**")
-            out_files = list_md(out_dir)
-            out_options = [f["name"] for f in out_files]
+            out_options = [f["name"] for f in md_page(out_dir, f"{label}_out")]
             sel_out = st.selectbox(f"{label} OUT files", ["(none)"] + out_options, key=f"{label}_out_sel")
             if sel_out != "(none)":
-                path = next(f["path"] for f in out_files if f["name"] == sel_out)
+                path = out_dir / sel_out
                 content = read_md(path)
                 st.text_area("Content", content, height=220, key=f"{label}_out_content_{sel_out}")
                 if label == "BRIEFS":
                     if st.button("Promote to library (audited brief)", key=f"{label}_promote_{sel_out}"):
-                        ticker_inferred, persona_inferred = infer_from_filename(sel_out)
-                        meta = {
-                            "id": str(uuid.uuid4()),
-                            "ticker": ticker_inferred,
-                            "days": 0,
-                            "model": "external-llm",
-                            "persona": persona_inferred,
-                            "timestamp": time.time(),
-                            "text": content,
-                            "prompt_version": "persona_md_v1",
-                            "headlines": [],
-                            "audited": True,
-                        }
-                        vec = embed_text(content)
-                        meta["embedding"] = vec
-                        upsert_to_library(meta)
-                        st.success("Promoted to library as audited brief.")
+                        meta = audited_brief(path, content)
+                        if get_library_store().get(meta["id"]):
+                            st.info("Already in the library (same content).")
+                        else:
+                            dup = save_to_library(meta)
+                            if dup:
+                                st.warning(duplicate_note(dup))
+                            else:
+                                st.success("Promoted to library as audited brief.")
+            if label == "BRIEFS" and count_md(out_dir):
+                if st.button("Promote all new OUT briefs", key="BRIEFS_promote_all"):
+                    pending = new_briefs(get_library_store(), out_dir)
+                    if not pending:
+                        st.info("Every OUT brief is already in the library.")
+                    else:
+                        bar = st.progress(0.0, text=f"Embedding {len(pending)} briefs...")
+                        saved, duplicates = save_many_to_library(
+                            pending, on_progress=lambda done, total: bar.progress(done / total, text=f"Embedded {done}/{total}")
+                        )
+                        bar.empty()
+                        for dup in duplicates.values():
+                            st.warning(duplicate_note(dup))
+                        st.success(f"Promoted {len(saved)} briefs to the library.")
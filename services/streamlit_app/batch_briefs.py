@@ -0,0 +1,290 @@
+#!/usr/bin/env python3
+"""
+Headless brief generation: tickers x personas x models -> data/prebaked_briefs.jsonl.
+
+    python batch_briefs.py                                   # default tickers + AI universe, all personas, configured models
+    python batch_briefs.py --tickers NVDA,TSLA --personas Buffett --models GPT-4o --days 90
+    python batch_briefs.py --run 2024-06-01                  # resume (or redo) a named run
+
+- one risk card (Risk API) + curated headlines per ticker, shared by all its jobs
+- bounded worker pool (EVITO_BATCH_WORKERS); each model endpoint has its own request rate
+  (EVITO_BATCH_RPM per minute, or "rpm" in the registry entry)
+- 429/5xx/timeouts retry with exponential backoff (Retry-After honoured); other errors fail the
+  job at once; placeholders (call_model ok=False) are not written
+- checkpoint = the output file: every line carries its job id (run|ticker|days|persona|model),
+  so an interrupted run re-started with the same --run skips the jobs already written
+"""
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, timezone
+from pathlib import Path
+from urllib.parse import urlparse
+import argparse
+import json
+import os
+import random
+import sys
+import threading
+import time
+
+import requests
+from dotenv import load_dotenv
+
+load_dotenv(Path.cwd() / ".env")
+
+# Reads the model API keys at import time, so only after .env is loaded
+from brief_engine import MODEL_REGISTRY, PERSONAS, build_payload, call_model, make_prompt  # noqa: E402
+from custom_news_index import CustomNewsIndex  # noqa: E402
+
+API_URL = os.getenv("EVITO_API_URL", "http://localhost:8081")
+DEFAULT_TICKERS = ["TSLA", "AAPL", "NVDA", "SPY"]
+PREBAKED_PATH = Path("data/prebaked_briefs.jsonl")
+CUSTOM_NEWS_PATH = Path("data/custom_news.jsonl")
+AI_UNIVERSE_PATH = Path("data/ai_universe.jsonl")
+BATCH_WORKERS = int(os.getenv("EVITO_BATCH_WORKERS", "8"))
+BATCH_RPM = float(os.getenv("EVITO_BATCH_RPM", "60"))  # requests per minute per model endpoint
+MAX_ATTEMPTS = 4
+BACKOFF_BASE = 2.0  # seconds; doubles per attempt, plus jitter
+BACKOFF_MAX = 60.0
+HEADLINE_LIMIT = 5
+
+
+class RateLimiter:
+    """Evenly spaced request slots (rpm per minute), shared by every thread using it."""
+
+    def __init__(self, rpm: float):
+        self.interval = 60.0 / rpm if rpm > 0 else 0.0
+        self.next_slot = 0.0
+        self.lock = threading.Lock()
+
+    def wait(self):
+        with self.lock:
+            now = time.monotonic()
+            slot = max(now, self.next_slot)
+            self.next_slot = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+
+    def pause(self, seconds: float):
+        """Push every later slot back (the endpoint answered 429)."""
+        with self.lock:
+            self.next_slot = max(self.next_slot, time.monotonic() + seconds)
+
+
+def endpoint(entry: dict) -> str:
+    """Rate-limit key: the API host (xAI and Mistral speak the openai protocol but are separate quotas)."""
+    return urlparse(entry.get("base_url") or "").hostname or entry.get("provider", "")
+
+
+def _retry_after(error):
+    response = getattr(error, "response", None)
+    if getattr(response, "status_code", None) != 429:
+        return None
+    try:
+        return float(response.headers.get("retry-after"))
+    except (AttributeError, TypeError, ValueError):
+        return None
+
+
+def _is_transient(error):
+    """429, 5xx, timeouts and connection errors are worth retrying; 400/401/404 (bad key, unknown model) are not."""
+    status = getattr(error, "status_code", None) or getattr(getattr(error, "response", None), "status_code", None)
+    if status is not None:
+        return status == 429 or status >= 500
+    if isinstance(error, (TimeoutError, ConnectionError)):
+        return True
+    # openai/anthropic/httpx/requests: APITimeoutError, APIConnectionError, ReadTimeout, ConnectionError, ...
+    names = " ".join(cls.__name__ for cls in type(error).__mro__).lower()
+    return "timeout" in names or "connection" in names
+
+
+def generate(entry: dict, prompt: str, limiter: RateLimiter) -> str:
+    """call_model with rate limiting and retries; raises on permanent errors, placeholders or after MAX_ATTEMPTS."""
+    for attempt in range(MAX_ATTEMPTS):
+        limiter.wait()
+        try:
+            brief, ok = call_model(entry, prompt)
+        except Exception as e:
+            if attempt + 1 == MAX_ATTEMPTS or not _is_transient(e):
+                raise
+            delay = min(BACKOFF_MAX, BACKOFF_BASE * 2 ** attempt) * (0.5 + random.random())
+            retry_after = _retry_after(e)
+            if retry_after is not None:
+                limiter.pause(retry_after)
+                delay = max(delay, retry_after)
+            print(f"  {entry['label']}: {e} (retry {attempt + 1} in {delay:.1f}s)")
+            time.sleep(delay)
+            continue
+        if not ok or not brief:
+            raise RuntimeError(brief or "empty response")  # config problem, retrying won't help
+        return brief
+
+
+def job_id(run: str, ticker: str, days: int, persona: str, label: str) -> str:
+    return f"{run}|{ticker}|{days}|{persona}|{label}"
+
+
+def done_jobs(path: Path) -> set:
+    """Job ids already written to path (lines without a job id, or torn lines, are ignored)."""
+    done = set()
+    if not path.exists():
+        return done
+    with path.open("r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                job = json.loads(line).get("job")
+            except Exception:
+                continue
+            if job:
+                done.add(job)
+    return done
+
+
+class BriefWriter:
+    """Appends one complete, fsynced line per brief, so a crash loses at most the brief in flight."""
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.lock = threading.Lock()
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # A torn last line from a crash would swallow the next record
+        if path.exists() and path.stat().st_size:
+            with path.open("rb+") as f:
+                f.seek(-1, os.SEEK_END)
+                if f.read(1) != b"\n":
+                    f.write(b"\n")
+
+    def write(self, obj: dict):
+        line = (json.dumps(obj) + "\n").encode("utf-8")
+        with self.lock, self.path.open("ab") as f:
+            f.write(line)
+            f.flush()
+            os.fsync(f.fileno())
+
+
+def universe_tickers(path: Path = AI_UNIVERSE_PATH) -> list:
+    if not path.exists():
+        return []
+    tickers = []
+    for line in path.read_text().splitlines():
+        try:
+            tickers.append(str(json.loads(line)["ticker"]).upper())
+        except Exception:
+            continue
+    return tickers
+
+
+def fetch_card(session, ticker: str, days: int) -> dict:
+    resp = session.get(f"{API_URL}/analyze", params={"ticker": ticker, "days": days}, timeout=30)
+    resp.raise_for_status()
+    return resp.json()
+
+
+def fetch_headlines(index: CustomNewsIndex, ticker: str) -> list:
+    return [
+        {
+            "title": obj.get("title"),
+            "link": obj.get("link"),
+            "source": obj.get("source", "custom"),
+            "summary": obj.get("summary"),
+        }
+        for obj in index.latest(ticker, HEADLINE_LIMIT)
+    ]
+
+
+def _csv(value):
+    return [v.strip() for v in value.split(",") if v.strip()] if value else None
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Generate pre-baked briefs without the UI.")
+    parser.add_argument("--tickers", help="comma-separated; default: app defaults + AI universe")
+    parser.add_argument("--personas", help=f"comma-separated; default: all ({', '.join(PERSONAS)})")
+    parser.add_argument("--models", help="comma-separated registry labels; default: every model with an API key")
+    parser.add_argument("--days", type=int, default=30)
+    parser.add_argument("--workers", type=int, default=BATCH_WORKERS)
+    parser.add_argument("--run", default=datetime.now(timezone.utc).strftime("%Y-%m-%d"), help="run name (resume key); default: today (UTC)")
+    parser.add_argument("--no-news", action="store_true", help="do not add curated headlines to the prompt")
+    parser.add_argument("--out", type=Path, default=PREBAKED_PATH)
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    tickers = [t.upper() for t in _csv(args.tickers) or []] or list(dict.fromkeys(DEFAULT_TICKERS + universe_tickers()))
+    personas = _csv(args.personas) or list(PERSONAS)
+    labels = _csv(args.models)
+    models = [m for m in MODEL_REGISTRY if m.get("api_key") and (labels is None or m["label"] in labels)]
+    unknown = [p for p in personas if p not in PERSONAS] + [l for l in labels or [] if l not in {m["label"] for m in MODEL_REGISTRY}]
+    if unknown:
+        print(f"❌ Unknown persona/model: {', '.join(unknown)}")
+        return 2
+    if not models:
+        print("❌ No models configured (set the API keys in .env)")
+        return 2
+
+    done = done_jobs(args.out)
+    jobs = [
+        (t, p, m)
+        for t in tickers
+        for p in personas
+        for m in models
+        if job_id(args.run, t, args.days, p, m["label"]) not in done
+    ]
+    total = len(tickers) * len(personas) * len(models)
+    print(f"Run {args.run}: {total} briefs ({len(tickers)} tickers x {len(personas)} personas x {len(models)} models), {total - len(jobs)} already done")
+    if not jobs:
+        return 0
+
+    t0 = time.perf_counter()
+    session = requests.Session()
+    news = None if args.no_news else CustomNewsIndex(CUSTOM_NEWS_PATH)
+    payloads = {}
+    for ticker in dict.fromkeys(t for t, _, _ in jobs):
+        try:
+            card = fetch_card(session, ticker, args.days)
+        except Exception as e:
+            print(f"  {ticker}: risk card failed ({e}), skipped")
+            continue
+        payloads[ticker] = build_payload(card, fetch_headlines(news, ticker) if news else [])
+
+    limiters = {key: RateLimiter(BATCH_RPM) for key in {endpoint(m) for m in models}}
+    for m in models:
+        if m.get("rpm"):
+            limiters[endpoint(m)] = RateLimiter(m["rpm"])
+    writer = BriefWriter(args.out)
+    written = failed = 0
+
+    def run_job(ticker, persona, entry):
+        prompt, prompt_version = make_prompt(payloads[ticker], PERSONAS[persona])
+        text = generate(entry, prompt, limiters[endpoint(entry)])
+        writer.write(
+            {
+                "ticker": ticker,
+                "persona": persona,
+                "model": entry["label"],
+                "text": text,
+                "days": args.days,
+                "prompt_version": prompt_version,
+                "headlines": [h["title"] for h in payloads[ticker]["headlines"]],
+                "timestamp": time.time(),
+                "job": job_id(args.run, ticker, args.days, persona, entry["label"]),
+            }
+        )
+
+    with ThreadPoolExecutor(max_workers=max(1, args.workers)) as pool:
+        futures = {pool.submit(run_job, *job): job for job in jobs if job[0] in payloads}
+        for fut in as_completed(futures):
+            ticker, persona, entry = futures[fut]
+            try:
+                fut.result()
+                written += 1
+            except Exception as e:
+                failed += 1
+                print(f"  {ticker} / {persona} / {entry['label']} failed: {e}")
+    skipped = len(jobs) - len(futures)
+    print(f"✅ Wrote {written} briefs to {args.out} in {time.perf_counter() - t0:.1f}s ({failed} failed, {skipped} skipped)")
+    return 1 if failed or skipped else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
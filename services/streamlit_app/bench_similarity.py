@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""Benchmark exact (memmap + NumPy) vs HNSW similarity search: latency and recall@k"""
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+from similarity_index import HNSW_EF_CONSTRUCTION, HNSW_EF_SEARCH, HNSW_M, _hnswlib, top_k
+
+SIZES = [int(s) for s in sys.argv[1].split(",")] if len(sys.argv) > 1 else [10_000, 100_000, 1_000_000]
+DIM = 384
+K = 10
+QUERIES = 50
+BUILD_CHUNK = 50_000
+
+
+def make_matrix(path, n, rng):
+    """Random unit vectors written chunk-wise to a float32 memmap."""
+    matrix = np.memmap(path, dtype=np.float32, mode="w+", shape=(n, DIM))
+    for start in range(0, n, BUILD_CHUNK):
+        block = rng.standard_normal((min(BUILD_CHUNK, n - start), DIM)).astype(np.float32)
+        block /= np.linalg.norm(block, axis=1, keepdims=True)
+        matrix[start:start + len(block)] = block
+    matrix.flush()
+    return np.memmap(path, dtype=np.float32, mode="r", shape=(n, DIM))
+
+
+def make_queries(matrix, rng):
+    # Perturbed copies of stored briefs (the near-duplicate / "find similar" case)
+    rows = rng.integers(0, len(matrix), QUERIES)
+    queries = np.asarray(matrix[np.sort(rows)]) + 0.05 * rng.standard_normal((QUERIES, DIM)).astype(np.float32)
+    return queries / np.linalg.norm(queries, axis=1, keepdims=True)
+
+
+hnswlib = _hnswlib()
+rng = np.random.default_rng(7)
+
+print("=" * 60)
+print(f"SIMILARITY BENCHMARK (dim={DIM}, k={K}, {QUERIES} queries)")
+print("=" * 60)
+if hnswlib is None:
+    print("hnswlib not installed: exact path only (pip install hnswlib)")
+
+with tempfile.TemporaryDirectory() as tmp:
+    for n in SIZES:
+        matrix = make_matrix(Path(tmp) / f"emb_{n}.f32", n, rng)
+        queries = make_queries(matrix, rng)
+        print(f"\n{n:,} briefs ({matrix.nbytes / 1e6:.0f} MB)")
+
+        t0 = time.perf_counter()
+        exact = [top_k(matrix, q, K)[0] for q in queries]
+        exact_ms = (time.perf_counter() - t0) * 1000 / QUERIES
+        print(f"  Exact:  {exact_ms:8.2f} ms/query")
+
+        if hnswlib is not None:
+            index = hnswlib.Index(space="ip", dim=DIM)
+            index.init_index(max_elements=n, ef_construction=HNSW_EF_CONSTRUCTION, M=HNSW_M)
+            t0 = time.perf_counter()
+            for start in range(0, n, BUILD_CHUNK):
+                index.add_items(np.asarray(matrix[start:start + BUILD_CHUNK]), np.arange(start, min(n, start + BUILD_CHUNK)))
+            build_s = time.perf_counter() - t0
+            index.set_ef(HNSW_EF_SEARCH)
+            t0 = time.perf_counter()
+            labels, _ = index.knn_query(queries, k=K, num_threads=1)
+            ann_ms = (time.perf_counter() - t0) * 1000 / QUERIES
+            recall = np.mean([len(set(a.tolist()) & set(e.tolist())) / K for a, e in zip(labels, exact)])
+            print(f"  HNSW:   {ann_ms:8.2f} ms/query  recall@{K} {recall:.3f}  (build {build_s:.1f}s)")
+            print(f"  Speedup: {exact_ms / ann_ms:7.1f}x")
+        del matrix
@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+"""Benchmark the AI Universe table: build once vs per-rerun, and filter latency"""
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from universe_table import build_universe_frame, filter_universe
+
+N = int(sys.argv[1]) if len(sys.argv) > 1 else 50_000
+QUERIES = ["nv", "semiconductor", "cloud", "zzz", "a"]
+
+rng = np.random.default_rng(7)
+themes = ["Semiconductors", "Cloud", "Robotics", "Data Centers", "Software", "Energy"]
+entries = [
+    {"ticker": f"T{i:05d}", "name": f"Company {i} Holdings", "theme": themes[i % len(themes)], "rsi": float(rng.uniform(5, 95))}
+    for i in range(N)
+]
+
+
+def old_state(rsi):
+    value = float(rsi)
+    return "Overbought" if value >= 70 else "Oversold" if value <= 30 else "Neutral"
+
+
+def old_filter(text):
+    df = pd.DataFrame(entries)
+    df["state"] = df["rsi"].apply(old_state)
+    mask = (
+        df["ticker"].astype(str).str.contains(text, case=False, na=False)
+        | df["name"].astype(str).str.contains(text, case=False, na=False)
+        | df["theme"].astype(str).str.contains(text, case=False, na=False)
+    )
+    return df[mask].sort_values(by="rsi", ascending=False, na_position="last")
+
+
+t0 = time.perf_counter()
+df = build_universe_frame(entries)
+build = time.perf_counter() - t0
+
+print("=" * 60)
+print(f"{N} rows")
+print(f"  build (once per file change): {build * 1000:.1f} ms")
+for q in QUERIES:
+    t0 = time.perf_counter()
+    rows = len(filter_universe(df, q))
+    new = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    old_rows = len(old_filter(q))
+    old = time.perf_counter() - t0
+    print(f"  filter {q!r:16} {new * 1000:6.1f} ms  (old per-rerun path {old * 1000:6.1f} ms)  {rows} rows")
+    assert rows == old_rows
+print("=" * 60)
@@ -0,0 +1,91 @@
+"""
+Persistent cache of generated briefs, keyed by (model, prompt_version, temperature).
+prompt_version is the sha1 of the full prompt (make_prompt), so an identical payload +
+persona + template hits the cache. SQLite file; least-recently-used entries are evicted
+once the stored text exceeds the size budget.
+"""
+from pathlib import Path
+from typing import Optional
+import os
+import sqlite3
+import threading
+import time
+
+BRIEF_CACHE_PATH = Path(os.getenv("EVITO_BRIEF_CACHE_PATH", "data/brief_cache.db"))
+BRIEF_CACHE_MAX_BYTES = int(float(os.getenv("EVITO_BRIEF_CACHE_MB", "50")) * 1024 * 1024)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS brief_cache (
+    model TEXT NOT NULL,
+    prompt_version TEXT NOT NULL,
+    temperature REAL NOT NULL,
+    text TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    created REAL NOT NULL,
+    last_used REAL NOT NULL,
+    PRIMARY KEY (model, prompt_version, temperature)
+);
+CREATE INDEX IF NOT EXISTS idx_brief_cache_last_used ON brief_cache (last_used);
+"""
+
+
+class BriefCache:
+    def __init__(self, path: Path = BRIEF_CACHE_PATH, max_bytes: int = BRIEF_CACHE_MAX_BYTES):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(self.path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.executescript(SCHEMA)
+        self._bytes = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM brief_cache").fetchone()[0]
+
+    def get(self, model: str, prompt_version: str, temperature: float) -> Optional[str]:
+        key = (model, prompt_version, float(temperature))
+        with self._lock:
+            row = self._db.execute(
+                "SELECT text FROM brief_cache WHERE model = ? AND prompt_version = ? AND temperature = ?", key
+            ).fetchone()
+            if row is None:
+                return None
+            with self._db:
+                self._db.execute(
+                    "UPDATE brief_cache SET last_used = ? WHERE model = ? AND prompt_version = ? AND temperature = ?",
+                    (time.time(),) + key,
+                )
+            return row[0]
+
+    def put(self, model: str, prompt_version: str, temperature: float, text: str) -> None:
+        key = (model, prompt_version, float(temperature))
+        size = len(text.encode("utf-8"))
+        now = time.time()
+        with self._lock, self._db:
+            old = self._db.execute(
+                "SELECT size FROM brief_cache WHERE model = ? AND prompt_version = ? AND temperature = ?", key
+            ).fetchone()
+            self._db.execute(
+                "INSERT OR REPLACE INTO brief_cache VALUES (?, ?, ?, ?, ?, ?, ?)", key + (text, size, now, now)
+            )
+            self._bytes += size - (old[0] if old else 0)
+            if self._bytes > self.max_bytes:
+                self._evict()
+
+    def _evict(self) -> None:
+        """Drop least-recently-used entries until the cache is back under budget."""
+        excess = self._bytes - self.max_bytes
+        victims = []
+        for model, prompt_version, temperature, size in self._db.execute(
+            "SELECT model, prompt_version, temperature, size FROM brief_cache ORDER BY last_used"
+        ).fetchall():
+            if excess <= 0:
+                break
+            victims.append((model, prompt_version, temperature))
+            excess -= size
+            self._bytes -= size
+        self._db.executemany(
+            "DELETE FROM brief_cache WHERE model = ? AND prompt_version = ? AND temperature = ?", victims
+        )
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM brief_cache").fetchone()[0]
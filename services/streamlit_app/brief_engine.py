@@ -0,0 +1,150 @@
+"""
+EVITO brief engine: prompt building and model calls, shared by the Streamlit app and the
+headless batch generator (batch_briefs.py). No Streamlit imports.
+- PERSONAS / MODEL_REGISTRY: the persona texts and configured model endpoints
+- build_payload + make_prompt: risk card + headlines -> (prompt, prompt_version); the version
+  is a hash of the prompt, which leaves out volatile fields such as the fetch timestamp
+- call_model: one completion -> (text, ok); ok is False for the placeholder shown when the
+  provider is unsupported or its client library is missing. Clients are long-lived per
+  provider/base_url/key, thread-safe
+"""
+from hashlib import sha1
+import json
+import os
+import textwrap
+import threading
+
+MODEL_TEMPERATURE = 0.4
+MODEL_TIMEOUT = float(os.getenv("EVITO_MODEL_TIMEOUT", "60"))  # seconds per call; registry "timeout" overrides
+# Payload fields that change on every fetch without changing the data (kept out of the prompt,
+# so prompt_version - the brief cache key - only changes when the card does)
+VOLATILE_FIELDS = ("timestamp",)
+
+PERSONAS = {
+    "None": "",
+    "Buffett": "You are Warren Buffett: value investing, moats, margin of safety, long-term discipline.",
+    "Risk Officer": "You are a Chief Risk Officer: focus on liquidity, tail risk, concentration, compliance.",
+    "Tech Strategist": "You are a pragmatic tech strategist: product cycles, infra, AI moats, competitive landscape.",
+}
+
+MODEL_REGISTRY = [
+    {
+        "label": "GPT-4o",
+        "provider": "openai",
+        "model": "gpt-4o",
+        "base_url": os.getenv("OPENAI_BASE", "https://api.openai.com/v1"),
+        "api_key": os.getenv("OPENAI_API_KEY"),
+    },
+    {
+        "label": "o1-preview",
+        "provider": "openai",
+        "model": "o1-preview",
+        "base_url": os.getenv("OPENAI_BASE", "https://api.openai.com/v1"),
+        "api_key": os.getenv("OPENAI_API_KEY"),
+        "timeout": 180,  # reasoning model: slow first token
+    },
+    {
+        "label": "xAI",
+        "provider": "openai",
+        "model": os.getenv("XAI_MODEL", "grok-2"),
+        "base_url": os.getenv("XAI_BASE", "https://api.x.ai/v1"),
+        "api_key": os.getenv("XAI_API_KEY"),
+    },
+    {
+        "label": "Mistral",
+        "provider": "openai",
+        "model": os.getenv("MISTRAL_MODEL", "mistral-large-latest"),
+        "base_url": os.getenv("MISTRAL_BASE", "https://api.mistral.ai/v1"),
+        "api_key": os.getenv("MISTRAL_API_KEY"),
+    },
+    {
+        "label": "Anthropic",
+        "provider": "anthropic",
+        "model": os.getenv("ANTHROPIC_MODEL", "claude-3-5-sonnet-20241022"),
+        "api_key": os.getenv("ANTHROPIC_API_KEY"),
+    },
+]
+
+_clients = {}
+_clients_lock = threading.Lock()
+
+
+def build_payload(data: dict, headlines: list[dict]) -> dict:
+    return {
+        "ticker": data.get("ticker"),
+        "days": data.get("days"),
+        "risk_score": data.get("risk_score"),
+        "risk_level": data.get("risk_level"),
+        "volatility": data.get("volatility"),
+        "trend": data.get("trend"),
+        "factors": data.get("factors", []),
+        "headlines": headlines,
+        "timestamp": data.get("timestamp"),
+    }
+
+
+def make_prompt(payload: dict, persona_text: str) -> tuple[str, str]:
+    payload = {k: v for k, v in payload.items() if k not in VOLATILE_FIELDS}
+    prompt = textwrap.dedent(
+        f"""
+        SYSTEM: You write concise tech/AI market briefs for investors. Use only provided data. No fabrications. Max 280 words.
+        {persona_text}
+        USER: Structured data: {json.dumps(payload)}
+        Write:
+        - Title (strong hook)
+        - TL;DR (3 bullets)
+        - Market Setup (1 short paragraph)
+        - Why Now (1–2 short paragraphs)
+        - Risks (bullets)
+        - Watch List / Catalysts (bullets with timeframes)
+        - Bottom Line (1 sentence, actionable)
+        Tone: analytical, plain English, no hype.
+        """
+    ).strip()
+    prompt_version = sha1(prompt.encode("utf-8")).hexdigest()[:10]
+    return prompt, prompt_version
+
+
+def get_model_client(provider: str, base_url: str | None, api_key: str):
+    # One long-lived client (connection pool) per provider/base_url/key, shared by all threads
+    key = (provider, base_url, api_key)
+    with _clients_lock:
+        if key not in _clients:
+            if provider == "openai":
+                from openai import OpenAI
+
+                _clients[key] = OpenAI(base_url=base_url, api_key=api_key, max_retries=1)
+            elif provider == "anthropic":
+                import anthropic
+
+                _clients[key] = anthropic.Anthropic(api_key=api_key, max_retries=1)
+            else:
+                _clients[key] = None
+        return _clients[key]
+
+
+def call_model(entry: dict, prompt: str) -> tuple[str, bool]:
+    provider = entry.get("provider")
+    timeout = entry.get("timeout", MODEL_TIMEOUT)
+    try:
+        client = get_model_client(provider, entry.get("base_url"), entry.get("api_key"))
+    except ImportError:
+        return "Model client missing; showing placeholder brief.", False
+    if provider == "openai":
+        resp = client.chat.completions.create(
+            model=entry.get("model"),
+            messages=[{"role": "user", "content": prompt}],
+            temperature=entry.get("temperature", MODEL_TEMPERATURE),
+            timeout=timeout,
+        )
+        return resp.choices[0].message.content.strip(), True
+    if provider == "anthropic":
+        resp = client.messages.create(
+            model=entry.get("model"),
+            max_tokens=800,
+            temperature=entry.get("temperature", MODEL_TEMPERATURE),
+            messages=[{"role": "user", "content": prompt}],
+            timeout=timeout,
+        )
+        return resp.content[0].text.strip(), True
+    return "Unsupported provider; placeholder brief.", False
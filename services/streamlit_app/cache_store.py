@@ -0,0 +1,74 @@
+"""
+Process-wide caches for the Streamlit app (survive reruns; plain module state).
+- File memoization keyed on (mtime, size): unchanged files are never re-read/parsed
+- TTL caches for network results (Risk API cards, RSS feeds)
+- Explicit invalidation when the app itself writes
+Cached values are shared between sessions: treat them as read-only.
+"""
+from pathlib import Path
+from typing import Any, Callable, Dict, Hashable, Tuple
+import threading
+import time
+
+_lock = threading.Lock()
+_files: Dict[Tuple[str, str], Tuple[Tuple[int, int], Any]] = {}
+
+
+def _signature(path: Path):
+    try:
+        st = path.stat()
+    except FileNotFoundError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+
+def cached_file(path: Path, loader: Callable[[Path], Any]) -> Any:
+    """Return loader(path), re-running it only when the file's mtime/size changed."""
+    key = (str(path), getattr(loader, "__qualname__", repr(loader)))
+    sig = _signature(Path(path))
+    with _lock:
+        hit = _files.get(key)
+        if hit is not None and hit[0] == sig:
+            return hit[1]
+    value = loader(Path(path))
+    with _lock:
+        _files[key] = (sig, value)
+    return value
+
+
+def invalidate_file(path: Path) -> None:
+    """Drop every memoized view of path (call after the app writes to it)."""
+    with _lock:
+        for key in [k for k in _files if k[0] == str(path)]:
+            del _files[key]
+
+
+class TTLCache:
+    """Small thread-safe TTL cache with a size cap (oldest entries evicted first)."""
+
+    def __init__(self, ttl: float, maxsize: int = 512):
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._data: Dict[Hashable, Tuple[float, Any]] = {}
+        self._lock = threading.Lock()
+
+    def get_or_set(self, key: Hashable, compute: Callable[[], Any]) -> Any:
+        now = time.monotonic()
+        with self._lock:
+            hit = self._data.get(key)
+            if hit is not None and now - hit[0] < self.ttl:
+                return hit[1]
+        value = compute()  # exceptions are not cached
+        with self._lock:
+            self._data[key] = (time.monotonic(), value)
+            if len(self._data) > self.maxsize:
+                oldest = min(self._data, key=lambda k: self._data[k][0])
+                del self._data[oldest]
+        return value
+
+    def invalidate(self, key: Hashable = None) -> None:
+        with self._lock:
+            if key is None:
+                self._data.clear()
+            else:
+                self._data.pop(key, None)
@@ -0,0 +1,137 @@
+"""
+Ticker -> byte-offset index over data/custom_news.jsonl.
+- Sidecar file (custom_news.jsonl.idx) holds one "TICKER offset length" line per news line,
+  so a restart only indexes what was appended since
+- Appended lines are indexed incrementally (tail read from the last indexed offset);
+  a truncated/replaced file triggers a full rebuild
+- latest(ticker, n) seeks straight to the ticker's newest n lines; nothing else is parsed
+"""
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+import json
+import os
+import threading
+
+NO_TICKER = "-"  # lines without a ticker (or unparsable) still advance the indexed offset
+
+
+class CustomNewsIndex:
+    def __init__(self, path: Path, index_path: Optional[Path] = None):
+        self.path = Path(path)
+        self.index_path = Path(index_path) if index_path else self.path.with_name(self.path.name + ".idx")
+        self._lock = threading.Lock()
+        self._offsets: Dict[str, List[Tuple[int, int]]] = {}
+        self._end = 0  # bytes of the news file covered by the index
+        self._last: Optional[Tuple[str, int, int]] = None
+        self._loaded = False
+
+    # ---------------- index maintenance ----------------
+
+    def _load_sidecar(self) -> None:
+        self._offsets, self._end, self._last = {}, 0, None
+        if not self.index_path.exists():
+            return
+        valid = 0  # sidecar bytes holding complete, contiguous records
+        with self.index_path.open("rb") as f:
+            for line in f:
+                parts = line.split()
+                if (
+                    not line.endswith(b"\n")
+                    or len(parts) != 3
+                    or not (parts[1].isdigit() and parts[2].isdigit())
+                    or int(parts[1]) != self._end
+                ):
+                    break  # torn/stray tail: re-indexed from the news file
+                self._record(parts[0].decode(), int(parts[1]), int(parts[2]))
+                valid += len(line)
+        if not self._sidecar_matches():
+            self._reset()
+        elif valid != self.index_path.stat().st_size:
+            os.truncate(self.index_path, valid)
+
+    def _reset(self) -> None:
+        self._offsets, self._end, self._last = {}, 0, None
+        self.index_path.unlink(missing_ok=True)
+
+    def _record(self, ticker: str, offset: int, length: int) -> None:
+        if ticker != NO_TICKER:
+            self._offsets.setdefault(ticker, []).append((offset, length))
+        self._end = offset + length
+        self._last = (ticker, offset, length)
+
+    def _sidecar_matches(self) -> bool:
+        """The last indexed line must still be in the news file where the sidecar says it is."""
+        if self._last is None:
+            return True
+        ticker, offset, length = self._last
+        try:
+            if self.path.stat().st_size < self._end:
+                return False
+            with self.path.open("rb") as f:
+                f.seek(offset)
+                raw = f.read(length)
+        except FileNotFoundError:
+            return False
+        return raw.endswith(b"\n") and _ticker_of(raw) == ticker
+
+    def _refresh(self) -> None:
+        if not self._loaded:
+            self._load_sidecar()
+            self._loaded = True
+        try:
+            size = self.path.stat().st_size
+        except FileNotFoundError:
+            size = 0
+        if size < self._end or (size > self._end and not self._sidecar_matches()):
+            self._reset()  # news file truncated or replaced: rebuild from scratch
+        if size == self._end:
+            return
+        with self.path.open("rb") as f:
+            f.seek(self._end)
+            data = f.read(size - self._end)
+        records = []
+        offset = self._end
+        for raw in data.splitlines(keepends=True):
+            if not raw.endswith(b"\n"):
+                break  # half-written last line: indexed once it is complete
+            ticker = _ticker_of(raw)
+            records.append(f"{ticker} {offset} {len(raw)}\n")
+            self._record(ticker, offset, len(raw))
+            offset += len(raw)
+        if records:
+            self.index_path.parent.mkdir(parents=True, exist_ok=True)
+            with self.index_path.open("a", encoding="utf-8") as f:
+                f.write("".join(records))
+
+    # ---------------- lookups ----------------
+
+    def latest(self, ticker: str, limit: int = 5) -> List[Dict]:
+        """Newest `limit` items for ticker, newest first."""
+        with self._lock:
+            self._refresh()
+            spans = self._offsets.get(ticker.upper(), [])[-limit:] if limit > 0 else []
+        out = []
+        if not spans:
+            return out
+        with self.path.open("rb") as f:
+            for offset, length in reversed(spans):
+                f.seek(offset)
+                try:
+                    out.append(json.loads(f.read(length)))
+                except Exception:
+                    continue
+        return out
+
+    def count(self, ticker: str) -> int:
+        with self._lock:
+            self._refresh()
+            return len(self._offsets.get(ticker.upper(), []))
+
+
+def _ticker_of(raw: bytes) -> str:
+    try:
+        ticker = str(json.loads(raw).get("ticker") or "").upper()
+    except Exception:
+        return NO_TICKER
+    return ticker if ticker and ticker.isprintable() and " " not in ticker else NO_TICKER
+
@@ -1,10 +1,28 @@
 """
 File-based IN/OUT store helpers for news, briefs, and debates.
 All content lives in local folders (JSONL/Markdown). No external DB.
+
+Listing is served from a per-folder in-memory index (name, size, mtime, lazy content hash):
+- the folder is re-listed only when its directory mtime changes (file added/removed/renamed)
+- in-place edits are picked up by a rolling stat sweep (a slice of files per refresh)
+- list_md(offset, limit) pages through the sorted names, so huge folders stay cheap
+
+Batch moves (move_many) are journaled: the planned renames are fsynced to
+data/.inout_journal.json first, so a crash mid-batch is rolled forward on the next call.
+Recovery and the whole batch run under an flock on data/.inout_journal.json.lock, so batches
+from several processes (app sessions, pipeline_batch.py) never share the journal.
 """
+from collections import OrderedDict
+from contextlib import contextmanager
+from hashlib import sha1
 from pathlib import Path
-from typing import List, Dict
+from typing import Iterable, List, Dict, Optional
+import errno
+import fcntl
+import json
+import os
 import shutil
+import threading
 import time
 
 # Base folders
@@ -15,6 +33,12 @@ BRIEFS_OUT = Path("data/briefs_out")
 DEBATES_IN = Path("data/debates_in")
 DEBATES_OUT = Path("data/debates_out")
 
+JOURNAL_PATH = Path("data/.inout_journal.json")
+SWEEP_BATCH = 256  # files re-stat()ed per refresh to catch in-place edits
+RACY_WINDOW = 2.0  # a directory changed this recently is re-listed anyway (coarse mtime clocks)
+PAGE_SIZE = 200
+READ_CACHE_SIZE = 64
+
 ALL_FOLDERS = [
     NEWS_IN,
     NEWS_OUT,
@@ -31,31 +55,150 @@ def ensure_dirs():
         folder.mkdir(parents=True, exist_ok=True)
 
 
-def list_md(folder: Path) -> List[Dict]:
-    """List markdown files with basic metadata."""
-    if not folder.exists():
-        return []
-    items = []
-    for path in sorted(folder.glob("*.md")):
+class FolderIndex:
+    """In-memory index of one folder's *.md files, refreshed incrementally."""
+
+    def __init__(self, folder: Path):
+        self.folder = Path(folder)
+        self._lock = threading.Lock()
+        self._entries: Dict[str, Dict] = {}
+        self._names: List[str] = []
+        self._dir_mtime = None
+        self._sweep_pos = 0
+
+    def refresh(self) -> None:
+        with self._lock:
+            try:
+                st = os.stat(self.folder)
+            except FileNotFoundError:
+                self._entries, self._names, self._dir_mtime = {}, [], None
+                return
+            now = time.time()
+            if st.st_mtime_ns != self._dir_mtime or now - st.st_mtime < RACY_WINDOW:
+                self._dir_mtime = st.st_mtime_ns
+                self._scan()
+            else:
+                self._sweep()
+
+    def _scan(self) -> None:
+        """Re-list names; only new files are stat()ed."""
+        names = set()
+        with os.scandir(self.folder) as it:
+            for entry in it:
+                if entry.name.endswith(".md") and entry.is_file():
+                    names.add(entry.name)
+        for name in self._entries.keys() - names:
+            del self._entries[name]
+        for name in names - self._entries.keys():
+            self._stat(name)
+        self._names = sorted(self._entries)
+
+    def _sweep(self) -> None:
+        """Re-stat the next SWEEP_BATCH files (wrapping around), so each refresh stays cheap."""
+        if not self._names:
+            return
+        start = self._sweep_pos % len(self._names)
+        batch = self._names[start:start + SWEEP_BATCH]
+        self._sweep_pos = start + len(batch)
+        if any(self._stat(name) is None for name in batch):
+            self._names = sorted(self._entries)
+
+    def _stat(self, name: str) -> Optional[Dict]:
+        path = self.folder / name
         try:
-            items.append(
-                {
-                    "name": path.name,
-                    "path": path,
-                    "mtime": path.stat().st_mtime,
-                }
-            )
-        except Exception:
-            continue
-    return items
+            st = path.stat()
+        except FileNotFoundError:
+            self._entries.pop(name, None)
+            return None
+        old = self._entries.get(name)
+        if old is not None and old["mtime_ns"] == st.st_mtime_ns and old["size"] == st.st_size:
+            return old
+        entry = {"name": name, "path": path, "mtime": st.st_mtime, "mtime_ns": st.st_mtime_ns, "size": st.st_size, "hash": None}
+        self._entries[name] = entry
+        return entry
+
+    def page(self, offset: int = 0, limit: Optional[int] = None) -> List[Dict]:
+        self.refresh()
+        with self._lock:
+            names = self._names[offset:] if limit is None else self._names[offset:offset + limit]
+            return [dict(self._entries[n]) for n in names]
+
+    def __len__(self) -> int:
+        self.refresh()
+        with self._lock:
+            return len(self._names)
+
+    def entry(self, name: str) -> Optional[Dict]:
+        """Fresh metadata for one file (re-stat()ed, so in-place edits show up at once)."""
+        with self._lock:
+            if name not in self._entries and not (self.folder / name).exists():
+                return None
+            entry = self._stat(name)
+            if len(self._names) != len(self._entries):
+                self._names = sorted(self._entries)
+            return dict(entry) if entry else None
+
+    def content_hash(self, name: str) -> Optional[str]:
+        """sha1 of the file content, computed once per (mtime, size)."""
+        with self._lock:
+            entry = self._stat(name)
+            if entry is None:
+                return None
+            if entry["hash"] is None:
+                entry["hash"] = sha1(entry["path"].read_bytes()).hexdigest()
+            return entry["hash"]
+
+    def forget(self, name: str) -> None:
+        with self._lock:
+            if self._entries.pop(name, None) is not None:
+                self._names = sorted(self._entries)
+
+
+_indexes: Dict[str, FolderIndex] = {}
+_indexes_lock = threading.Lock()
+_read_cache: "OrderedDict[tuple, str]" = OrderedDict()
+_read_lock = threading.Lock()
+
+
+def folder_index(folder: Path) -> FolderIndex:
+    key = str(Path(folder).resolve())
+    with _indexes_lock:
+        if key not in _indexes:
+            _indexes[key] = FolderIndex(folder)
+        return _indexes[key]
+
+
+def list_md(folder: Path, offset: int = 0, limit: Optional[int] = None) -> List[Dict]:
+    """List markdown files (sorted by name) with basic metadata; offset/limit select a page."""
+    return folder_index(folder).page(offset, limit)
+
+
+def count_md(folder: Path) -> int:
+    return len(folder_index(folder))
+
+
+def md_hash(path: Path) -> Optional[str]:
+    """Content hash of a markdown file (cached until it changes)."""
+    return folder_index(path.parent).content_hash(path.name)
 
 
 def read_md(path: Path) -> str:
-    """Read markdown content; empty string if missing/error."""
+    """Read markdown content; empty string if missing/error. Unchanged files are served from memory."""
     try:
-        return path.read_text(encoding="utf-8")
+        st = path.stat()
+        key = (str(path), st.st_mtime_ns, st.st_size)
+        with _read_lock:
+            if key in _read_cache:
+                _read_cache.move_to_end(key)
+                return _read_cache[key]
+        content = path.read_text(encoding="utf-8")
     except Exception:
         return ""
+    with _read_lock:
+        _read_cache[key] = content
+        while len(_read_cache) > READ_CACHE_SIZE:
+            _read_cache.popitem(last=False)
+    return content
 
 
 def write_md(folder: Path, filename: str, content: str) -> Path:
@@ -63,6 +206,7 @@ def write_md(folder: Path, filename: str, content: str) -> Path:
     folder.mkdir(parents=True, exist_ok=True)
     target = folder / filename
     target.write_text(content, encoding="utf-8")
+    folder_index(folder).entry(filename)
     return target
 
 
@@ -71,8 +215,105 @@ def move_md(src: Path, dst_folder: Path) -> Path:
     dst_folder.mkdir(parents=True, exist_ok=True)
     target = dst_folder / src.name
     shutil.move(str(src), str(target))
+    folder_index(src.parent).forget(src.name)
+    folder_index(dst_folder).entry(src.name)
     return target
 
 
+def _fsync_dir(folder: Path) -> None:
+    fd = os.open(folder, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def _rename(src: Path, dst: Path) -> None:
+    try:
+        os.replace(src, dst)  # atomic within one filesystem
+    except OSError as e:
+        if e.errno != errno.EXDEV:
+            raise
+        shutil.move(str(src), str(dst))  # across filesystems: copy + delete
+
+
+@contextmanager
+def _journal_lock(journal: Path):
+    """Cross-process (and cross-thread: one open file per holder) lock on the batch journal."""
+    journal.parent.mkdir(parents=True, exist_ok=True)
+    with journal.with_name(journal.name + ".lock").open("a") as f:
+        fcntl.flock(f, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(f, fcntl.LOCK_UN)
+
+
+def recover_moves(journal: Path = JOURNAL_PATH) -> int:
+    """Finish a batch interrupted by a crash (renames whose source still exists); returns how many."""
+    with _journal_lock(journal):
+        return _recover_moves(journal)
+
+
+def _recover_moves(journal: Path) -> int:
+    """recover_moves body; hold the journal lock."""
+    try:
+        moves = json.loads(journal.read_text(encoding="utf-8"))["moves"]
+    except FileNotFoundError:
+        return 0
+    except Exception:
+        moves = []  # torn journal: written before the first rename, so nothing moved yet
+    done = 0
+    for src, dst in moves:
+        src, dst = Path(src), Path(dst)
+        if src.exists():
+            dst.parent.mkdir(parents=True, exist_ok=True)
+            _rename(src, dst)
+            folder_index(src.parent).forget(src.name)
+            folder_index(dst.parent).entry(dst.name)
+            done += 1
+    journal.unlink(missing_ok=True)
+    return done
+
+
+def move_many(srcs: Iterable[Path], dst_folder: Path, journal: Path = JOURNAL_PATH) -> List[Path]:
+    """
+    Move many markdown files into dst_folder (overwrite-safe) as one journaled batch:
+    journal (fsync) -> rename each -> fsync directories -> drop journal, all under the journal lock.
+    """
+    moves = [(Path(src), dst_folder / Path(src).name) for src in srcs]
+    with _journal_lock(journal):
+        _recover_moves(journal)
+        if not moves:
+            return []
+        dst_folder.mkdir(parents=True, exist_ok=True)
+        tmp = journal.with_name(journal.name + ".tmp")
+        with tmp.open("w", encoding="utf-8") as f:
+            json.dump({"moves": [[str(a), str(b)] for a, b in moves]}, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, journal)
+        _fsync_dir(journal.parent)
+
+        for src, dst in moves:
+            try:
+                _rename(src, dst)
+            except FileNotFoundError:
+                continue  # moved/deleted by someone else meanwhile
+        for folder in {dst_folder} | {src.parent for src, _ in moves}:
+            _fsync_dir(folder)
+        journal.unlink(missing_ok=True)
+
+    for src, dst in moves:
+        folder_index(src.parent).forget(src.name)
+        folder_index(dst_folder).entry(dst.name)
+    return [dst for _, dst in moves]
+
+
+def move_all(src_folder: Path, dst_folder: Path) -> List[Path]:
+    """Move every markdown file in src_folder to dst_folder in one journaled batch."""
+    return move_many([f["path"] for f in list_md(src_folder)], dst_folder)
+
+
 # Ensure folders exist on import
 ensure_dirs()
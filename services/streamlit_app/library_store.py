@@ -0,0 +1,255 @@
+"""
+Brief library store: metadata in SQLite, embeddings in an append-only float32 matrix.
+- data/library/library.db       one row per brief, indexed on ticker, winner and timestamp
+- data/library/embeddings.f32   row-major float32 [n, EMBED_DIM]; briefs.row points into it
+- data/library/embeddings.lock  flock held while appending vectors + inserting their rows, so
+  several processes (app, pipeline_batch.py) can write one library; rows come from the file size
+Listing ("last N winners", "last 20") only touches SQLite and never reads embeddings.
+"""
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+import fcntl
+import json
+import os
+import sqlite3
+import threading
+import uuid
+
+import numpy as np
+
+LIBRARY_DIR = Path(os.getenv("EVITO_LIBRARY_DIR", "data/library"))
+EMBED_DIM = 384
+
+# Known columns; anything else in an entry is kept in the `extra` JSON blob
+COLUMNS = ["id", "ticker", "days", "model", "persona", "timestamp", "text", "prompt_version", "winner", "audited"]
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS briefs (
+    id TEXT PRIMARY KEY,
+    ticker TEXT,
+    days INTEGER,
+    model TEXT,
+    persona TEXT,
+    timestamp REAL,
+    text TEXT,
+    prompt_version TEXT,
+    winner INTEGER NOT NULL DEFAULT 0,
+    audited INTEGER NOT NULL DEFAULT 0,
+    headlines TEXT,
+    extra TEXT,
+    row INTEGER
+);
+CREATE INDEX IF NOT EXISTS idx_briefs_ticker ON briefs (ticker, timestamp);
+CREATE INDEX IF NOT EXISTS idx_briefs_winner ON briefs (winner, timestamp);
+CREATE INDEX IF NOT EXISTS idx_briefs_timestamp ON briefs (timestamp);
+CREATE INDEX IF NOT EXISTS idx_briefs_row ON briefs (row);
+"""
+
+
+def iter_jsonl_chunks(path: Path, chunk_size: int = 500):
+    """Yield lists of parsed entries from a JSONL file without loading it whole."""
+    chunk = []
+    with Path(path).open("r", encoding="utf-8") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            try:
+                chunk.append(json.loads(line))
+            except Exception:
+                continue
+            if len(chunk) >= chunk_size:
+                yield chunk
+                chunk = []
+    if chunk:
+        yield chunk
+
+
+class LibraryStore:
+    def __init__(self, root: Path = LIBRARY_DIR, dim: int = EMBED_DIM):
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.dim = dim
+        self.stride = dim * 4
+        self.matrix_path = self.root / "embeddings.f32"
+        self.lock_path = self.root / "embeddings.lock"
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(self.root / "library.db", check_same_thread=False)
+        self._db.row_factory = sqlite3.Row
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.executescript(SCHEMA)
+        self.matrix_path.touch()
+
+    def describe(self) -> str:
+        """Where the briefs live, for log lines."""
+        return str(self.root)
+
+    @contextmanager
+    def _file_lock(self, exclusive: bool = True):
+        """Cross-process lock on the matrix: exclusive for appends, shared to read a consistent size."""
+        with self.lock_path.open("a") as f:
+            fcntl.flock(f, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+            try:
+                yield
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+    def _matrix_rows(self) -> int:
+        """Drop a torn trailing vector (crash mid-append); return the number of rows. Hold the exclusive lock."""
+        size = self.matrix_path.stat().st_size
+        if size % self.stride:
+            with self.matrix_path.open("r+b") as f:
+                f.truncate(size - size % self.stride)
+        return size // self.stride
+
+    # ---------------- writes ----------------
+
+    def upsert(self, entry: Dict) -> None:
+        self.upsert_many([entry])
+
+    def upsert_many(self, entries: Iterable[Dict]) -> int:
+        """
+        Append embeddings, then insert/replace metadata rows in one transaction. Both happen
+        under the file lock, with row numbers taken from the matrix size, so concurrent writers
+        in other processes never hand out the same row; a failed insert truncates the vectors again.
+        """
+        entries = list(entries)
+        if not entries:
+            return 0
+        with self._lock, self._file_lock():
+            base = self._matrix_rows()
+            vectors = []
+            records = []
+            for entry in entries:
+                vec = entry.get("embedding")
+                row = None
+                if vec is not None:
+                    row = base + len(vectors)
+                    vectors.append(np.asarray(vec, dtype=np.float32).reshape(self.dim))
+                records.append(self._record(entry, row))
+            if vectors:
+                with self.matrix_path.open("ab") as f:
+                    f.write(np.stack(vectors).tobytes())
+                    f.flush()
+                    os.fsync(f.fileno())
+            try:
+                with self._db:
+                    self._db.executemany(
+                        f"INSERT OR REPLACE INTO briefs ({', '.join(COLUMNS)}, headlines, extra, row) "
+                        f"VALUES ({', '.join('?' * (len(COLUMNS) + 3))})",
+                        records,
+                    )
+            except Exception:
+                if vectors:
+                    with self.matrix_path.open("r+b") as f:
+                        f.truncate(base * self.stride)
+                raise
+        return len(entries)
+
+    def _record(self, entry: Dict, row: Optional[int]):
+        extra = {k: v for k, v in entry.items() if k not in COLUMNS and k not in ("headlines", "embedding")}
+        values = [entry.get(c) for c in COLUMNS]
+        values[0] = values[0] or str(uuid.uuid4())
+        values[COLUMNS.index("winner")] = int(bool(entry.get("winner")))
+        values[COLUMNS.index("audited")] = int(bool(entry.get("audited")))
+        return values + [json.dumps(entry.get("headlines") or []), json.dumps(extra) if extra else None, row]
+
+    # ---------------- reads ----------------
+
+    def _to_entry(self, r: sqlite3.Row) -> Dict:
+        entry = {c: r[c] for c in COLUMNS}
+        entry["winner"] = bool(entry["winner"])
+        entry["audited"] = bool(entry["audited"])
+        entry["headlines"] = json.loads(r["headlines"] or "[]")
+        if r["extra"]:
+            entry.update(json.loads(r["extra"]))
+        return entry
+
+    def latest(self, limit: int = 20, winners_only: bool = False, ticker: Optional[str] = None) -> List[Dict]:
+        """Newest first, metadata only."""
+        where, args = [], []
+        if winners_only:
+            where.append("winner = 1")
+        if ticker:
+            where.append("ticker = ?")
+            args.append(ticker.upper())
+        sql = "SELECT * FROM briefs"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += " ORDER BY timestamp DESC LIMIT ?"
+        with self._lock:
+            rows = self._db.execute(sql, args + [limit]).fetchall()
+        return [self._to_entry(r) for r in rows]
+
+    def get(self, brief_id: str) -> Optional[Dict]:
+        with self._lock:
+            r = self._db.execute("SELECT * FROM briefs WHERE id = ?", (brief_id,)).fetchone()
+        return self._to_entry(r) if r else None
+
+    def get_many(self, ids: List[str]) -> List[Dict]:
+        """Entries for ids, in the order given (missing ids are skipped)."""
+        if not ids:
+            return []
+        with self._lock:
+            rows = self._db.execute(
+                f"SELECT * FROM briefs WHERE id IN ({', '.join('?' * len(ids))})", list(ids)
+            ).fetchall()
+        by_id = {r["id"]: self._to_entry(r) for r in rows}
+        return [by_id[i] for i in ids if i in by_id]
+
+    def rows_since(self, start: int) -> List[tuple]:
+        """(row, id) for every live embedding row >= start, in row order."""
+        with self._lock:
+            return [
+                tuple(r)
+                for r in self._db.execute(
+                    "SELECT row, id FROM briefs WHERE row >= ? ORDER BY row", (start,)
+                ).fetchall()
+            ]
+
+    @property
+    def rows(self) -> int:
+        """
+        Number of vectors in the matrix (including superseded ones), read from the file so
+        appends by other processes count; every row below it has its metadata committed.
+        """
+        with self._file_lock(exclusive=False):
+            return self.matrix_path.stat().st_size // self.stride
+
+    def count(self) -> int:
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM briefs").fetchone()[0]
+
+    def embeddings(self) -> np.ndarray:
+        """Read-only memory map of every stored vector, shape [rows, dim]."""
+        rows = self.rows
+        if rows == 0:
+            return np.zeros((0, self.dim), dtype=np.float32)
+        return np.memmap(self.matrix_path, dtype=np.float32, mode="r", shape=(rows, self.dim))
+
+    # ---------------- migration ----------------
+
+    def iter_entries(self, chunk_size: int = 500):
+        """Yield lists of full entries (embedding included), oldest first."""
+        matrix = self.embeddings()
+        with self._lock:
+            cur = self._db.execute("SELECT * FROM briefs ORDER BY timestamp")
+        while True:
+            with self._lock:
+                rows = cur.fetchmany(chunk_size)
+            if not rows:
+                return
+            chunk = []
+            for r in rows:
+                entry = self._to_entry(r)
+                if r["row"] is not None and r["row"] < len(matrix):
+                    entry["embedding"] = matrix[r["row"]].tolist()
+                chunk.append(entry)
+            yield chunk
+
+    def import_jsonl(self, path: Path, chunk_size: int = 500) -> int:
+        """Stream a legacy library.jsonl (entries with inline embeddings) into the store."""
+        path = Path(path)
+        if not path.exists():
+            return 0
+        return sum(self.upsert_many(chunk) for chunk in iter_jsonl_chunks(path, chunk_size))
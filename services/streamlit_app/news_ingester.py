@@ -0,0 +1,187 @@
+"""
+Background RSS ingester for the Streamlit app.
+- One daemon thread polls every source in data/news_sources.jsonl once per interval
+- Conditional GET (ETag / Last-Modified): unchanged feeds cost a 304 and no parsing
+- Entries de-duplicated by link hash; bounded headline store (oldest evicted)
+- Inverted index ticker -> newest headlines, so per-ticker lookups never touch the network
+- Tickers are tagged once per headline at ingest (pluggable tagger, e.g. ticker_matcher.TickerMatcher)
+"""
+from collections import OrderedDict, deque
+from hashlib import sha1
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Set
+import json
+import os
+import re
+import threading
+
+import requests
+
+NEWS_POLL_INTERVAL = float(os.getenv("EVITO_NEWS_POLL_INTERVAL", "300"))
+MAX_HEADLINES = 5000
+MAX_PER_TICKER = 50
+
+_TOKEN = re.compile(r"[A-Z0-9]+")
+
+
+def tag_tokens(text: str) -> Set[str]:
+    """Default tagger: every upper-cased whole word (same hits as the old substring filter, minus partial words)."""
+    return set(_TOKEN.findall(text.upper()))
+
+
+def link_hash(link: str, title: str = "") -> str:
+    return sha1((link or title).encode("utf-8")).hexdigest()[:16]
+
+
+def _read_sources(path: Path) -> List[Dict]:
+    if not path.exists():
+        return []
+    sources = []
+    for line in path.read_text().splitlines():
+        try:
+            obj = json.loads(line)
+        except Exception:
+            continue
+        if obj.get("url"):
+            sources.append(obj)
+    return sources
+
+
+class NewsIngester:
+    def __init__(
+        self,
+        sources_path: Path,
+        interval: float = NEWS_POLL_INTERVAL,
+        tagger: Callable[[str], Iterable[str]] = tag_tokens,
+        session: Optional[requests.Session] = None,
+    ):
+        self.sources_path = Path(sources_path)
+        self.interval = interval
+        self.tagger = tagger
+        self.session = session or requests.Session()
+        self.ready = threading.Event()  # set after the first full pass
+        self._wake = threading.Event()
+        self._lock = threading.Lock()
+        self._headlines: "OrderedDict[str, Dict]" = OrderedDict()  # link hash -> headline
+        self._by_ticker: Dict[str, deque] = {}
+        self._validators: Dict[str, Dict[str, str]] = {}  # url -> conditional GET headers
+        self._thread = None
+
+    # ---------------- lifecycle ----------------
+
+    def start(self) -> "NewsIngester":
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="news-ingester", daemon=True)
+            self._thread.start()
+        return self
+
+    def poll_now(self) -> None:
+        """Wake the poller (e.g. after a source was added)."""
+        self._wake.set()
+
+    def set_tagger(self, tagger: Callable[[str], Iterable[str]]) -> None:
+        """Swap the tagger (e.g. the ticker universe changed) and re-tag the stored headlines."""
+        if tagger is self.tagger:
+            return
+        self.tagger = tagger
+        with self._lock:
+            self._by_ticker = {}
+            for h in self._headlines.values():  # oldest first, so the newest ends up in front
+                h["tickers"] = sorted(set(tagger(f"{h['title']} {h['summary']}")))
+                for ticker in h["tickers"]:
+                    self._by_ticker.setdefault(ticker, deque(maxlen=MAX_PER_TICKER)).appendleft(h["id"])
+
+    def _run(self) -> None:
+        while True:
+            self.poll_once()
+            self.ready.set()
+            self._wake.wait(self.interval)
+            self._wake.clear()
+
+    # ---------------- polling ----------------
+
+    def poll_once(self) -> int:
+        """Poll every source once; returns the number of new headlines."""
+        added = 0
+        for src in _read_sources(self.sources_path):
+            try:
+                added += self._poll_source(src)
+            except Exception as e:
+                print(f"RSS source {src.get('name', 'rss')} failed: {e}")
+        return added
+
+    def _poll_source(self, src: Dict) -> int:
+        import feedparser  # Optional dep
+
+        url = src["url"]
+        resp = self.session.get(url, headers=self._validators.get(url, {}), timeout=10)
+        if resp.status_code == 304:
+            return 0
+        resp.raise_for_status()
+        validators = {}
+        if resp.headers.get("ETag"):
+            validators["If-None-Match"] = resp.headers["ETag"]
+        if resp.headers.get("Last-Modified"):
+            validators["If-Modified-Since"] = resp.headers["Last-Modified"]
+        self._validators[url] = validators
+
+        feed = feedparser.parse(resp.content)
+        name = src.get("name", "rss")
+        new = []
+        for entry in feed.entries:
+            title = getattr(entry, "title", "")
+            link = getattr(entry, "link", "")
+            key = link_hash(link, title)
+            if key in self._headlines:
+                continue
+            summary = getattr(entry, "summary", "")
+            new.append(
+                {
+                    "id": key,
+                    "title": title,
+                    "link": link,
+                    "source": name,
+                    "summary": summary,
+                    "tickers": sorted(set(self.tagger(f"{title} {summary}"))),
+                }
+            )
+        self._add(new)
+        return len(new)
+
+    def _add(self, headlines: List[Dict]) -> None:
+        with self._lock:
+            # Feeds list newest first: insert oldest first so the newest ends up in front
+            for h in reversed(headlines):
+                if h["id"] in self._headlines:
+                    continue
+                self._headlines[h["id"]] = h
+                for ticker in h["tickers"]:
+                    self._by_ticker.setdefault(ticker, deque(maxlen=MAX_PER_TICKER)).appendleft(h["id"])
+            while len(self._headlines) > MAX_HEADLINES:
+                _, old = self._headlines.popitem(last=False)
+                for ticker in old["tickers"]:
+                    refs = self._by_ticker.get(ticker)
+                    if refs is not None and old["id"] in refs:
+                        refs.remove(old["id"])
+                        if not refs:
+                            del self._by_ticker[ticker]
+
+    # ---------------- lookups ----------------
+
+    def headlines_for(self, ticker: str, limit: int = 5, sources: Optional[Iterable[str]] = None) -> List[Dict]:
+        """Newest headlines tagged with ticker, optionally only from the named sources."""
+        allowed = set(sources) if sources is not None else None
+        out = []
+        with self._lock:
+            for key in self._by_ticker.get(ticker.upper(), ()):
+                h = self._headlines.get(key)
+                if h is None or (allowed is not None and h["source"] not in allowed):
+                    continue
+                out.append(h)
+                if len(out) >= limit:
+                    break
+        return out
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._headlines)
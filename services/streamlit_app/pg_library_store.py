@@ -0,0 +1,193 @@
+"""
+Brief library on Postgres + pgvector (briefs table, see services/shared/init.sql).
+Same interface as library_store.LibraryStore, plus search()/find_duplicate() done in SQL
+(HNSW index, cosine distance). Pooled connections; upserts are batched per transaction.
+"""
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+import json
+import os
+import uuid
+
+from psycopg2.extensions import parse_dsn
+from psycopg2.extras import RealDictCursor, execute_values
+from psycopg2.pool import ThreadedConnectionPool
+
+from library_store import COLUMNS, EMBED_DIM, iter_jsonl_chunks
+from similarity_index import DUPLICATE_THRESHOLD
+
+LIBRARY_DSN = os.getenv("EVITO_LIBRARY_DSN")
+POOL_MAX = int(os.getenv("EVITO_PG_POOL_MAX", "5"))
+BATCH_SIZE = 500
+
+# Mirrors services/shared/init.sql (init.sql only runs on a fresh volume)
+SCHEMA = f"""
+CREATE EXTENSION IF NOT EXISTS vector;
+CREATE TABLE IF NOT EXISTS briefs (
+    id TEXT PRIMARY KEY,
+    ticker VARCHAR(16),
+    days INTEGER,
+    model TEXT,
+    persona TEXT,
+    timestamp DOUBLE PRECISION,
+    text TEXT,
+    prompt_version TEXT,
+    winner BOOLEAN NOT NULL DEFAULT FALSE,
+    audited BOOLEAN NOT NULL DEFAULT FALSE,
+    headlines JSONB,
+    extra JSONB,
+    embedding VECTOR({EMBED_DIM})
+);
+CREATE INDEX IF NOT EXISTS idx_briefs_embedding ON briefs USING hnsw (embedding vector_cosine_ops);
+CREATE INDEX IF NOT EXISTS idx_briefs_ticker ON briefs (ticker, timestamp DESC);
+CREATE INDEX IF NOT EXISTS idx_briefs_winner ON briefs (timestamp DESC) WHERE winner;
+CREATE INDEX IF NOT EXISTS idx_briefs_timestamp ON briefs (timestamp DESC);
+"""
+
+META_COLUMNS = COLUMNS + ["headlines", "extra"]
+SELECT_META = ", ".join(META_COLUMNS)
+
+
+def _vector(vec) -> Optional[str]:
+    # pgvector text literal, same format as api_server.store_context
+    if vec is None:
+        return None
+    return "[" + ",".join(map(str, vec)) + "]"
+
+
+class PgLibraryStore:
+    mode = "pgvector hnsw"
+
+    def __init__(self, dsn: str = LIBRARY_DSN, pool_max: int = POOL_MAX):
+        self.dsn = dsn
+        self._pool = ThreadedConnectionPool(1, pool_max, dsn)
+        with self._conn() as conn, conn.cursor() as cur:
+            cur.execute(SCHEMA)
+
+    def describe(self) -> str:
+        """Where the briefs live, for log lines (no credentials)."""
+        params = parse_dsn(self.dsn)
+        return f"postgres {params.get('host', 'localhost')}/{params.get('dbname', '')}"
+
+    @contextmanager
+    def _conn(self):
+        conn = self._pool.getconn()
+        try:
+            yield conn
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            self._pool.putconn(conn)
+
+    # ---------------- writes ----------------
+
+    def upsert(self, entry: Dict) -> None:
+        self.upsert_many([entry])
+
+    def upsert_many(self, entries: Iterable[Dict], batch_size: int = BATCH_SIZE) -> int:
+        """INSERT ... ON CONFLICT (id) DO UPDATE, batch_size rows per statement, one transaction."""
+        # ON CONFLICT cannot touch a row twice in one statement: the last entry per id wins
+        records = list({r[0]: r for r in map(self._record, entries)}.values())
+        if not records:
+            return 0
+        cols = META_COLUMNS + ["embedding"]
+        updates = ", ".join(f"{c} = EXCLUDED.{c}" for c in cols if c != "id")
+        with self._conn() as conn, conn.cursor() as cur:
+            execute_values(
+                cur,
+                f"INSERT INTO briefs ({', '.join(cols)}) VALUES %s ON CONFLICT (id) DO UPDATE SET {updates}",
+                records,
+                template="(" + ", ".join(["%s"] * (len(cols) - 1)) + ", %s::vector)",
+                page_size=batch_size,
+            )
+        return len(records)
+
+    def _record(self, entry: Dict):
+        extra = {k: v for k, v in entry.items() if k not in COLUMNS and k not in ("headlines", "embedding")}
+        values = [entry.get(c) for c in COLUMNS]
+        values[0] = values[0] or str(uuid.uuid4())
+        values[COLUMNS.index("winner")] = bool(entry.get("winner"))
+        values[COLUMNS.index("audited")] = bool(entry.get("audited"))
+        return values + [
+            json.dumps(entry.get("headlines") or []),
+            json.dumps(extra) if extra else None,
+            _vector(entry.get("embedding")),
+        ]
+
+    # ---------------- reads ----------------
+
+    @staticmethod
+    def _to_entry(r: Dict) -> Dict:
+        entry = {c: r[c] for c in COLUMNS}
+        entry["headlines"] = r["headlines"] or []
+        if r["extra"]:
+            entry.update(r["extra"])
+        return entry
+
+    def _query(self, sql: str, args=()) -> List[Dict]:
+        with self._conn() as conn, conn.cursor(cursor_factory=RealDictCursor) as cur:
+            cur.execute(sql, args)
+            return cur.fetchall()
+
+    def latest(self, limit: int = 20, winners_only: bool = False, ticker: Optional[str] = None) -> List[Dict]:
+        """Newest first, metadata only (embeddings are never selected)."""
+        where, args = [], []
+        if winners_only:
+            where.append("winner")
+        if ticker:
+            where.append("ticker = %s")
+            args.append(ticker.upper())
+        sql = f"SELECT {SELECT_META} FROM briefs"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += " ORDER BY timestamp DESC LIMIT %s"
+        return [self._to_entry(r) for r in self._query(sql, args + [limit])]
+
+    def get(self, brief_id: str) -> Optional[Dict]:
+        rows = self._query(f"SELECT {SELECT_META} FROM briefs WHERE id = %s", (brief_id,))
+        return self._to_entry(rows[0]) if rows else None
+
+    def get_many(self, ids: List[str]) -> List[Dict]:
+        if not ids:
+            return []
+        rows = self._query(f"SELECT {SELECT_META} FROM briefs WHERE id = ANY(%s)", (list(ids),))
+        by_id = {r["id"]: self._to_entry(r) for r in rows}
+        return [by_id[i] for i in ids if i in by_id]
+
+    def count(self) -> int:
+        return self._query("SELECT COUNT(*) AS n FROM briefs")[0]["n"]
+
+    # ---------------- similarity (SimilarityIndex interface) ----------------
+
+    def sync(self) -> None:
+        """No-op: the HNSW index is maintained by Postgres on every upsert."""
+
+    def search(self, query, k: int = 5) -> List[Tuple[str, float]]:
+        rows = self._query(
+            "SELECT id, 1 - (embedding <=> %s::vector) AS score FROM briefs "
+            "WHERE embedding IS NOT NULL ORDER BY embedding <=> %s::vector LIMIT %s",
+            (_vector(query), _vector(query), k),
+        )
+        return [(r["id"], float(r["score"])) for r in rows]
+
+    def find_duplicate(self, query, threshold: float = DUPLICATE_THRESHOLD) -> Optional[Tuple[str, float]]:
+        hits = self.search(query, k=1)
+        if hits and hits[0][1] >= threshold:
+            return hits[0]
+        return None
+
+    # ---------------- migration ----------------
+
+    def import_jsonl(self, path: Path, chunk_size: int = BATCH_SIZE) -> int:
+        """Stream a library.jsonl into the table, one transaction per chunk."""
+        path = Path(path)
+        if not path.exists():
+            return 0
+        total = 0
+        for chunk in iter_jsonl_chunks(path, chunk_size):
+            total += self.upsert_many(chunk)
+            print(f"  migrated {total} briefs...")
+        return total
@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+Nightly IN/OUT pipeline run.
+
+    python pipeline_batch.py            # move every *_in file to *_out, then promote new OUT briefs
+    python pipeline_batch.py --no-move  # promote only
+
+- moves: one journaled batch per folder pair (inout_store.move_all)
+- promotion: briefs_out files whose content hash is not in the library yet, embedded in
+  one batched pass and upserted in one transaction. Library ids are derived from the
+  content hash, so re-running (or promoting the same text from the UI) never duplicates.
+"""
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+import os
+import sys
+import time
+
+from inout_store import (
+    BRIEFS_IN,
+    BRIEFS_OUT,
+    DEBATES_IN,
+    DEBATES_OUT,
+    NEWS_IN,
+    NEWS_OUT,
+    count_md,
+    list_md,
+    md_hash,
+    move_all,
+    read_md,
+    recover_moves,
+)
+
+PIPELINES = [("NEWS", NEWS_IN, NEWS_OUT), ("BRIEFS", BRIEFS_IN, BRIEFS_OUT), ("DEBATES", DEBATES_IN, DEBATES_OUT)]
+EMBED_MODEL = os.getenv("EVITO_EMBED_MODEL", "all-MiniLM-L6-v2")  # must match the app's embedder
+EMBED_BATCH = 64
+LOOKUP_CHUNK = 500
+
+
+def infer_from_filename(filename: str):
+    """
+    Infer ticker/persona from a filename like TSLA_Buffett.md.
+    Returns (ticker, persona).
+    """
+    stem = Path(filename).stem
+    parts = stem.split("_")
+    ticker = parts[0].upper() if parts else "UNK"
+    persona = parts[1] if len(parts) > 1 else "None"
+    return ticker, persona
+
+
+def brief_id(content_hash: str) -> str:
+    return f"md-{content_hash[:24]}"
+
+
+def audited_brief(path: Path, text: Optional[str] = None) -> Dict:
+    """Library entry for a briefs_out file; the id is derived from the content hash."""
+    content_hash = md_hash(path)
+    ticker, persona = infer_from_filename(path.name)
+    return {
+        "id": brief_id(content_hash),
+        "ticker": ticker,
+        "days": 0,
+        "model": "external-llm",
+        "persona": persona,
+        "timestamp": time.time(),
+        "text": read_md(path) if text is None else text,
+        "prompt_version": "persona_md_v1",
+        "headlines": [],
+        "audited": True,
+        "content_hash": content_hash,
+        "source_file": path.name,
+    }
+
+
+def new_briefs(store, folder: Path = BRIEFS_OUT) -> List[Dict]:
+    """Entries (no embeddings yet) for OUT briefs whose content is not in the library."""
+    paths = {}
+    for f in list_md(folder):
+        content_hash = md_hash(f["path"])
+        if content_hash:  # None: file vanished since listing
+            paths.setdefault(brief_id(content_hash), f["path"])  # identical files promote once
+    ids = list(paths)
+    for start in range(0, len(ids), LOOKUP_CHUNK):
+        for existing in store.get_many(ids[start:start + LOOKUP_CHUNK]):
+            paths.pop(existing["id"], None)
+    return [audited_brief(path) for path in paths.values()]
+
+
+def promote_briefs(store, embed: Callable[[List[str]], "object"], entries: List[Dict]) -> int:
+    """Embed entries (one batched pass) and upsert them in one transaction; returns the count."""
+    if not entries:
+        return 0
+    vecs = embed([e["text"] for e in entries])
+    for entry, vec in zip(entries, vecs):
+        entry["embedding"] = [float(x) for x in vec]
+    store.upsert_many(entries)
+    return len(entries)
+
+
+def _open_store():
+    dsn = os.getenv("EVITO_LIBRARY_DSN")
+    if dsn:
+        from pg_library_store import PgLibraryStore  # psycopg2 only needed for the Postgres backend
+
+        return PgLibraryStore(dsn)
+    from library_store import LibraryStore
+
+    return LibraryStore()
+
+
+def _embedder():
+    from sentence_transformers import SentenceTransformer
+
+    model = SentenceTransformer(EMBED_MODEL)
+    return lambda texts: model.encode(texts, batch_size=EMBED_BATCH, normalize_embeddings=True)
+
+
+def main():
+    move = "--no-move" not in sys.argv
+    t0 = time.perf_counter()
+    recovered = recover_moves()
+    if recovered:
+        print(f"↩️  Finished {recovered} moves from an interrupted batch")
+    if move:
+        for label, in_dir, out_dir in PIPELINES:
+            moved = move_all(in_dir, out_dir)
+            print(f"{label}: moved {len(moved)} files {in_dir} -> {out_dir}")
+    store = _open_store()
+    pending = new_briefs(store)
+    print(f"BRIEFS: {len(pending)} new briefs in {BRIEFS_OUT} ({count_md(BRIEFS_OUT) - len(pending)} already promoted or identical)")
+    promoted = promote_briefs(store, _embedder(), pending) if pending else 0
+    print(f"✅ Promoted {promoted} briefs in {time.perf_counter() - t0:.1f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,118 @@
+"""
+Review queue store: append-only JSONL with tombstones and an in-memory id index.
+- enqueue: one appended line, O(1)
+- remove(ids): one appended tombstone line per id ({"_deleted": id}), O(1) each
+- compaction: once tombstones outnumber live entries, live entries are rewritten to a
+  temp file (fsync) and atomically renamed over the queue, so a crash never loses it
+- lines appended by other processes are picked up incrementally (tail read from last offset)
+"""
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+import json
+import os
+import threading
+
+COMPACT_MIN_TOMBSTONES = 100
+
+
+class QueueStore:
+    def __init__(self, path: Path, compact_min: int = COMPACT_MIN_TOMBSTONES):
+        self.path = Path(path)
+        self.compact_min = compact_min
+        self._lock = threading.Lock()
+        self._entries: Dict[str, Dict] = {}  # id -> entry, in enqueue order
+        self._tombstones = 0
+        self._offset = 0
+        self._inode = None
+
+    # ---------------- loading ----------------
+
+    def _refresh(self) -> None:
+        """Replay new lines since the last read (full reload if the file was replaced/truncated)."""
+        try:
+            st = self.path.stat()
+        except FileNotFoundError:
+            self._entries, self._tombstones, self._offset, self._inode = {}, 0, 0, None
+            return
+        if st.st_ino != self._inode or st.st_size < self._offset:
+            self._entries, self._tombstones, self._offset, self._inode = {}, 0, 0, st.st_ino
+        if st.st_size == self._offset:
+            return
+        with self.path.open("rb") as f:
+            f.seek(self._offset)
+            data = f.read()
+        end = data.rfind(b"\n") + 1  # leave a half-written last line for the next refresh
+        for line in data[:end].splitlines():
+            if not line.strip():
+                continue
+            try:
+                obj = json.loads(line)
+            except Exception:
+                continue
+            self._apply(obj)
+        self._offset += end
+
+    def _apply(self, obj: Dict) -> None:
+        if "_deleted" in obj:
+            if self._entries.pop(obj["_deleted"], None) is not None:
+                self._tombstones += 1
+        elif obj.get("id"):
+            self._entries[obj["id"]] = obj
+
+    def _append(self, objs: List[Dict]) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        torn = self.path.exists() and self.path.stat().st_size > self._offset
+        with self.path.open("a", encoding="utf-8") as f:
+            # A torn last line (crash mid-append) is terminated instead of glued to ours
+            f.write(("\n" if torn else "") + "".join(json.dumps(o) + "\n" for o in objs))
+        # Read back from the last offset: also picks up lines other writers appended meanwhile
+        self._refresh()
+
+    # ---------------- public API ----------------
+
+    def enqueue(self, entry: Dict) -> None:
+        with self._lock:
+            self._refresh()
+            self._append([entry])
+
+    def remove(self, ids: Iterable[str]) -> int:
+        """Dequeue entries by id; returns how many were in the queue."""
+        with self._lock:
+            self._refresh()
+            present = [i for i in dict.fromkeys(ids) if i in self._entries]
+            if present:
+                self._append([{"_deleted": i} for i in present])
+                if self._tombstones >= self.compact_min and self._tombstones > len(self._entries):
+                    self._compact()
+            return len(present)
+
+    def entries(self) -> List[Dict]:
+        """Live entries in enqueue order (shared objects: do not mutate)."""
+        with self._lock:
+            self._refresh()
+            return list(self._entries.values())
+
+    def get(self, entry_id: str) -> Optional[Dict]:
+        with self._lock:
+            self._refresh()
+            return self._entries.get(entry_id)
+
+    def __len__(self) -> int:
+        with self._lock:
+            self._refresh()
+            return len(self._entries)
+
+    def compact(self) -> None:
+        with self._lock:
+            self._refresh()
+            self._compact()
+
+    def _compact(self) -> None:
+        tmp = self.path.with_name(self.path.name + ".tmp")
+        with tmp.open("w", encoding="utf-8") as f:
+            f.write("".join(json.dumps(e) + "\n" for e in self._entries.values()))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self.path)
+        st = self.path.stat()
+        self._offset, self._inode, self._tombstones = st.st_size, st.st_ino, 0
@@ -0,0 +1,137 @@
+"""
+Similarity search over the brief library embeddings (cosine on normalized MiniLM vectors).
+- Exact path: NumPy dot product over the memory-mapped float32 matrix, chunked, argpartition top-k
+- ANN path: hnswlib HNSW index, used once the library has ANN_MIN_ROWS vectors (optional dep)
+- Incremental: every search/add first catches up on rows appended to the store since last time;
+  a re-saved brief id supersedes its older row
+"""
+from typing import Dict, List, Optional, Tuple
+import os
+import threading
+
+import numpy as np
+
+ANN_MIN_ROWS = int(os.getenv("EVITO_ANN_MIN_ROWS", "50000"))
+DUPLICATE_THRESHOLD = float(os.getenv("EVITO_DUPLICATE_THRESHOLD", "0.95"))
+CHUNK_ROWS = 65536
+HNSW_M = 16
+HNSW_EF_CONSTRUCTION = 200
+HNSW_EF_SEARCH = 64
+
+
+def top_k(matrix: np.ndarray, query: np.ndarray, k: int, live: Optional[np.ndarray] = None) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Exact inner-product top-k over matrix rows (memmap friendly: CHUNK_ROWS at a time).
+    live: optional bool mask; dead rows never match. Returns (rows, scores), best first.
+    """
+    query = np.asarray(query, dtype=np.float32)
+    best_rows = np.empty(0, dtype=np.int64)
+    best_scores = np.empty(0, dtype=np.float32)
+    for start in range(0, len(matrix), CHUNK_ROWS):
+        scores = np.asarray(matrix[start:start + CHUNK_ROWS]) @ query
+        if live is not None:
+            scores[~live[start:start + len(scores)]] = -np.inf
+        if len(scores) > k:
+            idx = np.argpartition(-scores, k)[:k]
+        else:
+            idx = np.arange(len(scores))
+        best_rows = np.concatenate([best_rows, idx + start])
+        best_scores = np.concatenate([best_scores, scores[idx]])
+        if len(best_rows) > k:
+            keep = np.argpartition(-best_scores, k)[:k]
+            best_rows, best_scores = best_rows[keep], best_scores[keep]
+    order = np.argsort(-best_scores)
+    rows, scores = best_rows[order], best_scores[order]
+    finite = np.isfinite(scores)
+    return rows[finite], scores[finite]
+
+
+def _hnswlib():
+    try:
+        import hnswlib  # Optional dep
+    except ImportError:
+        return None
+    return hnswlib
+
+
+class SimilarityIndex:
+    def __init__(self, store, ann_min_rows: int = ANN_MIN_ROWS):
+        self.store = store
+        self.ann_min_rows = ann_min_rows
+        self._lock = threading.Lock()
+        self._ids: List[Optional[str]] = []  # row -> brief id (None: superseded/no metadata)
+        self._row_of: Dict[str, int] = {}
+        self._ann = None
+
+    # ---------------- incremental maintenance ----------------
+
+    def sync(self) -> None:
+        """Pick up rows appended to the store (by any process) since the last sync; sized from the matrix file."""
+        with self._lock:
+            start = len(self._ids)
+            total = self.store.rows
+            if total <= start:
+                return
+            self._ids.extend([None] * (total - start))
+            new_rows = []
+            for row, brief_id in self.store.rows_since(start):
+                old = self._row_of.get(brief_id)
+                if old is not None:
+                    self._ids[old] = None
+                    if self._ann is not None:
+                        self._ann.mark_deleted(old)
+                self._ids[row] = brief_id
+                self._row_of[brief_id] = row
+                new_rows.append(row)
+            self._update_ann(start, total, new_rows)
+
+    def _update_ann(self, start: int, total: int, new_rows: List[int]) -> None:
+        hnswlib = _hnswlib()
+        if hnswlib is None or total < self.ann_min_rows:
+            return
+        matrix = self.store.embeddings()
+        if self._ann is None:
+            # First time over the threshold: build from every live row
+            self._ann = hnswlib.Index(space="ip", dim=matrix.shape[1])
+            self._ann.init_index(max_elements=max(total * 2, 1024), ef_construction=HNSW_EF_CONSTRUCTION, M=HNSW_M)
+            self._ann.set_ef(HNSW_EF_SEARCH)
+            new_rows = [r for r, i in enumerate(self._ids) if i is not None]
+        elif total > self._ann.get_max_elements():
+            self._ann.resize_index(total * 2)
+        if new_rows:
+            rows = np.asarray(new_rows, dtype=np.int64)
+            self._ann.add_items(np.asarray(matrix[rows]), rows)
+
+    # ---------------- queries ----------------
+
+    def search(self, query, k: int = 5) -> List[Tuple[str, float]]:
+        """[(brief_id, cosine)] best first."""
+        self.sync()
+        query = np.asarray(query, dtype=np.float32)
+        with self._lock:
+            if not self._row_of:
+                return []
+            rows = None
+            if self._ann is not None:
+                try:
+                    # get_current_count() includes labels marked deleted; _row_of holds the live ones
+                    labels, distances = self._ann.knn_query(query, k=min(k, len(self._row_of)))
+                    rows, scores = labels[0], 1.0 - distances[0]
+                except RuntimeError:
+                    pass  # hnswlib found fewer than k live items (heavy deletes): exact search below
+            if rows is None:
+                # Other processes may have appended since sync(); score only the rows synced so far
+                live = np.fromiter((i is not None for i in self._ids), dtype=bool, count=len(self._ids))
+                rows, scores = top_k(self.store.embeddings()[: len(self._ids)], query, k, live)
+            return [(self._ids[r], float(s)) for r, s in zip(rows, scores) if self._ids[r] is not None]
+
+    def find_duplicate(self, query, threshold: float = DUPLICATE_THRESHOLD) -> Optional[Tuple[str, float]]:
+        """(brief_id, cosine) of the closest existing brief if it is at least threshold similar."""
+        hits = self.search(query, k=1)
+        if hits and hits[0][1] >= threshold:
+            return hits[0]
+        return None
+
+    @property
+    def mode(self) -> str:
+        return "hnsw" if self._ann is not None else "exact"
@@ -0,0 +1,91 @@
+"""
+Tokenizing ticker matcher for headlines.
+Built once over the ticker universe (symbols + company names); tags a headline with every
+ticker it mentions in a single pass:
+- cashtags ($TSLA) and exchange/parenthesised symbols ("NYSE: V", "(MA)") always count
+- bare upper-case symbols count unless they are ambiguous (1-2 letters or common words:
+  "V", "MA", "NET", "ALL", ...), which need one of the explicit forms above
+- company names match as whole-word phrases ("Advanced Micro Devices", "Tesla") whose first
+  word is capitalized as in a name ("Tesla", "TESLA", "eBay"), so "apple" in prose is not Apple
+"""
+from typing import Dict, Iterable, List, Set
+import re
+
+_TOKEN = re.compile(r"[A-Za-z0-9]+")
+_EXPLICIT = re.compile(r"(?:\$|\(|\b(?:NYSE|NASDAQ|Nasdaq|AMEX|OTC):\s?)([A-Z][A-Z0-9]{0,5}(?:\.[A-Z])?)\b")
+_WORD = re.compile(r"[a-z0-9]+")
+
+# Upper-case words that show up in headlines without meaning the ticker
+COMMON_WORDS = {
+    "ALL", "ARE", "BIG", "CAN", "CAR", "CASH", "CEO", "EPS", "ETF", "FAST", "FED", "FOR", "FUN", "GDP",
+    "GOOD", "HAS", "HOLD", "IPO", "KEY", "LIFE", "LOW", "MAIN", "NET", "NEW", "NOW", "ONE", "OPEN",
+    "OUT", "PLAY", "POST", "REAL", "RUN", "SAFE", "SEC", "SEE", "TEAM", "THE", "TRUE", "USA", "WELL",
+}
+NAME_SUFFIXES = {"inc", "corp", "corporation", "co", "company", "ltd", "plc", "holdings", "group", "class", "a", "b"}
+
+
+def _name_tokens(name: str) -> tuple:
+    words = _WORD.findall(name.lower())
+    while len(words) > 1 and words[-1] in NAME_SUFFIXES:
+        words.pop()
+    return tuple(words)
+
+
+class TickerMatcher:
+    def __init__(self, names: Dict[str, str]):
+        """names: {symbol: company name or ""}."""
+        self.symbols: Set[str] = {s.upper() for s in names}
+        self.ambiguous: Set[str] = {s for s in self.symbols if len(s) <= 2 or s in COMMON_WORDS}
+        self._dotted = {s for s in self.symbols if "." in s}  # BRK.B: tokenized as BRK + B, checked separately
+        # First name word, in the spellings a name takes (as written, Title, UPPER) -> symbols /
+        # (remaining lower-case words, symbol). Lower-case first words never match.
+        self._single: Dict[str, Set[str]] = {}
+        self._multi: Dict[str, List[tuple]] = {}
+        for symbol, name in names.items():
+            tokens = _name_tokens(name or "")
+            if not tokens:
+                continue
+            written = next((t for t in _TOKEN.findall(name) if t.lower() == tokens[0]), tokens[0])
+            forms = {tokens[0].title(), tokens[0].upper()}
+            if written != tokens[0]:  # "eBay" yes, an all-lower-case spelling no
+                forms.add(written)
+            for form in forms:
+                if len(tokens) == 1:
+                    self._single.setdefault(form, set()).add(symbol.upper())
+                else:
+                    self._multi.setdefault(form, []).append((list(tokens[1:]), symbol.upper()))
+        self._first_forms = set(self._single) | set(self._multi)
+        self._keys = self.symbols | self._first_forms
+
+    def __len__(self) -> int:
+        return len(self.symbols)
+
+    def tag(self, text: str) -> Set[str]:
+        """Every known ticker mentioned in text."""
+        # One regex pass per headline; a set intersection does the per-ticker and per-name work in C
+        tokens = _TOKEN.findall(text)
+        hits = self._keys.intersection(tokens)  # symbols and first name words, one hash pass
+        tags = hits & self.symbols
+        if self._dotted and "." in text:
+            tags.update(s for s in self._dotted if re.search(rf"\b{re.escape(s)}\b", text))
+        if tags and not self.ambiguous.isdisjoint(tags):
+            tags -= self.ambiguous
+            if "$" in text or "(" in text or ":" in text:  # every explicit form has one of these
+                tags.update(self.symbols.intersection(_EXPLICIT.findall(text)))
+        found = hits & self._first_forms
+        if not found:
+            return tags
+        for form in found:
+            tags.update(self._single.get(form, ()))
+        if self._multi.keys() & found:
+            for i, token in enumerate(tokens):
+                for rest, symbol in self._multi.get(token, ()):
+                    if [t.lower() for t in tokens[i + 1:i + 1 + len(rest)]] == rest:
+                        tags.add(symbol)
+        return tags
+
+    def __call__(self, text: str) -> Set[str]:
+        return self.tag(text)
+
+    def tag_many(self, texts: Iterable[str]) -> List[Set[str]]:
+        return [self.tag(t) for t in texts]
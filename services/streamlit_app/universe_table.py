@@ -0,0 +1,38 @@
+"""
+AI Universe table: typed, pre-sorted DataFrame built once per ai_universe.jsonl version.
+- rsi as float32, theme as a categorical, state via np.select (no per-row .apply)
+- one lowercase "ticker name theme" search column, so the filter is a single substring pass
+"""
+from typing import Dict, List
+
+import numpy as np
+import pandas as pd
+
+RSI_OVERBOUGHT = 70
+RSI_OVERSOLD = 30
+STATES = ["Overbought", "Oversold", "Neutral"]
+DISPLAY_COLUMNS = ["ticker", "name", "theme", "rsi", "state"]
+
+
+def build_universe_frame(entries: List[Dict]) -> pd.DataFrame:
+    """Entries ({ticker, name, theme, rsi}) -> display-ready frame sorted by RSI (highest first)."""
+    df = pd.DataFrame(entries)
+    if df.empty:
+        return df
+    for col in ("ticker", "name", "theme"):
+        df[col] = df[col].fillna("").astype(str) if col in df else ""
+    df["rsi"] = pd.to_numeric(df["rsi"], errors="coerce").astype("float32") if "rsi" in df else np.float32("nan")
+    rsi = df["rsi"].to_numpy()
+    state = np.select([rsi >= RSI_OVERBOUGHT, rsi <= RSI_OVERSOLD], STATES[:2], default=STATES[2])
+    df["state"] = pd.Categorical(state, categories=STATES)
+    df["theme"] = df["theme"].astype("category")
+    df["_search"] = (df["ticker"] + "\x00" + df["name"] + "\x00" + df["theme"].astype(str)).str.lower()
+    df = df.sort_values(by="rsi", ascending=False, na_position="last", kind="stable")
+    return df[DISPLAY_COLUMNS + ["_search"]].reset_index(drop=True)
+
+
+def filter_universe(df: pd.DataFrame, text: str) -> pd.DataFrame:
+    """Rows whose ticker, name or theme contains text (case-insensitive); display columns only."""
+    if text and not df.empty:
+        df = df[df["_search"].str.contains(text.lower(), regex=False)]
+    return df[DISPLAY_COLUMNS]